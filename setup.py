@@ -63,8 +63,9 @@ version = get_version()
 # Requirements
 base_require = [
     "click",
+    "cryptography>=42",
     "dask",
-    "hcloud",
+    "hcloud>=1.18,<2",  # servers are created in data centers, dropped by later releases
     "pyyaml",
     "tabulate",
     "typeguard",
@@ -74,6 +75,7 @@ extras_require = {
     "dev": [
         "black",
         "myst-parser",
+        "pytest",
         "python-lsp-server[all]",
         "setuptools",
         "sphinx",
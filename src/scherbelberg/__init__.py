@@ -33,22 +33,69 @@ __version__ = "0.0.6"
 # EXPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from ._core.catalog import (
-    get_datacenters,
-    get_servertypes,
-)
-from ._core.cluster import (
-    Cluster,
-    ClusterSchedulerNotFound,
-    ClusterWorkerNotFound,
-    ClusterFirewallNotFound,
-    ClusterNetworkNotFound,
-)
-from ._core.creator import ClusterPrefixFolderExists
-from ._core.command import Command
-from ._core.node import (
-    Node,
-    NodeNotFound,
-)
-from ._core.process import Process
-from ._core.sshconfig import SSHConfig
+from importlib import import_module
+from typing import Any, List
+
+_EXPORTS = {  # name: module in _core, imported on first access
+    "Adaptor": "adapt",
+    "AdaptPolicy": "adapt",
+    "bench_command": "bench",
+    "bench_imports": "bench",
+    "bench_lifecycle": "bench",
+    "bench_transport": "bench",
+    "bench_workloads": "bench",
+    "CAStore": "castore",
+    "Catalog": "catalog",
+    "CatalogDatacenterNotFound": "catalog",
+    "CatalogServerTypeNotFound": "catalog",
+    "get_catalog": "catalog",
+    "get_datacenters": "catalog",
+    "get_servertypes": "catalog",
+    "create_client": "cloud",
+    "create_provider": "cloud",
+    "Cluster": "cluster",
+    "ClusterSchedulerNotFound": "cluster",
+    "ClusterWorkerNotFound": "cluster",
+    "ClusterFirewallNotFound": "cluster",
+    "ClusterNetworkNotFound": "cluster",
+    "ClusterRetirementFailed": "cluster",
+    "ClusterPrefixFolderExists": "creator",
+    "Command": "command",
+    "Graph": "dag",
+    "Step": "dag",
+    "FakeCloud": "fake",
+    "FakeServer": "fake",
+    "FakeSSH": "fake",
+    "HetznerProvider": "hetzner",
+    "Layout": "layout",
+    "LocalProvider": "local",
+    "Node": "node",
+    "NodeNotFound": "node",
+    "plan_cluster": "plan",
+    "Pool": "pool",
+    "Process": "process",
+    "Instance": "provider",
+    "Network": "provider",
+    "Provider": "provider",
+    "Resource": "provider",
+    "SSHConfig": "sshconfig",
+    "Timeline": "timeline",
+}
+
+__all__ = list(_EXPORTS.keys())
+
+
+def __getattr__(name: str) -> Any:
+
+    if name not in _EXPORTS.keys():
+        raise AttributeError(f"module {__name__:s} has no attribute {name:s}")
+
+    value = getattr(import_module(f"._core.{_EXPORTS[name]:s}", __name__), name)
+    globals()[name] = value  # cached, __getattr__ is not called again
+
+    return value
+
+
+def __dir__() -> List[str]:
+
+    return sorted({*globals().keys(), *_EXPORTS.keys()})
@@ -30,6 +30,7 @@ specific language governing rights and limitations under the License.
 
 import importlib
 import os
+import re
 import sys
 
 import click
@@ -37,26 +38,60 @@ import click
 from .. import __version__
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
-# ROUTINES
+# CLASS
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
-def _add_commands(ctx):
-    """auto-detects sub-commands"""
-    for cmd in (
-        item[:-3] if item.lower().endswith(".py") else item[:]
-        for item in os.listdir(os.path.dirname(__file__))
-        if not item.startswith("_")
-    ):
+class _LazyGroup(click.Group):
+    """auto-detects sub-commands, imports them only once they are invoked"""
+
+    _short_help = re.compile(r'@click\.(?:command|group)\(short_help="([^"]*)"')
+
+    def format_commands(self, ctx, formatter):
+
+        rows = []
+        for cmd_name in self.list_commands(ctx):
+            with open(
+                os.path.join(os.path.dirname(__file__), f"{cmd_name:s}.py"),
+                mode="r",
+                encoding="utf-8",
+            ) as f:
+                match = self._short_help.search(f.read())  # help without import
+            rows.append((cmd_name, match.group(1) if match is not None else ""))
+
+        if len(rows) == 0:
+            return
+
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
+
+    def list_commands(self, ctx):
+
+        return sorted(
+            item[:-3] if item.lower().endswith(".py") else item[:]
+            for item in os.listdir(os.path.dirname(__file__))
+            if not item.startswith("_")
+        )
+
+    def get_command(self, ctx, cmd_name):
+
+        if cmd_name not in self.list_commands(ctx):
+            return None
+
         try:
-            ctx.add_command(
-                getattr(importlib.import_module("scherbelberg._cli.%s" % cmd), cmd)
-            )
+            module = importlib.import_module(f"scherbelberg._cli.{cmd_name:s}")
         except ModuleNotFoundError:
-            continue
+            return None
+
+        return getattr(module, cmd_name)
 
 
-@click.group(invoke_without_command=True)
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@click.group(cls=_LazyGroup, invoke_without_command=True)
 @click.option("--version", is_flag=True)
 def cli(version):
     """HPC cluster deployment and management for the Hetzner Cloud"""
@@ -66,6 +101,3 @@ def cli(version):
 
     print(__version__)
     sys.exit()
-
-
-_add_commands(cli)
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_cli/bench.py: Run benchmarks
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import run
+from logging import ERROR
+import sys
+
+import click
+from tabulate import tabulate
+
+from .._core.bench import (
+    bench_command,
+    bench_imports,
+    bench_lifecycle,
+    bench_transport,
+    bench_workloads,
+)
+from .._core.cluster import (
+    Cluster,
+    ClusterSchedulerNotFound,
+    ClusterWorkerNotFound,
+    ClusterFirewallNotFound,
+    ClusterNetworkNotFound,
+)
+from .._core.const import (
+    BENCH_BUDGET,
+    BENCH_COMMANDS,
+    BENCH_IMPORTS,
+    BENCH_PINGS,
+    BENCH_RESULTS,
+    BENCH_SIZE,
+    BENCH_THRESHOLD,
+    BENCH_TIMEOUT,
+    BENCH_WORKLOADS,
+    DASK_PROTOCOLS,
+    PREFIX,
+    TOKENVAR,
+    WAIT,
+)
+from .._core.log import configure_log
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+async def _attach(prefix, tokenvar, wait):
+
+    try:
+        cluster = await Cluster.from_existing(
+            prefix=prefix,
+            tokenvar=tokenvar,
+            wait=wait,
+        )
+    except ClusterSchedulerNotFound:
+        click.echo(
+            "Cluster scheduler could not be found. Cluster likely does not exist.",
+            err=True,
+        )
+        sys.exit(1)
+    except (
+        ClusterWorkerNotFound,
+        ClusterFirewallNotFound,
+        ClusterNetworkNotFound,
+    ) as e:
+        click.echo(
+            f"Cluster component missing ({type(e).__name__:s}). Cluster likely needs to be nuked.",
+            err=True,
+        )
+        sys.exit(1)
+
+    return cluster
+
+
+async def _net(prefix, tokenvar, wait, **kwargs):
+
+    cluster = await _attach(prefix, tokenvar, wait)
+
+    return await cluster.benchmark_network(**kwargs)
+
+
+async def _workloads(prefix, tokenvar, wait, **kwargs):
+
+    cluster = await _attach(prefix, tokenvar, wait)
+
+    return await bench_workloads(cluster, **kwargs)
+
+
+@click.group(short_help="run benchmarks")
+def bench():
+    """run benchmarks"""
+
+
+@bench.command(short_help="measure overhead of running commands locally and via ssh")
+@click.option("-r", "--repeat", default=20, type=int, show_default=True)
+@click.option("-s", "--size", default=2 ** 20, type=int, show_default=True)
+@click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-d", "--sshd", default="sshd", type=str, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+@click.argument("phases", nargs=-1, type=click.Choice(BENCH_COMMANDS))
+def command(repeat, size, wait, sshd, log_level, phases):
+
+    configure_log(log_level)
+
+    table = run(
+        bench_command(
+            phases=phases if len(phases) > 0 else BENCH_COMMANDS,
+            repeat=repeat,
+            size=size,
+            wait=wait,
+            sshd=sshd,
+        )
+    )
+    columns = (
+        "phase",
+        "runs",
+        "failed",
+        "runtime",
+        "runtime_min",
+        "runtime_max",
+        "spawn",
+        "connect",
+        "bytes_in",
+        "bytes_out",
+        "error",
+    )
+    table = [[row[column] for column in columns] for row in table]
+    click.echo(
+        tabulate(
+            table,
+            headers=columns,
+            tablefmt="github",
+        )
+    )
+
+
+@bench.command(short_help="measure start-up time of package and command line interface")
+@click.option("-r", "--repeat", default=5, type=int, show_default=True)
+@click.option("-b", "--budget", default=BENCH_BUDGET, type=float, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+@click.argument("targets", nargs=-1, type=click.Choice(BENCH_IMPORTS))
+def imports(repeat, budget, log_level, targets):
+
+    configure_log(log_level)
+
+    table = run(
+        bench_imports(
+            targets=targets if len(targets) > 0 else BENCH_IMPORTS,
+            repeat=repeat,
+            budget=budget,
+        )
+    )
+    columns = ("target", "runs", "runtime", "baseline", "budget", "ok", "error")
+    click.echo(
+        tabulate(
+            [[row[column] for column in columns] for row in table],
+            headers=columns,
+            tablefmt="github",
+        )
+    )
+
+    if not all(row["ok"] for row in table):
+        sys.exit(1)
+
+
+@bench.command(short_help="create, attach to and destroy clusters offline")
+@click.option("-a", "--latency", default=0.05, type=float, show_default=True)
+@click.option("-b", "--boot", default=0.0, type=float, show_default=True)
+@click.option("-s", "--ssh", default=0.0, type=float, show_default=True)
+@click.option("-f", "--failure", default=0.0, type=float, show_default=True)
+@click.option("-r", "--rate_limit", default=None, type=float, show_default=True)
+@click.option("-u", "--burst", default=3600, type=int, show_default=True)
+@click.option("-w", "--wait", default=0.01, type=float, show_default=True)
+@click.option("-e", "--seed", default=None, type=int, show_default=True)
+@click.option("-x", "--http", is_flag=True, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+@click.argument("workers", nargs=-1, type=int)
+def lifecycle(
+    latency,
+    boot,
+    ssh,
+    failure,
+    rate_limit,
+    burst,
+    wait,
+    seed,
+    http,
+    log_level,
+    workers,
+):
+
+    configure_log(log_level)
+
+    table = run(
+        bench_lifecycle(
+            workers=workers if len(workers) > 0 else (1, 10, 100),
+            latency=latency,
+            boot=boot,
+            ssh=ssh,
+            failure=failure,
+            rate_limit=rate_limit,
+            burst=burst,
+            wait=wait,
+            seed=seed,
+            http=http,
+        )
+    )
+    columns = (
+        "workers",
+        "phase",
+        "seconds",
+        "requests",
+        "commands",
+        "servers",
+        "error",
+    )
+    table = [[row[column] for column in columns] for row in table]
+    click.echo(
+        tabulate(
+            table,
+            headers=columns,
+            tablefmt="github",
+        )
+    )
+
+
+@bench.command(short_help="compare throughput of Dask transport protocols locally")
+@click.option("-s", "--size", default=2 ** 27, type=int, show_default=True)
+@click.option("-c", "--chunk", default=2 ** 20, type=int, show_default=True)
+@click.option("-r", "--repeat", default=3, type=int, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+@click.argument("protocols", nargs=-1, type=click.Choice(DASK_PROTOCOLS))
+def transport(size, chunk, repeat, log_level, protocols):
+
+    configure_log(log_level)
+
+    table = run(
+        bench_transport(
+            protocols=protocols if len(protocols) > 0 else DASK_PROTOCOLS,
+            size=size,
+            chunk=chunk,
+            repeat=repeat,
+        )
+    )
+    columns = (
+        "protocol",
+        "size",
+        "chunk",
+        "seconds",
+        "throughput",
+        "relative",
+    )
+    table = [[row[column] for column in columns] for row in table]
+    click.echo(
+        tabulate(
+            table,
+            headers=columns,
+            tablefmt="github",
+        )
+    )
+
+
+@bench.command(short_help="measure throughput and latency between nodes of a cluster")
+@click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
+@click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
+@click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-s", "--size", default=BENCH_SIZE, type=int, show_default=True)
+@click.option("-n", "--pings", default=BENCH_PINGS, type=int, show_default=True)
+@click.option("-m", "--sample", default=None, type=int, show_default=True)
+@click.option("-x", "--public", is_flag=True, show_default=True)
+@click.option("-y", "--no_private", is_flag=True, show_default=True)
+@click.option(
+    "-r", "--threshold", default=BENCH_THRESHOLD, type=float, show_default=True
+)
+@click.option("-o", "--timeout", default=BENCH_TIMEOUT, type=float, show_default=True)
+@click.option("-e", "--seed", default=None, type=int, show_default=True)
+@click.option("-f", "--fn", default=None, type=str, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+def net(
+    prefix,
+    tokenvar,
+    wait,
+    size,
+    pings,
+    sample,
+    public,
+    no_private,
+    threshold,
+    timeout,
+    seed,
+    fn,
+    log_level,
+):
+
+    configure_log(log_level)
+
+    report = run(
+        _net(
+            prefix=prefix,
+            tokenvar=tokenvar,
+            wait=wait,
+            size=size,
+            pings=pings,
+            sample=sample,
+            private=not no_private,
+            public=public,
+            threshold=threshold,
+            timeout=timeout,
+            seed=seed,
+            fn=fn,
+        )
+    )
+
+    names = [name.split("-node-")[1] for name in report["nodes"]]
+    for path, matrix in report["matrix"].items():
+        for metric, unit, factor in (
+            ("throughput", "MB/s", 1e-6),
+            ("latency", "ms", 1e3),
+        ):
+            click.echo(f"{path:s} {metric:s} [{unit:s}]")
+            click.echo(
+                tabulate(
+                    [
+                        [name]
+                        + [None if value is None else value * factor for value in row]
+                        for name, row in zip(names, matrix[metric])
+                    ],
+                    headers=["", *names],
+                    tablefmt="github",
+                    floatfmt=".1f" if metric == "throughput" else ".3f",
+                )
+            )
+            click.echo()
+
+    for link in report["links"]:
+        if link["error"] is not None and link["error"] != "different private networks":
+            click.echo(
+                f"Failed {link['path']:s} link {link['source']:s} -> {link['target']:s}: {link['error']:s}"
+            )
+    for link in report["slow"]:
+        click.echo(
+            f"Slow {link['path']:s} link {link['source']:s} -> {link['target']:s}"
+        )
+    for name in report["noisy"]:
+        click.echo(f"Noisy node {name:s}")
+
+
+@bench.command(short_help="run standard Dask workloads on a cluster")
+@click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
+@click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
+@click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-c", "--scale", default=1.0, type=float, show_default=True)
+@click.option("-r", "--repeat", default=1, type=int, show_default=True)
+@click.option("-f", "--fn", default=BENCH_RESULTS, type=str, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+@click.argument("workloads", nargs=-1, type=click.Choice(BENCH_WORKLOADS))
+def workloads(prefix, tokenvar, wait, scale, repeat, fn, log_level, workloads):
+
+    configure_log(log_level)
+
+    table = run(
+        _workloads(
+            prefix=prefix,
+            tokenvar=tokenvar,
+            wait=wait,
+            workloads=workloads if len(workloads) > 0 else BENCH_WORKLOADS,
+            scale=scale,
+            repeat=repeat,
+            fn=fn,
+        )
+    )
+    columns = (
+        "workload",
+        "run",
+        "seconds",
+        "units",
+        "unit",
+        "throughput",
+        "tasks",
+        "overhead",
+        "cost_per_unit",
+        "error",
+    )
+    table = [[row[column] for column in columns] for row in table]
+    click.echo(
+        tabulate(
+            table,
+            headers=columns,
+            tablefmt="github",
+        )
+    )
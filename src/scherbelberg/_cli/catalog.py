@@ -38,7 +38,7 @@ from .._core.catalog import (
     get_datacenters,
     get_servertypes,
 )
-from .._core.const import TOKENVAR
+from .._core.const import CATALOG_TTL, TOKENVAR
 from .._core.log import configure_log
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -47,10 +47,12 @@ from .._core.log import configure_log
 
 @click.command(short_help="list data centers and available servers types")
 @click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
+@click.option("-c", "--cache", default=CATALOG_TTL, type=float, show_default=True)
 @click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
 @click.argument("datacenter", nargs=1, required=False)
 def catalog(
     tokenvar,
+    cache,
     log_level,
     datacenter,
 ):
@@ -59,7 +61,7 @@ def catalog(
 
     if datacenter is None:
 
-        table = run(get_datacenters(tokenvar = tokenvar))
+        table = run(get_datacenters(tokenvar = tokenvar, ttl = cache))
         columns = (
             'name',
             'city',
@@ -83,12 +85,13 @@ def catalog(
 
         return
 
-    table = run(get_servertypes(datacenter = datacenter, tokenvar = tokenvar))
+    table = run(get_servertypes(datacenter = datacenter, tokenvar = tokenvar, ttl = cache))
     columns = (
         'name',
         # 'description',
         'cores',
         'cpu_type',
+        'architecture',
         'memory',
         'disk',
         'storage_type',
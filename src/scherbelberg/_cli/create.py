@@ -30,14 +30,20 @@ specific language governing rights and limitations under the License.
 
 from asyncio import run
 from logging import ERROR
+import os
 
 import click
 
 from .._core.cluster import Cluster
 from .._core.const import (
+    BOOTSTRAP_PROFILE,
+    BOOTSTRAP_PROFILES,
     DASK_IPC,
     DASK_DASH,
     DASK_NANNY,
+    DASK_PRIVATE,
+    DASK_PROTOCOL,
+    DASK_PROTOCOLS,
     PREFIX,
     TOKENVAR,
     WAIT,
@@ -45,14 +51,41 @@ from .._core.const import (
     HETZNER_INSTANCE_TINY,
     HETZNER_IMAGE_UBUNTU,
     HETZNER_DATACENTER,
+    NETWORK_RANGE,
+    SSH_KEY_TYPE,
+    SSH_KEY_TYPES,
+    TLS_KEY_TYPE,
+    TLS_KEY_TYPES,
 )
 from .._core.log import configure_log
+from .._core.pool import Pool
+from .._core.timeline import Timeline
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+async def _main(profile, **kwargs):
+
+    try:
+        cluster = await Cluster.from_new(**kwargs)
+
+        if cluster.pending > 0:
+            click.echo(
+                f"Cluster is usable with {len(cluster.workers):d} worker(s), "
+                f"waiting for {cluster.pending:d} more ..."
+            )
+            await cluster.wait_for_workers()
+    finally:
+        if profile:
+            click.echo(
+                Timeline.from_file(
+                    os.path.join(f".{kwargs['prefix']:s}", "timeline.jsonl")
+                ).report()
+            )
+
+
 @click.command(short_help="create cluster")
 @click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
 @click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
@@ -70,9 +103,40 @@ from .._core.log import configure_log
     "-d", "--datacenter", default=HETZNER_DATACENTER, type=str, show_default=True
 )
 @click.option("-n", "--workers", default=WORKERS, type=int, show_default=True)
+@click.option("-m", "--min_workers", type=int)
+@click.option("-r", "--resume", is_flag=True, show_default=True)
+@click.option("-o", "--pool", type=str, multiple=True)
 @click.option("-c", "--dask_ipc", default=DASK_IPC, type=int, show_default=True)
 @click.option("-d", "--dask_dash", default=DASK_DASH, type=int, show_default=True)
 @click.option("-e", "--dask_nanny", default=DASK_NANNY, type=int, show_default=True)
+@click.option(
+    "--dask_protocol",
+    default=DASK_PROTOCOL,
+    type=click.Choice(DASK_PROTOCOLS),
+    show_default=True,
+)
+@click.option("--dask_private", default=DASK_PRIVATE, type=int, show_default=True)
+@click.option("--ip_range", default=NETWORK_RANGE, type=str, show_default=True)
+@click.option(
+    "--ssh_key_type",
+    default=SSH_KEY_TYPE,
+    type=click.Choice(SSH_KEY_TYPES),
+    show_default=True,
+)
+@click.option(
+    "--tls_key_type",
+    default=TLS_KEY_TYPE,
+    type=click.Choice(TLS_KEY_TYPES),
+    show_default=True,
+)
+@click.option("--ca_store", type=str)
+@click.option(
+    "--bootstrap",
+    default=BOOTSTRAP_PROFILE,
+    type=click.Choice(BOOTSTRAP_PROFILES),
+    show_default=True,
+)
+@click.option("--profile", is_flag=True, show_default=True)
 @click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
 def create(
     prefix,
@@ -83,16 +147,28 @@ def create(
     image,
     datacenter,
     workers,
+    min_workers,
+    resume,
+    pool,
     dask_ipc,
     dask_dash,
     dask_nanny,
+    dask_protocol,
+    dask_private,
+    ip_range,
+    ssh_key_type,
+    tls_key_type,
+    ca_store,
+    bootstrap,
+    profile,
     log_level,
 ):
 
     configure_log(log_level)
 
     run(
-        Cluster.from_new(
+        _main(
+            profile=profile,
             prefix=prefix,
             tokenvar=tokenvar,
             wait=wait,
@@ -101,8 +177,20 @@ def create(
             image=image,
             datacenter=datacenter,
             workers=workers,
+            min_workers=min_workers,
+            resume=resume,
+            pools=[Pool.from_str(spec, datacenter=datacenter) for spec in pool]
+            if len(pool) > 0
+            else None,
             dask_ipc=dask_ipc,
             dask_dash=dask_dash,
             dask_nanny=dask_nanny,
+            dask_protocol=dask_protocol,
+            dask_private=dask_private,
+            ip_range=ip_range,
+            ssh_key_type=ssh_key_type,
+            tls_key_type=tls_key_type,
+            ca_store=ca_store,
+            bootstrap=bootstrap,
         )
     )
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_cli/fake.py: Serve an offline stand-in of the cloud API
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from logging import ERROR
+
+import click
+from tabulate import tabulate
+
+from .._core.const import APIVAR, TOKENVAR
+from .._core.fake import FakeCloud, FakeServer
+from .._core.log import configure_log
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@click.command(short_help="serve offline stand-in of cloud API")
+@click.option("-n", "--host", default="127.0.0.1", type=str, show_default=True)
+@click.option("-p", "--port", default=8080, type=int, show_default=True)
+@click.option("-a", "--latency", default=0.0, type=float, show_default=True)
+@click.option("-b", "--boot", default=0.0, type=float, show_default=True)
+@click.option("-f", "--failure", default=0.0, type=float, show_default=True)
+@click.option("-r", "--rate_limit", default=None, type=float, show_default=True)
+@click.option("-u", "--burst", default=3600, type=int, show_default=True)
+@click.option("-e", "--seed", default=None, type=int, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+def fake(host, port, latency, boot, failure, rate_limit, burst, seed, log_level):
+
+    configure_log(log_level)
+
+    cloud = FakeCloud(
+        latency=latency,
+        boot=boot,
+        reboot=boot,
+        failure=failure,
+        rate_limit=rate_limit,
+        burst=burst,
+        seed=seed,
+    )
+    server = FakeServer(cloud=cloud, host=host, port=port)
+
+    click.echo("Serving fake cloud API, point scherbelberg at it via:")
+    click.echo(f"    export {APIVAR:s}={server.url:s} {TOKENVAR:s}=fake")
+
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+
+    table = sorted(cloud.requests.items())
+    click.echo(
+        tabulate(
+            table + [["total", sum(count for _, count in table)]],
+            headers=("endpoint", "requests"),
+            tablefmt="github",
+        )
+    )
@@ -41,7 +41,7 @@ from .._core.cluster import (
     ClusterFirewallNotFound,
     ClusterNetworkNotFound,
 )
-from .._core.const import PREFIX, TOKENVAR, WAIT
+from .._core.const import CACHE_TTL, PREFIX, TOKENVAR, WAIT
 from .._core.log import configure_log
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -49,13 +49,14 @@ from .._core.log import configure_log
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
-async def _main(prefix, tokenvar, wait):
+async def _main(prefix, tokenvar, wait, cache):
 
     try:
-        cluster = await Cluster.from_existing(
+        cluster = await Cluster.from_cache(
             prefix=prefix,
             tokenvar=tokenvar,
             wait=wait,
+            ttl=cache,
         )
     except ClusterSchedulerNotFound:
         click.echo(
@@ -76,6 +77,8 @@ async def _main(prefix, tokenvar, wait):
 
     click.echo(cluster)
 
+    for pool in cluster.pools:
+        click.echo(pool)
     for worker in cluster.workers:
         click.echo(worker)
     click.echo(cluster.scheduler)
@@ -96,9 +99,10 @@ async def _main(prefix, tokenvar, wait):
 @click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
 @click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
 @click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-c", "--cache", default=CACHE_TTL, type=float, show_default=True)
 @click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
-def ls(prefix, tokenvar, wait, log_level):
+def ls(prefix, tokenvar, wait, cache, log_level):
 
     configure_log(log_level)
 
-    run(_main(prefix, tokenvar, wait))
+    run(_main(prefix, tokenvar, wait, cache))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_cli/plan.py: Plan clusters by price and performance
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import run
+import json
+from logging import ERROR
+import sys
+
+import click
+from tabulate import tabulate
+
+from .._core.const import (
+    BENCH_WORKLOADS,
+    CATALOG_TTL,
+    HETZNER_ARCHITECTURES,
+    HETZNER_CPU_TYPES,
+    HETZNER_INSTANCE_TINY,
+    PLAN_LIMIT,
+    PLAN_OBJECTIVES,
+    PLAN_WORKERS,
+    PREFIX,
+    TOKENVAR,
+)
+from .._core.log import configure_log
+from .._core.plan import plan_cluster
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@click.command(short_help="rank cluster configurations by price")
+@click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
+@click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
+@click.option("-e", "--cache", default=CATALOG_TTL, type=float, show_default=True)
+@click.option("-c", "--cores", default=0, type=int, show_default=True)
+@click.option("-m", "--memory", default=0.0, type=float, show_default=True)
+@click.option("-w", "--worker_memory", default=0.0, type=float, show_default=True)
+@click.option("-b", "--budget", default=None, type=float, show_default=True)
+@click.option("-u", "--cpu_type", default=None, type=click.Choice(HETZNER_CPU_TYPES))
+@click.option(
+    "-y", "--architecture", default=None, type=click.Choice(HETZNER_ARCHITECTURES)
+)
+@click.option("-d", "--datacenter", type=str, multiple=True)
+@click.option(
+    "-s", "--scheduler", default=HETZNER_INSTANCE_TINY, type=str, show_default=True
+)
+@click.option("-f", "--fn", default=None, type=str, show_default=True)
+@click.option("-k", "--workload", default=None, type=click.Choice(BENCH_WORKLOADS))
+@click.option("-r", "--throughput", default=0.0, type=float, show_default=True)
+@click.option(
+    "-o",
+    "--objective",
+    default=PLAN_OBJECTIVES[0],
+    type=click.Choice(PLAN_OBJECTIVES),
+    show_default=True,
+)
+@click.option("-x", "--max_workers", default=PLAN_WORKERS, type=int, show_default=True)
+@click.option("-n", "--limit", default=PLAN_LIMIT, type=int, show_default=True)
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+def plan(
+    prefix,
+    tokenvar,
+    cache,
+    cores,
+    memory,
+    worker_memory,
+    budget,
+    cpu_type,
+    architecture,
+    datacenter,
+    scheduler,
+    fn,
+    workload,
+    throughput,
+    objective,
+    max_workers,
+    limit,
+    log_level,
+):
+
+    configure_log(log_level)
+
+    results = None
+    if fn is not None:
+        with open(fn, mode="r", encoding="utf-8") as f:
+            results = [json.loads(line) for line in f if len(line.strip()) > 0]
+
+    if (throughput > 0 or objective == "throughput") and results is None:
+        click.echo("Throughput requires results via --fn and --workload.", err=True)
+        sys.exit(1)
+
+    table = run(
+        plan_cluster(
+            cores=cores,
+            memory=memory,
+            worker_memory=worker_memory,
+            budget=budget,
+            cpu_type=cpu_type,
+            architecture=architecture,
+            datacenters=list(datacenter) if len(datacenter) > 0 else None,
+            scheduler=scheduler,
+            results=results,
+            workload=workload,
+            throughput=throughput,
+            objective=objective,
+            max_workers=max_workers,
+            limit=limit,
+            prefix=prefix,
+            tokenvar=tokenvar,
+            ttl=cache,
+        )
+    )
+
+    if len(table) == 0:
+        click.echo("No cluster meets the requirements.", err=True)
+        sys.exit(1)
+
+    columns = (
+        "rank",
+        "datacenter",
+        "servertype",
+        "workers",
+        "cpu_type",
+        "architecture",
+        "cores",
+        "memory",
+        "hourly",
+        "core_hourly",
+        "memory_hourly",
+        "throughput",
+        "unit_price",
+    )
+    click.echo(
+        tabulate(
+            [[row[column] for column in columns] for row in table],
+            headers=columns,
+            tablefmt="github",
+        )
+    )
+    click.echo()
+    click.echo(table[0]["command"])
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_cli/scale.py: Scale a cluster
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import run
+from logging import ERROR
+import sys
+
+import click
+
+from .._core.cluster import (
+    Cluster,
+    ClusterSchedulerNotFound,
+    ClusterWorkerNotFound,
+    ClusterFirewallNotFound,
+    ClusterNetworkNotFound,
+    ClusterRetirementFailed,
+)
+from .._core.const import (
+    BOOTSTRAP_PROFILES,
+    PREFIX,
+    RETIRE_TIMEOUT,
+    TOKENVAR,
+    WAIT,
+)
+from .._core.log import configure_log
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+async def _main(
+    prefix,
+    tokenvar,
+    wait,
+    workers,
+    pool,
+    worker,
+    image,
+    datacenter,
+    timeout,
+    force,
+    bootstrap,
+):
+
+    try:
+        cluster = await Cluster.from_existing(
+            prefix=prefix,
+            tokenvar=tokenvar,
+            wait=wait,
+        )
+    except ClusterSchedulerNotFound:
+        click.echo(
+            "Cluster scheduler could not be found. Cluster likely does not exist.",
+            err=True,
+        )
+        sys.exit(1)
+    except (
+        ClusterWorkerNotFound,
+        ClusterFirewallNotFound,
+        ClusterNetworkNotFound,
+    ) as e:
+        click.echo(
+            f"Cluster component missing ({type(e).__name__:s}). Cluster likely needs to be nuked.",
+            err=True,
+        )
+        sys.exit(1)
+
+    if workers < 1:
+        click.echo(
+            "A cluster requires at least one worker.",
+            err=True,
+        )
+        sys.exit(1)
+
+    try:
+        await cluster.scale(
+            workers=workers,
+            pool=pool,
+            worker=worker,
+            image=image,
+            datacenter=datacenter,
+            timeout=timeout,
+            force=force,
+            bootstrap=bootstrap,
+        )
+    except ClusterRetirementFailed:
+        click.echo(
+            "Workers could not hand off their data in time. Use --force to remove them nevertheless.",
+            err=True,
+        )
+        sys.exit(1)
+
+    click.echo(cluster)
+
+
+@click.command(short_help="add or remove workers")
+@click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
+@click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
+@click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-o", "--pool", default=None, type=str)
+@click.option("-w", "--worker", default=None, type=str)
+@click.option("-i", "--image", default=None, type=str)
+@click.option("-d", "--datacenter", default=None, type=str)
+@click.option("-r", "--timeout", default=RETIRE_TIMEOUT, type=float, show_default=True)
+@click.option("-f", "--force", is_flag=True, show_default=True)
+@click.option("-b", "--bootstrap", default=None, type=click.Choice(BOOTSTRAP_PROFILES))
+@click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
+@click.argument("workers", nargs=1, type=int)
+def scale(
+    prefix,
+    tokenvar,
+    wait,
+    pool,
+    worker,
+    image,
+    datacenter,
+    timeout,
+    force,
+    bootstrap,
+    log_level,
+    workers,
+):
+
+    configure_log(log_level)
+
+    run(
+        _main(
+            prefix,
+            tokenvar,
+            wait,
+            workers,
+            pool,
+            worker,
+            image,
+            datacenter,
+            timeout,
+            force,
+            bootstrap,
+        )
+    )
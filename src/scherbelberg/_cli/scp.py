@@ -42,15 +42,16 @@ from .._core.cluster import (
     ClusterFirewallNotFound,
     ClusterNetworkNotFound,
 )
-from .._core.const import PREFIX, TOKENVAR, WAIT
+from .._core.const import CACHE_TTL, PREFIX, TOKENVAR, WAIT
 from .._core.log import configure_log
+from .._core.node import NodeNotFound
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
-async def _fix_path(path, prefix, nodes):
+async def _fix_path(path, prefix, cluster):
 
     path = path.replace("\\\\", "/").replace("\\", "/")  # Windows SCP path fix
 
@@ -59,26 +60,44 @@ async def _fix_path(path, prefix, nodes):
 
     hostname, path = path.split(":", maxsplit=-1)
 
-    if hostname not in nodes.keys():
+    try:
+        node = cluster.get_node(hostname)
+    except NodeNotFound:
         click.echo(
             f'"{hostname:s}" is unknown in cluster "{prefix:s}": '
-            + ", ".join(nodes.keys()),
+            + ", ".join(["scheduler"] + [node.suffix for node in cluster.workers]),
             err=True,
         )
         sys.exit(1)
 
-    host = await nodes[hostname].get_sshconfig(user=f"{prefix:s}user")
+    host = await node.get_sshconfig(user=f"{prefix:s}user")
 
     return f"{host.user:s}@{host.name:s}:{path:s}", host
 
 
-async def _main(prefix, tokenvar, wait, verbose, source, target):
+def _known(path, cluster):
+
+    path = path.replace("\\\\", "/").replace("\\", "/")  # Windows SCP path fix
+
+    if ":" not in path:
+        return True
 
     try:
-        cluster = await Cluster.from_existing(
+        cluster.get_node(path.split(":")[0])
+    except NodeNotFound:
+        return False
+
+    return True
+
+
+async def _attach(prefix, tokenvar, wait, cache):
+
+    try:
+        cluster = await Cluster.from_cache(
             prefix=prefix,
             tokenvar=tokenvar,
             wait=wait,
+            ttl=cache,
         )
     except ClusterSchedulerNotFound:
         click.echo(
@@ -97,11 +116,17 @@ async def _main(prefix, tokenvar, wait, verbose, source, target):
         )
         sys.exit(1)
 
-    nodes = {node.name.split("-node-")[1]: node for node in cluster.workers}
-    nodes["scheduler"] = cluster.scheduler
+    return cluster
+
+
+async def _main(prefix, tokenvar, wait, cache, verbose, source, target):
+
+    cluster = await _attach(prefix, tokenvar, wait, cache)
+    if cache > 0 and not all(_known(path, cluster) for path in (*source, target)):
+        cluster = await _attach(prefix, tokenvar, wait, 0.0)  # cache possibly outdated
 
-    source = [await _fix_path(path, prefix, nodes) for path in source]
-    target = await _fix_path(target, prefix, nodes)
+    source = [await _fix_path(path, prefix, cluster) for path in source]
+    target = await _fix_path(target, prefix, cluster)
 
     source_hosts = {host for _, host in source}
     source = [path for path, _ in source]
@@ -167,12 +192,13 @@ async def _main(prefix, tokenvar, wait, verbose, source, target):
 @click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
 @click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
 @click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-c", "--cache", default=CACHE_TTL, type=float, show_default=True)
 @click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
 @click.option("-v", "--verbose", is_flag=True, show_default=True)
 @click.argument("source", nargs=-1)
 @click.argument("target", nargs=1)
-def scp(prefix, tokenvar, wait, log_level, verbose, source, target):
+def scp(prefix, tokenvar, wait, cache, log_level, verbose, source, target):
 
     configure_log(log_level)
 
-    run(_main(prefix, tokenvar, wait, verbose, source, target))
+    run(_main(prefix, tokenvar, wait, cache, verbose, source, target))
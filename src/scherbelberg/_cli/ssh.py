@@ -42,21 +42,23 @@ from .._core.cluster import (
     ClusterFirewallNotFound,
     ClusterNetworkNotFound,
 )
-from .._core.const import PREFIX, TOKENVAR, WAIT
+from .._core.const import CACHE_TTL, PREFIX, TOKENVAR, WAIT
 from .._core.log import configure_log
+from .._core.node import NodeNotFound
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
-async def _main(prefix, tokenvar, wait, hostname, command):
+async def _attach(prefix, tokenvar, wait, cache):
 
     try:
-        cluster = await Cluster.from_existing(
+        cluster = await Cluster.from_cache(
             prefix=prefix,
             tokenvar=tokenvar,
             wait=wait,
+            ttl=cache,
         )
     except ClusterSchedulerNotFound:
         click.echo(
@@ -75,20 +77,35 @@ async def _main(prefix, tokenvar, wait, hostname, command):
         )
         sys.exit(1)
 
-    nodes = {node.name.split("-node-")[1]: node for node in cluster.workers}
-    nodes["scheduler"] = cluster.scheduler
+    return cluster
 
-    if hostname not in nodes.keys():
+
+async def _main(prefix, tokenvar, wait, cache, hostname, command):
+
+    cluster = await _attach(prefix, tokenvar, wait, cache)
+
+    try:
+        node = cluster.get_node(hostname)
+    except NodeNotFound:
+        node = None
+    if node is None and cache > 0:  # cached description possibly outdated
+        cluster = await _attach(prefix, tokenvar, wait, 0.0)
+        try:
+            node = cluster.get_node(hostname)
+        except NodeNotFound:
+            pass
+
+    if node is None:
         click.echo(
             f'"{hostname:s}" is unknown in cluster "{prefix:s}": '
-            + ", ".join(nodes.keys()),
+            + ", ".join(["scheduler"] + [node.suffix for node in cluster.workers]),
             err=True,
         )
         sys.exit(1)
 
     dev_null = "\\\\.\\NUL" if sys.platform.startswith("win") else "/dev/null"
 
-    host = await nodes[hostname].get_sshconfig(user=f"{prefix:s}user")
+    host = await node.get_sshconfig(user=f"{prefix:s}user")
     cmd = [
         "ssh",
         "-o",
@@ -118,11 +135,12 @@ async def _main(prefix, tokenvar, wait, hostname, command):
 @click.option("-p", "--prefix", default=PREFIX, type=str, show_default=True)
 @click.option("-t", "--tokenvar", default=TOKENVAR, type=str, show_default=True)
 @click.option("-a", "--wait", default=WAIT, type=float, show_default=True)
+@click.option("-c", "--cache", default=CACHE_TTL, type=float, show_default=True)
 @click.option("-l", "--log_level", default=ERROR, type=int, show_default=True)
 @click.argument("hostname", nargs=1, type=str)
 @click.argument("command", nargs=1, type=str, default="")
-def ssh(prefix, tokenvar, wait, log_level, hostname, command):
+def ssh(prefix, tokenvar, wait, cache, log_level, hostname, command):
 
     configure_log(log_level)
 
-    run(_main(prefix, tokenvar, wait, hostname, command))
+    run(_main(prefix, tokenvar, wait, cache, hostname, command))
@@ -34,6 +34,26 @@ from abc import ABC
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+class AdaptorABC(ABC):
+    pass
+
+
+class AdaptPolicyABC(ABC):
+    pass
+
+
+class BackendABC(ABC):
+    pass
+
+
+class CAStoreABC(ABC):
+    pass
+
+
+class CatalogABC(ABC):
+    pass
+
+
 class ClusterABC(ABC):
     pass
 
@@ -46,13 +66,65 @@ class CreatorABC(ABC):
     pass
 
 
+class FakeCloudABC(ABC):
+    pass
+
+
+class FakeServerABC(ABC):
+    pass
+
+
+class GraphABC(ABC):
+    pass
+
+
+class HetznerProviderABC(ABC):
+    pass
+
+
+class InstanceABC(ABC):
+    pass
+
+
+class LayoutABC(ABC):
+    pass
+
+
+class LocalProviderABC(ABC):
+    pass
+
+
+class NetworkABC(ABC):
+    pass
+
+
 class NodeABC(ABC):
     pass
 
 
+class PoolABC(ABC):
+    pass
+
+
 class ProcessABC(ABC):
     pass
 
 
+class ProviderABC(ABC):
+    pass
+
+
+class ResourceABC(ABC):
+    pass
+
+
 class SSHConfigABC(ABC):
     pass
+
+
+class StepABC(ABC):
+    pass
+
+
+class TimelineABC(ABC):
+    pass
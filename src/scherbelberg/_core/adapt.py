@@ -0,0 +1,408 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/adapt.py: Adaptive scaling of a cluster
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import CancelledError, create_task, sleep
+from datetime import datetime, timezone
+from logging import getLogger, Logger
+from math import ceil
+from time import monotonic
+from typing import Any, Dict, List, Optional, Union
+
+from .abc import AdaptorABC, AdaptPolicyABC, ClusterABC, NodeABC
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class AdaptPolicy(AdaptPolicyABC):
+    """
+    Describes how a cluster adapts its number of workers to the load of the Dask scheduler. Immutable.
+
+    Args:
+        interval : Seconds between two consecutive observations of the scheduler.
+        target_duration : Seconds within which the current backlog of tasks should be processable. Should not be shorter than the time required for provisioning a new worker.
+        memory_high : Fraction of worker memory in use above which workers are added.
+        memory_low : Fraction of worker memory in use above which no workers are removed.
+        hysteresis_up : Number of consecutive observations demanding more workers before workers are added.
+        hysteresis_down : Number of consecutive observations demanding fewer workers before workers are removed.
+        cooldown_up : Seconds after any scaling event before workers can be added again.
+        cooldown_down : Seconds after any scaling event before workers can be removed again.
+        step : Maximum number of workers added in one scaling event.
+        billing : Seconds per billing unit of a server.
+        billing_margin : Workers are only removed if their current billing unit ends within this number of seconds.
+    """
+
+    def __init__(
+        self,
+        interval: float = 30.0,
+        target_duration: float = 300.0,
+        memory_high: float = 0.8,
+        memory_low: float = 0.4,
+        hysteresis_up: int = 2,
+        hysteresis_down: int = 10,
+        cooldown_up: float = 120.0,
+        cooldown_down: float = 600.0,
+        step: int = 4,
+        billing: float = 3600.0,
+        billing_margin: float = 300.0,
+    ):
+
+        assert interval > 0
+        assert target_duration > 0
+        assert 0 < memory_low < memory_high <= 1
+        assert hysteresis_up > 0
+        assert hysteresis_down > 0
+        assert cooldown_up >= 0
+        assert cooldown_down >= 0
+        assert step > 0
+        assert billing > 0
+        assert 0 < billing_margin <= billing
+
+        self._interval = interval
+        self._target_duration = target_duration
+        self._memory_high = memory_high
+        self._memory_low = memory_low
+        self._hysteresis_up = hysteresis_up
+        self._hysteresis_down = hysteresis_down
+        self._cooldown_up = cooldown_up
+        self._cooldown_down = cooldown_down
+        self._step = step
+        self._billing = billing
+        self._billing_margin = billing_margin
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<AdaptPolicy interval={self._interval:0.01f} target_duration={self._target_duration:0.01f} step={self._step:d}>"
+
+    def target(self, metrics: Dict[str, Any], minimum: int, maximum: int) -> int:
+        """
+        Computes the desired number of workers based on scheduler metrics.
+
+        Args:
+            metrics : Scheduler metrics, see :meth:`scherbelberg.Adaptor.get_metrics`.
+            minimum : Minimum number of workers.
+            maximum : Maximum number of workers.
+        Returns:
+            Desired number of workers.
+        """
+
+        assert 0 < minimum <= maximum
+
+        workers = metrics["workers"]
+        if workers == 0:
+            return minimum
+
+        threads = max(metrics["nthreads"] / workers, 1.0)
+        target = ceil(metrics["occupancy"] / (self._target_duration * threads))
+
+        if metrics["unrunnable"] > 0 or metrics["memory"] > self._memory_high:
+            target = max(target, workers + 1)
+        elif metrics["memory"] > self._memory_low:
+            target = max(target, workers)
+
+        return min(max(target, minimum), maximum)
+
+    def removable(
+        self, workers: List[NodeABC], count: int, now: Optional[datetime] = None
+    ) -> List[NodeABC]:
+        """
+        Selects workers which can be removed without wasting already paid time, i.e. workers whose current billing unit is about to end.
+
+        Args:
+            workers : Candidates.
+            count : Maximum number of workers to select.
+            now : Current point in time, defaults to now.
+        Returns:
+            Selected workers, those closest to the end of their billing unit first.
+        """
+
+        if now is None:
+            now = datetime.now(timezone.utc)
+
+        remaining = {
+            node: self._billing - (now - node.created).total_seconds() % self._billing
+            for node in workers
+        }
+
+        return sorted(
+            [node for node in workers if remaining[node] <= self._billing_margin],
+            key=lambda node: remaining[node],
+        )[:count]
+
+    @property
+    def interval(self) -> float:
+        """
+        Seconds between two consecutive observations of the scheduler
+        """
+
+        return self._interval
+
+    @property
+    def target_duration(self) -> float:
+        """
+        Seconds within which the current backlog of tasks should be processable
+        """
+
+        return self._target_duration
+
+    @property
+    def hysteresis_up(self) -> int:
+        """
+        Number of consecutive observations demanding more workers before workers are added
+        """
+
+        return self._hysteresis_up
+
+    @property
+    def hysteresis_down(self) -> int:
+        """
+        Number of consecutive observations demanding fewer workers before workers are removed
+        """
+
+        return self._hysteresis_down
+
+    @property
+    def cooldown_up(self) -> float:
+        """
+        Seconds after any scaling event before workers can be added again
+        """
+
+        return self._cooldown_up
+
+    @property
+    def cooldown_down(self) -> float:
+        """
+        Seconds after any scaling event before workers can be removed again
+        """
+
+        return self._cooldown_down
+
+    @property
+    def step(self) -> int:
+        """
+        Maximum number of workers added in one scaling event
+        """
+
+        return self._step
+
+
+@typechecked
+class Adaptor(AdaptorABC):
+    """
+    Background loop adapting the number of workers of a cluster to the load of its Dask scheduler. Mutable.
+    Use :meth:`scherbelberg.Cluster.adapt` to instantiate objects of this class.
+
+    Args:
+        cluster : The cluster to adapt.
+        minimum : Minimum number of workers.
+        maximum : Maximum number of workers.
+        policy : Scaling policy.
+        log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
+    """
+
+    def __init__(
+        self,
+        cluster: ClusterABC,
+        minimum: int,
+        maximum: int,
+        policy: AdaptPolicyABC,
+        log: Union[Logger, None] = None,
+    ):
+
+        assert 0 < minimum <= maximum
+
+        self._cluster = cluster
+        self._minimum = minimum
+        self._maximum = maximum
+        self._policy = policy
+        self._log = getLogger(name=cluster.prefix) if log is None else log
+
+        self._task = None
+        self._client = None
+
+        self._up = 0  # consecutive observations demanding more workers
+        self._down = 0  # consecutive observations demanding fewer workers
+        self._last = None  # time of last scaling event
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<Adaptor running={str(self.running):s} minimum={self._minimum:d} maximum={self._maximum:d}>"
+
+    async def start(self):
+        """
+        Starts the background loop.
+        """
+
+        if self.running:
+            raise SystemError("adaptor is already running")
+
+        self._client = await self._cluster.get_client(asynchronous=True)
+        await self._client
+
+        self._task = create_task(self._loop())
+
+    async def stop(self):
+        """
+        Stops the background loop. Scaling events in progress are cancelled.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except CancelledError:
+                pass
+            self._task = None
+
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        """
+        Queries load metrics from the Dask scheduler.
+
+        Returns:
+            Number of workers, threads, tasks and unrunnable tasks, total occupancy in seconds and fraction of worker memory in use.
+        """
+
+        def metrics(dask_scheduler=None):  # nested, pickled by value
+            workers = list(dask_scheduler.workers.values())
+            memory = sum(ws.metrics.get("memory", 0) for ws in workers)
+            limit = sum(ws.memory_limit or 0 for ws in workers)
+            return {
+                "workers": len(workers),
+                "nthreads": dask_scheduler.total_nthreads,
+                "tasks": len(dask_scheduler.tasks),
+                "unrunnable": len(dask_scheduler.unrunnable),
+                "occupancy": float(dask_scheduler.total_occupancy),
+                "memory": memory / limit if limit > 0 else 0.0,
+            }
+
+        return await self._client.run_on_scheduler(metrics)
+
+    async def step(self):
+        """
+        Observes the scheduler once and adds or removes workers if required by the policy.
+        """
+
+        metrics = await self.get_metrics()
+        workers = self._cluster.workers
+        pending = self._cluster.pending  # already requested
+        current = len(workers) + pending
+        target = self._policy.target(metrics, self._minimum, self._maximum)
+
+        self._log.debug(
+            "Adaptor: %d worker(s), %d pending, target %d, metrics %s",
+            len(workers),
+            pending,
+            target,
+            metrics,
+        )
+
+        if target > current:
+            self._up, self._down = self._up + 1, 0
+        elif target < current:
+            self._up, self._down = 0, self._down + 1
+        else:
+            self._up, self._down = 0, 0
+
+        since = float("inf") if self._last is None else monotonic() - self._last
+
+        if self._up >= self._policy.hysteresis_up and since >= self._policy.cooldown_up:
+            count = min(target - current, self._policy.step)
+            self._log.info("Adaptor: adding %d worker(s) ...", count)
+            await self._cluster.scale_up(workers=count)
+            self._up, self._last = 0, monotonic()
+
+        elif (
+            self._down >= self._policy.hysteresis_down
+            and since >= self._policy.cooldown_down
+        ):
+            # keep target minus pending and at least one worker running
+            count = min(current - target, len(workers) - max(target - pending, 1))
+            nodes = self._policy.removable(workers, count) if count > 0 else []
+            if len(nodes) == 0:
+                self._log.debug("Adaptor: no worker at the end of its billing unit.")
+                return
+            self._log.info("Adaptor: removing %d worker(s) ...", len(nodes))
+            await self._cluster.remove_workers(nodes)
+            self._down, self._last = 0, monotonic()
+
+    async def _loop(self):
+
+        while True:
+            try:
+                await self.step()
+            except CancelledError:
+                raise
+            except Exception as e:  # keep adapting, e.g. on temporary API errors
+                self._log.exception("Adaptor: %s", repr(e))
+            await sleep(self._policy.interval)
+
+    @property
+    def maximum(self) -> int:
+        """
+        Maximum number of workers
+        """
+
+        return self._maximum
+
+    @property
+    def minimum(self) -> int:
+        """
+        Minimum number of workers
+        """
+
+        return self._minimum
+
+    @property
+    def policy(self) -> AdaptPolicyABC:
+        """
+        Scaling policy
+        """
+
+        return self._policy
+
+    @property
+    def running(self) -> bool:
+        """
+        Is the background loop running?
+        """
+
+        return self._task is not None and not self._task.done()
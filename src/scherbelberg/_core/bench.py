@@ -0,0 +1,818 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/bench.py: Benchmarks
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import create_subprocess_exec, open_connection, sleep
+from collections import Counter
+from datetime import datetime, timezone
+from getpass import getuser
+import json
+import os
+import shutil
+import socket
+from statistics import median
+from subprocess import DEVNULL, PIPE, Popen
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .abc import ClusterABC, SSHConfigABC
+from .catalog import get_servertypes
+from .cluster import Cluster
+from .command import Command
+from .const import (
+    BENCH_BUDGET,
+    BENCH_COMMANDS,
+    BENCH_IMPORTS,
+    BENCH_RESULTS,
+    BENCH_WORKLOADS,
+    DASK_PROTOCOLS,
+    WAIT,
+)
+from .creator import Creator
+from .debug import typechecked
+from .fake import FakeCloud, FakeServer, FakeSSH
+from .hetzner import HetznerProvider
+from .sshconfig import SSHConfig
+from .sshkey import create_ssh_key
+from .ssl import create_ca, create_signed_cert, write_certs
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_IMPORTS = {
+    "package": "import scherbelberg",
+    "version": "from scherbelberg._cli import cli; cli(['--version'])",
+    "help": "from scherbelberg._cli import cli; cli(['--help'])",
+    "ssh": "from scherbelberg._cli import cli; cli(['ssh', '--help'])",
+}
+_IMPORTS_BUDGETED = ("package", "version", "help")  # subcommands import what they need
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+async def bench_transport(
+    protocols: Tuple[str, ...] = DASK_PROTOCOLS,
+    size: int = 2 ** 27,
+    chunk: int = 2 ** 20,
+    repeat: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Measures the throughput of Dask's communication layer per protocol on the local machine.
+    A listener and a connecting comm are set up on the loopback interface, mimicking a worker-to-worker transfer.
+    TLS uses certificates equivalent to the ones created for a cluster.
+
+    Args:
+        protocols : Protocols to compare.
+        size : Number of bytes transferred per run.
+        chunk : Number of bytes per message.
+        repeat : Number of runs per protocol. The fastest run is reported.
+    Returns:
+        One result per protocol, including throughput in MiB/s.
+    """
+
+    assert len(protocols) > 0
+    assert all(protocol in DASK_PROTOCOLS for protocol in protocols)
+    assert chunk > 0
+    assert size >= chunk
+    assert size % chunk == 0
+    assert repeat > 0
+
+    from distributed.security import Security
+
+    results = []
+
+    with TemporaryDirectory() as fld:
+
+        ca_key, ca_cert = await create_ca(prefix="bench")
+        await write_certs(ca_key, ca_cert, name=os.path.join(fld, "ca"))
+        key, cert = await create_signed_cert(
+            ca_key=ca_key, ca_cert=ca_cert, prefix="bench"
+        )
+        await write_certs(key, cert, name=os.path.join(fld, "cert"))
+
+        security = Security(
+            tls_ca_file=os.path.join(fld, "ca.pub"),
+            tls_scheduler_cert=os.path.join(fld, "cert.pub"),
+            tls_scheduler_key=os.path.join(fld, "cert"),
+            tls_client_cert=os.path.join(fld, "cert.pub"),
+            tls_client_key=os.path.join(fld, "cert"),
+        )
+
+        for protocol in protocols:
+            durations = [
+                await _transport_run(protocol, security, size, chunk)
+                for _ in range(repeat)
+            ]
+            duration = min(durations)
+            results.append(
+                {
+                    "protocol": protocol,
+                    "size": size,
+                    "chunk": chunk,
+                    "repeat": repeat,
+                    "seconds": duration,
+                    "throughput": size / duration / 2 ** 20,
+                }
+            )
+
+    fastest = max(result["throughput"] for result in results)
+    for result in results:
+        result["relative"] = result["throughput"] / fastest
+
+    return results
+
+
+@typechecked
+async def bench_command(
+    phases: Tuple[str, ...] = BENCH_COMMANDS,
+    repeat: int = 20,
+    size: int = 2 ** 20,
+    wait: float = WAIT,
+    sshd: str = "sshd",
+) -> List[Dict[str, Any]]:
+    """
+    Measures the overhead of running commands via :meth:`scherbelberg.Command.run` on the local machine.
+    ``build`` constructs commands via :meth:`scherbelberg.Command.on_host` without running them, ``local`` runs ``true`` locally,
+    ``ssh`` runs ``true`` via ``ssh`` and ``scp`` uploads a file, both against a temporary ``sshd`` listening on the loopback interface.
+    Spawn and connect times are taken from spans, see :meth:`scherbelberg.Command.add_hook`.
+
+    Args:
+        phases : Phases to measure.
+        repeat : Number of runs per phase.
+        size : Number of bytes uploaded per ``scp`` run.
+        wait : Interval defining every how many seconds the status of running processes is being observed.
+        sshd : Name of or path to the ``sshd`` executable, also looked up in ``/usr/sbin``. It runs as the current user.
+    Returns:
+        One result per phase, including median times in seconds.
+    """
+
+    assert len(phases) > 0
+    assert all(phase in BENCH_COMMANDS for phase in phases)
+    assert repeat > 0
+    assert size > 0
+    assert wait > 0
+
+    results = []
+    spans = []
+
+    with TemporaryDirectory() as fld:
+
+        fn_data = os.path.join(fld, "data")
+        with open(fn_data, mode="wb") as f:
+            f.write(os.urandom(size))  # incompressible
+
+        server, host, error = None, None, None
+        if "ssh" in phases or "scp" in phases:
+            try:
+                server, host = await _command_sshd(fld, sshd)
+            except Exception as e:  # reported as part of the results
+                error = f"{type(e).__name__:s}: {e}"
+
+        runners = {
+            "local": lambda: Command.from_list(["true"]).run(
+                returncode=True, wait=wait
+            ),
+            "ssh": lambda: Command.from_list(["true"])
+            .on_host(host)
+            .run(returncode=True, wait=wait),
+            "scp": lambda: Command.from_scp(
+                fn_data, target=os.path.join(fld, "upload"), host=host
+            ).run(returncode=True, wait=wait),
+        }
+
+        Command.add_hook(spans.append)
+
+        try:
+            for phase in phases:
+                spans.clear()
+                if phase == "build":
+                    durations = _command_build(repeat)
+                    results.append(_command_result(phase, durations, spans, None))
+                elif phase in ("ssh", "scp") and error is not None:
+                    results.append(_command_result(phase, [], spans, error))
+                else:
+                    durations = await _command_run(runners[phase], repeat)
+                    results.append(_command_result(phase, durations, spans, None))
+
+        finally:
+            Command.remove_hook(spans.append)
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    return results
+
+
+@typechecked
+async def bench_imports(
+    targets: Tuple[str, ...] = BENCH_IMPORTS,
+    repeat: int = 5,
+    budget: float = BENCH_BUDGET,
+) -> List[Dict[str, Any]]:
+    """
+    Measures the start-up time of the package and of its command line interface, each in fresh interpreters.
+    ``package`` imports ``scherbelberg``, ``version`` and ``help`` run ``scherbelberg --version`` and ``scherbelberg --help``
+    and ``ssh`` runs ``scherbelberg ssh --help``, which imports the modules required for talking to clusters.
+    The start-up time of a bare interpreter is subtracted.
+
+    Args:
+        targets : Targets to measure.
+        repeat : Number of interpreters started per target.
+        budget : Time in seconds the package itself, ``--version`` and ``--help`` may take at most.
+    Returns:
+        One result per target, including median times in seconds.
+    """
+
+    assert len(targets) > 0
+    assert all(target in BENCH_IMPORTS for target in targets)
+    assert repeat > 0
+    assert budget > 0
+
+    baseline = median(await _imports_run("pass", repeat))
+
+    results = []
+    for target in targets:
+        try:
+            durations = await _imports_run(_IMPORTS[target], repeat)
+        except Exception as e:  # reported as part of the results
+            durations, error = [], f"{type(e).__name__:s}: {e}"
+        else:
+            error = None
+        runtime = median(durations) - baseline if len(durations) > 0 else None
+        budgeted = target in _IMPORTS_BUDGETED
+        results.append(
+            {
+                "target": target,
+                "runs": len(durations),
+                "runtime": runtime,
+                "baseline": baseline,
+                "budget": budget if budgeted else None,
+                "ok": error is None and (not budgeted or runtime <= budget),
+                "error": error,
+            }
+        )
+
+    return results
+
+
+@typechecked
+async def bench_lifecycle(
+    workers: Tuple[int, ...] = (1, 10, 100),
+    latency: float = 0.05,
+    boot: float = 0.0,
+    ssh: float = 0.0,
+    failure: float = 0.0,
+    rate_limit: Optional[float] = None,
+    burst: int = 3600,
+    wait: float = 0.01,
+    seed: Optional[int] = None,
+    http: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Measures querying the catalog as well as creating, attaching to and destroying clusters of various sizes against offline stand-ins for the cloud API and SSH, see :class:`scherbelberg.FakeCloud` and :class:`scherbelberg.FakeSSH`.
+    No servers are created, nothing is billed. Durations reflect scherbelberg's own overhead, i.e. the number of API requests and commands, their concurrency and the configured latencies.
+
+    Args:
+        workers : Cluster sizes in terms of numbers of workers. Each cluster has an additional scheduler.
+        latency : Time in seconds each API request takes.
+        boot : Time in seconds until a new server is running.
+        ssh : Time in seconds each ``ssh`` or ``scp`` command takes.
+        failure : Probability of the creation of a server being rejected by the cloud API.
+        rate_limit : Sustained number of API requests per second. ``None`` disables rate limiting.
+        burst : Number of API requests which can be sent at once before the rate limit applies.
+        wait : Time in seconds between polls while waiting for servers, SSH and actions.
+        seed : Seed for random failures.
+        http : Serves the fake cloud API via HTTP on the loopback interface, see :class:`scherbelberg.FakeServer`, instead of answering requests within the client's transport layer. Includes the cost of sockets and serialization.
+    Returns:
+        One result per cluster size and phase, i.e. ``catalog``, ``create``, ``attach`` and ``destroy``, including duration and numbers of API requests and commands.
+    """
+
+    assert len(workers) > 0
+    assert all(count > 0 for count in workers)
+    assert wait > 0.0
+
+    results = []
+    cwd = os.getcwd()
+
+    for count in workers:
+
+        cloud = FakeCloud(
+            latency=latency,
+            boot=boot,
+            reboot=boot,
+            failure=failure,
+            rate_limit=rate_limit,
+            burst=burst,
+            seed=seed,
+        )
+        server = FakeServer(cloud=cloud) if http else None
+        client = (cloud if server is None else server).client(poll_interval=wait)
+        provider = HetznerProvider(client)
+
+        with TemporaryDirectory() as fld, FakeSSH(
+            latency=ssh, cloud=cloud, seed=seed
+        ) as backend:
+
+            os.chdir(fld)
+            if server is not None:
+                server.start()
+            try:
+
+                _, error = await _lifecycle_run(
+                    results,
+                    count,
+                    "catalog",
+                    get_servertypes(client=client, ttl=0.0),
+                    cloud,
+                    backend,
+                )
+                if error is not None:
+                    continue
+
+                creator = Creator(
+                    provider=provider,
+                    prefix="bench",
+                    fn_public=os.path.join(fld, ".bench", "ssh.pub"),
+                    fn_private=os.path.join(fld, ".bench", "ssh"),
+                    wait=wait,
+                )
+                _, error = await _lifecycle_run(
+                    results,
+                    count,
+                    "create",
+                    creator.create(workers=count),
+                    cloud,
+                    backend,
+                )
+                if error is not None:  # fake cloud and folder are discarded anyway
+                    continue
+
+                cluster, error = await _lifecycle_run(
+                    results,
+                    count,
+                    "attach",
+                    Cluster.from_existing(prefix="bench", wait=wait, provider=provider),
+                    cloud,
+                    backend,
+                )
+                if error is not None:
+                    continue
+
+                await _lifecycle_run(
+                    results, count, "destroy", cluster.destroy(), cloud, backend
+                )
+
+            finally:
+                if server is not None:
+                    server.stop()
+                os.chdir(cwd)
+
+    return results
+
+
+@typechecked
+async def bench_workloads(
+    cluster: ClusterABC,
+    workloads: Tuple[str, ...] = BENCH_WORKLOADS,
+    scale: float = 1.0,
+    repeat: int = 1,
+    prices: Optional[Dict[str, float]] = None,
+    fn: str = BENCH_RESULTS,
+) -> List[Dict[str, Any]]:
+    """
+    Runs representative Dask workloads against a live cluster via :meth:`scherbelberg.Cluster.get_client`.
+    ``array`` computes reductions of a random array, ``shuffle`` shuffles a dataframe by a random key,
+    ``tasks`` submits many tiny tasks and ``zarr`` writes and reads a zarr array to and from the local disk of every worker.
+    Results are appended to a file as JSON lines together with the server types of the cluster, so runs and clusters can be compared.
+
+    Args:
+        cluster : A running cluster.
+        workloads : Workloads to run.
+        scale : Factor for the amount of work per workload. ``1.0`` corresponds to 2 GiB of array data, 2^24 dataframe rows, 2^14 tasks and 512 MiB of disk data per worker.
+        repeat : Number of runs per workload.
+        prices : Hourly price per server type. Defaults to prices from the catalog of the provider, see :meth:`scherbelberg.Provider.get_catalog`. Costs are not reported if the provider lacks a catalog.
+        fn : Path to results file. Defaults to ``~/.scherbelberg/workloads.jsonl``, i.e. results outlive the cluster.
+    Returns:
+        One result per workload and run, including throughput in units per second, scheduler overhead in seconds per task and cost per unit.
+    """
+
+    assert len(workloads) > 0
+    assert all(workload in BENCH_WORKLOADS for workload in workloads)
+    assert scale > 0
+    assert repeat > 0
+
+    runners = {
+        "array": _workload_array,
+        "shuffle": _workload_shuffle,
+        "tasks": _workload_tasks,
+        "zarr": _workload_zarr,
+    }
+
+    nodes = [cluster.scheduler, *cluster.workers]
+    hourly = await _workloads_hourly(nodes, cluster.provider, prices)
+
+    results = []
+
+    client = await cluster.get_client(asynchronous=True)
+    await client
+
+    try:
+        info = client.scheduler_info()["workers"].values()
+        setup = {
+            "prefix": cluster.prefix,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "scheduler": cluster.scheduler.servertype,
+            "workers": dict(Counter(node.servertype for node in cluster.workers)),
+            "datacenters": sorted({node.datacenter for node in nodes}),
+            "threads": sum(worker["nthreads"] for worker in info),
+            "memory": sum(worker["memory_limit"] for worker in info),
+            "hourly": hourly,
+            "scale": scale,
+        }
+
+        for workload in workloads:
+            for index in range(repeat):
+                seconds, units, unit, tasks, error = None, None, None, None, None
+                try:
+                    seconds, units, unit, tasks = await runners[workload](client, scale)
+                except Exception as e:  # reported as part of the results
+                    error = f"{type(e).__name__:s}: {e}"
+                cost = None
+                if hourly is not None and error is None:
+                    cost = hourly * seconds / 3600
+                results.append(
+                    {
+                        "workload": workload,
+                        "run": index,
+                        "seconds": seconds,
+                        "units": units,
+                        "unit": unit,
+                        "throughput": None if error is not None else units / seconds,
+                        "tasks": tasks,
+                        "overhead": None if error is not None else seconds / tasks,
+                        "cost": cost,
+                        "cost_per_unit": None if cost is None else cost / units,
+                        "error": error,
+                        **setup,
+                    }
+                )
+
+    finally:
+        await client.close()
+
+    fn = os.path.expanduser(fn)
+    os.makedirs(os.path.dirname(os.path.abspath(fn)), exist_ok=True)
+    with open(fn, mode="a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+    return results
+
+
+def _command_build(repeat: int) -> List[float]:
+
+    host = SSHConfig(name="127.0.0.1", user="bench", fn_private="bench")
+
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        _ = Command.from_str("echo hello | wc -c").on_host(host)
+        durations.append(perf_counter() - start)
+
+    return durations
+
+
+def _command_result(
+    phase: str,
+    durations: List[float],
+    spans: List[Dict[str, Any]],
+    error: Optional[str],
+) -> Dict[str, Any]:
+
+    def middle(field):
+        values = [span[field] for span in spans if span[field] is not None]
+        return median(values) if len(values) > 0 else None
+
+    return {
+        "phase": phase,
+        "runs": len(durations),
+        "failed": sum(not span["ok"] for span in spans),
+        "runtime": median(durations) if len(durations) > 0 else None,
+        "runtime_min": min(durations) if len(durations) > 0 else None,
+        "runtime_max": max(durations) if len(durations) > 0 else None,
+        "spawn": middle("spawn"),
+        "connect": middle("connect"),
+        "bytes_in": middle("bytes_in"),
+        "bytes_out": middle("bytes_out"),
+        "error": error,
+    }
+
+
+async def _command_run(runner: Callable[[], Awaitable], repeat: int) -> List[float]:
+
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        await runner()
+        durations.append(perf_counter() - start)
+
+    return durations
+
+
+async def _command_sshd(fld: str, sshd: str) -> Tuple[Popen, SSHConfigABC]:
+
+    path = shutil.which(sshd) or shutil.which(sshd, path="/usr/sbin:/usr/local/sbin")
+    if path is None:
+        raise FileNotFoundError(f"sshd executable not found: {sshd:s}")
+
+    for name in ("host", "client"):
+        await create_ssh_key(
+            fn_private=os.path.join(fld, name),
+            fn_public=os.path.join(fld, f"{name:s}.pub"),
+            comment=f"bench-{name:s}",
+        )
+    shutil.copy(os.path.join(fld, "client.pub"), os.path.join(fld, "authorized_keys"))
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    fn_config = os.path.join(fld, "sshd_config")
+    with open(fn_config, mode="w", encoding="utf-8") as f:
+        f.write(
+            "\n".join(
+                [
+                    "ListenAddress 127.0.0.1",
+                    f"Port {port:d}",
+                    f"HostKey {os.path.join(fld, 'host'):s}",
+                    f"AuthorizedKeysFile {os.path.join(fld, 'authorized_keys'):s}",
+                    f"PidFile {os.path.join(fld, 'sshd.pid'):s}",
+                    "PasswordAuthentication no",
+                    "StrictModes no",  # temporary folder
+                    "UsePAM no",
+                    "",
+                ]
+            )
+        )
+
+    server = Popen(  # sshd demands absolute path
+        [os.path.abspath(path), "-D", "-e", "-f", fn_config],
+        stdout=DEVNULL,
+        stderr=DEVNULL,
+    )
+
+    start = perf_counter()
+    while True:
+        if server.poll() is not None:
+            raise SystemError("sshd terminated", server.returncode)
+        try:
+            _, writer = await open_connection("127.0.0.1", port)
+        except OSError:
+            if perf_counter() - start > 10.0:
+                server.terminate()
+                raise
+            await sleep(0.05)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        break
+
+    return server, SSHConfig(
+        name="127.0.0.1",
+        user=getuser(),
+        fn_private=os.path.join(fld, "client"),
+        port=port,
+    )
+
+
+async def _imports_run(code: str, repeat: int) -> List[float]:
+
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        proc = await create_subprocess_exec(
+            sys.executable, "-c", code, stdout=DEVNULL, stderr=PIPE
+        )
+        _, stderr = await proc.communicate()
+        durations.append(perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode("utf-8").strip().split("\n")[-1])
+
+    return durations
+
+
+async def _lifecycle_run(
+    results: List[Dict[str, Any]],
+    workers: int,
+    phase: str,
+    coro: Awaitable,
+    cloud: FakeCloud,
+    backend: FakeSSH,
+) -> Tuple[Any, Optional[str]]:
+
+    requests = sum(cloud.requests.values())
+    commands = sum(backend.commands.values())
+
+    value, error = None, None
+    start = perf_counter()
+    try:
+        value = await coro
+    except Exception as e:  # reported as part of the results
+        error = f"{type(e).__name__:s}: {e}"
+    duration = perf_counter() - start
+
+    results.append(
+        {
+            "workers": workers,
+            "phase": phase,
+            "seconds": duration,
+            "requests": sum(cloud.requests.values()) - requests,
+            "commands": sum(backend.commands.values()) - commands,
+            "servers": cloud.servers,
+            "error": error,
+        }
+    )
+
+    return value, error
+
+
+async def _transport_run(protocol: str, security: Any, size: int, chunk: int) -> float:
+
+    from distributed.comm import connect, listen
+
+    async def handler(comm):
+        received = 0
+        while received < size:
+            received += len(await comm.read())
+        await comm.write(received)
+        await comm.close()
+
+    listen_args = security.get_listen_args("scheduler") if protocol == "tls" else {}
+    connection_args = (
+        security.get_connection_args("client") if protocol == "tls" else {}
+    )
+
+    listener = await listen(f"{protocol:s}://127.0.0.1:0", handler, **listen_args)
+    comm = await connect(listener.contact_address, **connection_args)
+
+    payload = os.urandom(chunk)  # incompressible
+
+    start = perf_counter()
+    for _ in range(size // chunk):
+        await comm.write(payload)
+    received = await comm.read()
+    duration = perf_counter() - start
+
+    await comm.close()
+    listener.stop()
+
+    assert received == size
+
+    return duration
+
+
+async def _workloads_hourly(
+    nodes: List[Any], provider: Any, prices: Optional[Dict[str, float]]
+) -> Optional[float]:
+
+    if prices is not None:
+        return sum(prices[node.servertype] for node in nodes)
+
+    catalog = await provider.get_catalog()
+    if catalog is None:  # provider without prices
+        return None
+
+    hourly = 0.0
+    for node in nodes:
+        servertype = catalog.get_servertype(node.servertype, datacenter=node.datacenter)
+        hourly += servertype["price_hourly_gross"]
+
+    return hourly
+
+
+async def _workload_array(client: Any, scale: float) -> Tuple[float, int, str, int]:
+
+    import dask.array as da
+    from dask.base import collections_to_dsk
+
+    side = int(2 ** 14 * scale ** 0.5)
+    chunk = min(side, 2 ** 11)
+
+    array = da.random.random((side, side), chunks=(chunk, chunk))
+    reductions = [array.sum(), array.mean(axis=0), array.std()]
+    tasks = len(collections_to_dsk(reductions, optimize_graph=False))
+
+    start = perf_counter()
+    await client.gather(client.compute(reductions))
+    duration = perf_counter() - start
+
+    return duration, array.nbytes, "bytes", tasks
+
+
+async def _workload_shuffle(client: Any, scale: float) -> Tuple[float, int, str, int]:
+
+    import dask.array as da
+    import dask.dataframe as dd
+    from dask.base import collections_to_dsk
+
+    rows = max(1, int(2 ** 24 * scale))
+    chunk = min(rows, 2 ** 20)
+
+    frame = dd.from_dask_array(
+        da.stack(
+            [
+                da.random.randint(0, rows, size=rows, chunks=chunk),
+                da.random.random(rows, chunks=chunk),
+            ],
+            axis=1,
+        ),
+        columns=["id", "value"],
+    )
+    count = frame.shuffle("id").map_partitions(len).sum()
+    tasks = len(collections_to_dsk([count], optimize_graph=False))
+
+    start = perf_counter()
+    await client.compute(count)
+    duration = perf_counter() - start
+
+    return duration, rows, "rows", tasks
+
+
+async def _workload_tasks(client: Any, scale: float) -> Tuple[float, int, str, int]:
+
+    count = max(1, int(2 ** 14 * scale))
+
+    def tiny(value):  # nested, pickled by value
+        return value + 1
+
+    start = perf_counter()
+    await client.gather(client.map(tiny, range(count), pure=False))
+    duration = perf_counter() - start
+
+    return duration, count, "tasks", count
+
+
+async def _workload_zarr(client: Any, scale: float) -> Tuple[float, int, str, int]:
+
+    elements = max(1, int(2 ** 26 * scale))  # float64, i.e. 512 MiB at scale 1
+
+    def io(elements=None):  # nested, pickled by value, runs on every worker
+        from tempfile import TemporaryDirectory
+        from time import perf_counter
+
+        import numpy as np
+        import zarr
+
+        data = np.random.random(elements)
+        with TemporaryDirectory() as path:
+            start = perf_counter()
+            array = zarr.open(
+                path,
+                mode="w",
+                shape=data.shape,
+                chunks=(min(elements, 2 ** 22),),
+                dtype=data.dtype,
+            )
+            array[:] = data
+            _ = zarr.open(path, mode="r")[:]
+            return perf_counter() - start
+
+    durations = await client.run(io, elements=elements)
+
+    return (
+        max(durations.values()),
+        2 * elements * 8 * len(durations),  # written plus read
+        "bytes",
+        len(durations),
+    )
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/castore.py: Persistent certificate authority
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from datetime import datetime, timedelta, timezone
+from logging import getLogger, Logger
+import os
+from typing import Tuple, Union
+
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+
+from .abc import CAStoreABC
+from .const import CA_RENEW, CA_STORE, TLS_KEY_TYPE, TLS_KEY_TYPES
+from .debug import typechecked
+from .ssl import (
+    PrivateKey,
+    create_ca,
+    create_signed_cert,
+    key_type_of,
+    read_certs,
+    write_certs,
+)
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class CAStore(CAStoreABC):
+    """
+    Persistent certificate authority (CA) in a user-level directory, shared by clusters.
+    Issues one leaf certificate per cluster and caches it, so re-creating a cluster with the same prefix does not generate new keys.
+    Clients only need to trust the store's CA once, see :attr:`scherbelberg.CAStore.ca_file`. Mutable.
+
+    Args:
+        path : Location of the store on the local file system.
+        key_type : Type of keys of new certificates, either ``ecdsa`` (default), ``ed25519`` or ``rsa``.
+        log : Logger.
+    """
+
+    def __init__(
+        self,
+        path: str = CA_STORE,
+        key_type: str = TLS_KEY_TYPE,
+        log: Union[Logger, None] = None,
+    ):
+
+        assert len(path) > 0
+        assert key_type in TLS_KEY_TYPES
+
+        self._path = os.path.abspath(os.path.expanduser(path))
+        self._key_type = key_type
+        self._log = getLogger(name="scherbelberg") if log is None else log
+
+        self._ca = None
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<CAStore path={self._path:s}>"
+
+    async def get_ca(self) -> Tuple[PrivateKey, x509.Certificate]:
+        """
+        Loads the certificate authority. It is created on first use and replaced once it is about to expire.
+
+        Returns:
+            Private key and certificate of the certificate authority.
+        """
+
+        if self._ca is not None:
+            return self._ca
+
+        if os.path.exists(self._fn_ca()) and os.path.exists(f"{self._fn_ca():s}.pub"):
+            key, cert = await read_certs(self._fn_ca())
+            if self._remaining(cert) > timedelta(days=CA_RENEW):
+                self._ca = key, cert
+                return self._ca
+            self._log.info("Certificate authority in %s about to expire.", self._path)
+
+        await self.rotate()
+
+        return self._ca
+
+    async def issue(
+        self, prefix: str, renew: bool = False
+    ) -> Tuple[PrivateKey, x509.Certificate]:
+        """
+        Issues a leaf certificate for a cluster.
+        A cached certificate is reused if it was issued by the current certificate authority, has the requested key type and is not about to expire.
+
+        Args:
+            prefix : Name of cluster.
+            renew : If set to ``True``, a new certificate is issued in any case.
+        Returns:
+            Private key and certificate.
+        """
+
+        assert len(prefix) > 0
+
+        ca_key, ca_cert = await self.get_ca()
+
+        fn = self._fn_leaf(prefix)
+        if not renew and os.path.exists(fn) and os.path.exists(f"{fn:s}.pub"):
+            key, cert = await read_certs(fn)
+            if self._valid(key, cert, ca_cert):
+                self._log.info("Reusing cached certificate for %s ...", prefix)
+                return key, cert
+
+        self._log.info("Issuing certificate for %s ...", prefix)
+
+        key, cert = await create_signed_cert(
+            ca_key=ca_key,
+            ca_cert=ca_cert,
+            prefix=prefix,
+            key_type=self._key_type,
+        )
+        await write_certs(key, cert, name=fn)
+
+        return key, cert
+
+    async def export(self, prefix: str, path: str, renew: bool = False):
+        """
+        Writes the files required by a cluster, ``ca.pub``, ``cert`` and ``cert.pub``, into a folder.
+        The private key of the certificate authority never leaves the store.
+
+        Args:
+            prefix : Name of cluster.
+            path : Target folder, usually ``.<prefix>`` in the current working directory.
+            renew : If set to ``True``, a new leaf certificate is issued in any case.
+        """
+
+        assert os.path.isdir(path)
+
+        key, cert = await self.issue(prefix, renew=renew)
+        _, ca_cert = await self.get_ca()
+
+        with open(os.path.join(path, "ca.pub"), "wb") as f:
+            f.write(ca_cert.public_bytes(encoding=serialization.Encoding.PEM))
+
+        await write_certs(key, cert, name=os.path.join(path, "cert"))
+
+    def forget(self, prefix: str):
+        """
+        Removes the cached leaf certificate of a cluster from the store.
+
+        Args:
+            prefix : Name of cluster.
+        """
+
+        for fn in (self._fn_leaf(prefix), f"{self._fn_leaf(prefix):s}.pub"):
+            if os.path.exists(fn):
+                self._log.info("Deleting %s ...", fn)
+                os.unlink(fn)
+
+    async def rotate(self):
+        """
+        Replaces the certificate authority by a new one.
+        Cached leaf certificates become invalid and are re-issued on next use.
+        Running clusters must be updated via :meth:`scherbelberg.Cluster.rotate_certs`.
+        """
+
+        self._log.info("Creating certificate authority in %s ...", self._path)
+
+        os.makedirs(os.path.join(self._path, "leaves"), mode=0o700, exist_ok=True)
+
+        self._ca = await create_ca(
+            prefix="scherbelberg",
+            valid_days=365 * 10,  # outlives the leaf certificates it issues
+            key_type=self._key_type,
+        )
+        await write_certs(*self._ca, name=self._fn_ca())
+
+    def _fn_ca(self) -> str:
+
+        return os.path.join(self._path, "ca")
+
+    def _fn_leaf(self, prefix: str) -> str:
+
+        return os.path.join(self._path, "leaves", prefix)
+
+    def _valid(
+        self, key: PrivateKey, cert: x509.Certificate, ca_cert: x509.Certificate
+    ) -> bool:
+
+        if key_type_of(key) != self._key_type:
+            return False
+        if self._remaining(cert) <= timedelta(days=CA_RENEW):
+            return False
+
+        try:
+            cert.verify_directly_issued_by(ca_cert)
+        except (InvalidSignature, TypeError, ValueError):
+            return False
+
+        return True
+
+    @staticmethod
+    def _remaining(cert: x509.Certificate) -> timedelta:
+
+        return cert.not_valid_after_utc - datetime.now(timezone.utc)
+
+    @property
+    def ca_file(self) -> str:
+        """
+        Path to the certificate of the certificate authority, which clients can trust for all clusters issued by this store
+        """
+
+        return f"{self._fn_ca():s}.pub"
+
+    @property
+    def key_type(self) -> str:
+        """
+        Type of keys of new certificates
+        """
+
+        return self._key_type
+
+    @property
+    def path(self) -> str:
+        """
+        Location of the store on the local file system
+        """
+
+        return self._path
@@ -27,116 +27,439 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+
+from asyncio import gather, get_running_loop
+from functools import partial
+import json
 import os
+from time import time
 from typing import Any, Dict, List, Optional
 
 from hcloud import Client
 
-from hcloud.datacenters.client import DatacentersClient
-from hcloud.datacenters.domain import Datacenter
+from .abc import CatalogABC
+from .cloud import create_client
+from .const import CATALOG_CACHE, CATALOG_TTL, HETZNER_DATACENTER, TOKENVAR
+from .debug import typechecked
 
-from hcloud.locations.domain import Location
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from hcloud.server_types.client import ServerTypesClient
-from hcloud.server_types.domain import ServerType
+_PER_PAGE = 50  # maximum of cloud API
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ERRORS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+class CatalogDatacenterNotFound(Exception):
+    pass
+
+
+class CatalogServerTypeNotFound(Exception):
+    pass
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Catalog(CatalogABC):
+    """
+    Data centers and server types including their prices as offered by the cloud API. Immutable.
+    Usually obtained via :func:`scherbelberg.get_catalog`, which caches it on disk.
+
+    Args:
+        datacenters : Data centers including their locations and the names of supported server types.
+        servertypes : Server types including their prices per location.
+        fetched : Time of query of the cloud API in seconds since the epoch.
+    """
+
+    def __init__(
+        self,
+        datacenters: List[Dict[str, Any]],
+        servertypes: List[Dict[str, Any]],
+        fetched: float,
+    ):
+
+        self._datacenters = {
+            datacenter["name"]: datacenter for datacenter in datacenters
+        }
+        self._servertypes = {
+            servertype["name"]: servertype for servertype in servertypes
+        }
+        self._fetched = fetched
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<Catalog datacenters={len(self._datacenters):d} servertypes={len(self._servertypes):d} age={self.age:.0f}s>"
+
+    @property
+    def age(self) -> float:
+        """
+        Time since the query of the cloud API in seconds
+        """
+
+        return time() - self._fetched
+
+    @property
+    def fetched(self) -> float:
+        """
+        Time of query of the cloud API in seconds since the epoch
+        """
+
+        return self._fetched
+
+    def get_datacenters(self) -> List[Dict[str, Any]]:
+        """
+        Lists data centers.
+
+        Returns:
+            Data centers including their locations, sorted by name.
+        """
+
+        return [
+            {
+                key: value.copy() if isinstance(value, list) else value
+                for key, value in self._datacenters[name].items()
+            }
+            for name in sorted(self._datacenters.keys())
+        ]
+
+    def get_servertypes(
+        self, datacenter: str = HETZNER_DATACENTER
+    ) -> List[Dict[str, Any]]:
+        """
+        Lists server types offered in a data center.
+
+        Args:
+            datacenter : Name of data center.
+        Returns:
+            Server types plus their specifications and prices in the location of the data center, sorted by CPU type and number of cores.
+        """
+
+        servertypes = [
+            self._priced(servertype, datacenter)
+            for servertype in self._servertypes.values()
+        ]
+        servertypes = [
+            servertype for servertype in servertypes if servertype is not None
+        ]
+        servertypes.sort(
+            key=lambda servertype: (servertype["cpu_type"], servertype["cores"])
+        )
+
+        return servertypes
+
+    def get_servertype(
+        self, name: str, datacenter: str = HETZNER_DATACENTER
+    ) -> Dict[str, Any]:
+        """
+        Looks up a server type offered in a data center.
+        Raises :class:`scherbelberg.CatalogDatacenterNotFound` if the data center is unknown.
+        Raises :class:`scherbelberg.CatalogServerTypeNotFound` if the server type is unknown or not offered in the data center.
+
+        Args:
+            name : Name of server type.
+            datacenter : Name of data center.
+        Returns:
+            Specification and prices in the location of the data center.
+        """
+
+        if datacenter not in self._datacenters.keys():
+            raise CatalogDatacenterNotFound(f"unknown data center '{datacenter:s}'")
+        if name not in self._servertypes.keys():
+            raise CatalogServerTypeNotFound(f"unknown server type '{name:s}'")
+        if name not in self._datacenters[datacenter]["servertypes"]:
+            raise CatalogServerTypeNotFound(
+                f"server type '{name:s}' not supported in data center '{datacenter:s}'"
+            )
+
+        servertype = self._priced(self._servertypes[name], datacenter)
+        if servertype is None:
+            raise CatalogServerTypeNotFound(
+                f"server type '{name:s}' not priced in data center '{datacenter:s}'"
+            )
+
+        return servertype
+
+    def has(self, datacenters: List[str], servertypes: List[str]) -> bool:
+        """
+        Checks whether data centers and server types are known.
+
+        Args:
+            datacenters : Names of data centers.
+            servertypes : Names of server types.
+        Returns:
+            ``True`` if all of them are known.
+        """
+
+        return all(name in self._datacenters.keys() for name in datacenters) and all(
+            name in self._servertypes.keys() for name in servertypes
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Exports catalog to a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary, see :meth:`scherbelberg.Catalog.from_dict`.
+        """
+
+        return {
+            "fetched": self._fetched,
+            "datacenters": list(self._datacenters.values()),
+            "servertypes": list(self._servertypes.values()),
+        }
+
+    def _priced(
+        self, servertype: Dict[str, Any], datacenter: str
+    ) -> Optional[Dict[str, Any]]:
+
+        if datacenter not in self._datacenters.keys():
+            return None
+        location = self._datacenters[datacenter]["location_name"]
+        if location not in servertype["prices"].keys():
+            return None
+
+        priced = {key: value for key, value in servertype.items() if key != "prices"}
+        priced.update(servertype["prices"][location])
+
+        return priced
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> CatalogABC:
+        """
+        Imports catalog from a dictionary.
+
+        Args:
+            data : Dictionary, see :meth:`scherbelberg.Catalog.to_dict`.
+        Returns:
+            New catalog object.
+        """
+
+        return cls(
+            datacenters=data["datacenters"],
+            servertypes=data["servertypes"],
+            fetched=data["fetched"],
+        )
+
+    @classmethod
+    async def from_client(cls, client: Client) -> CatalogABC:
+        """
+        Queries data centers and server types from the cloud API, concurrently.
+
+        Args:
+            client : Cloud API client.
+        Returns:
+            New catalog object.
+        """
+
+        datacenters, servertypes = await gather(
+            _request_all(client, "datacenters"),
+            _request_all(client, "server_types"),
+        )
+        names = {servertype["id"]: servertype["name"] for servertype in servertypes}
+
+        return cls(
+            datacenters=[
+                _parse_datacenter(datacenter, names) for datacenter in datacenters
+            ],
+            servertypes=[_parse_servertype(servertype) for servertype in servertypes],
+            fetched=time(),
+        )
 
-from .const import HETZNER_DATACENTER, TOKENVAR
-from .debug import typechecked
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+
+@typechecked
+async def get_catalog(
+    tokenvar: str = TOKENVAR,
+    client: Optional[Client] = None,
+    ttl: float = CATALOG_TTL,
+    datacenters: Optional[List[str]] = None,
+    servertypes: Optional[List[str]] = None,
+    fn: str = CATALOG_CACHE,
+) -> CatalogABC:
+    """
+    Provides data centers and server types including their prices, cached on disk per cloud API endpoint.
+    The cloud API is only queried if the cached catalog is missing, older than ``ttl`` seconds or lacks any of the requested data centers or server types.
+
+    Args:
+        tokenvar : Name of the environment variable holding the cloud API login token.
+        client : Cloud API client. Defaults to a new client logged in via ``tokenvar``.
+        ttl : Maximum age of cached catalog in seconds. ``0`` always queries the cloud API.
+        datacenters : Names of data centers which must be part of the catalog.
+        servertypes : Names of server types which must be part of the catalog.
+        fn : Location of cache file.
+    Returns:
+        Catalog.
+    """
+
+    if client is None:
+        client = create_client(tokenvar)
+
+    fn = os.path.expanduser(fn)
+    endpoint = _endpoint(client)
+
+    try:
+        with open(fn, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (FileNotFoundError, ValueError):  # missing or corrupted
+        cache = {}
+
+    if endpoint in cache.keys():
+        catalog = Catalog.from_dict(cache[endpoint])
+        if 0 <= catalog.age < ttl and catalog.has(
+            datacenters=[] if datacenters is None else datacenters,
+            servertypes=[] if servertypes is None else servertypes,
+        ):
+            return catalog
+
+    catalog = await Catalog.from_client(client)
+
+    cache[endpoint] = catalog.to_dict()
+    os.makedirs(os.path.dirname(fn), exist_ok=True)
+    with open(f"{fn:s}.tmp", "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(f"{fn:s}.tmp", fn)  # concurrent readers see old or new catalog
+
+    return catalog
+
+
 @typechecked
-async def get_datacenters(tokenvar: str = TOKENVAR) -> List[Dict[str, Any]]:
+async def get_datacenters(
+    tokenvar: str = TOKENVAR,
+    client: Optional[Client] = None,
+    ttl: float = CATALOG_TTL,
+) -> List[Dict[str, Any]]:
     """
-    Queries a list of data centers.
+    Queries a list of data centers, see :func:`scherbelberg.get_catalog`.
 
     Args:
         tokenvar : Name of the environment variable holding the cloud API login token.
+        client : Cloud API client. Defaults to a new client logged in via ``tokenvar``.
+        ttl : Maximum age of cached catalog in seconds. ``0`` always queries the cloud API.
     Returns:
         Data centers.
     """
 
-    client = Client(token=os.environ[tokenvar])
+    catalog = await get_catalog(tokenvar=tokenvar, client=client, ttl=ttl)
+
+    return catalog.get_datacenters()
 
-    return [
-        _parse_datacenter(datacenter.data_model)
-        for datacenter in DatacentersClient(client).get_all()
-    ]
 
 @typechecked
-async def get_servertypes(datacenter: str = HETZNER_DATACENTER, tokenvar: str = TOKENVAR) -> List[Dict[str, Any]]:
+async def get_servertypes(
+    datacenter: str = HETZNER_DATACENTER,
+    tokenvar: str = TOKENVAR,
+    client: Optional[Client] = None,
+    ttl: float = CATALOG_TTL,
+) -> List[Dict[str, Any]]:
     """
-    Queries a list of server types plus their specifications and prices.
+    Queries a list of server types plus their specifications and prices, see :func:`scherbelberg.get_catalog`.
 
     Args:
         datacenter : Name of data center location.
         tokenvar : Name of the environment variable holding the cloud API login token.
+        client : Cloud API client. Defaults to a new client logged in via ``tokenvar``.
+        ttl : Maximum age of cached catalog in seconds. ``0`` always queries the cloud API.
     Returns:
         Server types plus their specifications and prices.
     """
 
-    client = Client(token=os.environ[tokenvar])
+    catalog = await get_catalog(
+        tokenvar=tokenvar, client=client, ttl=ttl, datacenters=[datacenter]
+    )
 
-    servertypes = ServerTypesClient(client).get_all()
+    return catalog.get_servertypes(datacenter)
 
-    servertypes = [_parse_model(servertype.data_model) for servertype in servertypes]
 
-    servertypes = [_parse_prices(servertype, datacenter = datacenter) for servertype in servertypes]
-    servertypes = [servertype for servertype in servertypes if servertype is not None]
+def _endpoint(client: Client) -> str:
 
-    servertypes.sort(key = _sort_key)
+    endpoint = getattr(client, "_api_endpoint", None)  # hcloud < 2
+    if endpoint is None:
+        endpoint = client._client._endpoint  # hcloud >= 2
 
-    return servertypes
+    return endpoint
 
-@typechecked
-def _parse_datacenter(location: Datacenter) -> Dict[str, Any]:
-    datacenter = {
-        attr: getattr(location, attr)
-        for attr in dir(location)
-        if not attr.startswith('_') and attr not in ('from_dict', 'id', 'id_or_name', 'server_types')
-    }
-    location = _parse_location(datacenter.pop('location').data_model)
-    location['location_description'] = location.pop('description')
-    location['location_name'] = location.pop('name')
-    datacenter.update(location)
-    return datacenter
 
-@typechecked
-def _parse_location(location: Location) -> Dict[str, Any]:
+def _parse_datacenter(
+    datacenter: Dict[str, Any], names: Dict[int, str]
+) -> Dict[str, Any]:
+
+    location = datacenter["location"]
+
     return {
-        attr: getattr(location, attr)
-        for attr in dir(location)
-        if not attr.startswith('_') and attr not in ('from_dict', 'id', 'id_or_name')
+        "name": datacenter["name"],
+        "description": datacenter["description"],
+        "location_name": location["name"],
+        "location_description": location["description"],
+        "city": location["city"],
+        "country": location["country"],
+        "latitude": location["latitude"],
+        "longitude": location["longitude"],
+        "network_zone": location["network_zone"],
+        "servertypes": sorted(
+            names[index]
+            for index in datacenter["server_types"]["supported"]
+            if index in names.keys()
+        ),
     }
 
-@typechecked
-def _parse_model(model: ServerType) -> Dict[str, Any]:
-    model = {
-        attr: getattr(model, attr)
-        for attr in dir(model)
-        if not attr.startswith('_') and attr not in ('from_dict', 'id', 'id_or_name')
+
+def _parse_servertype(servertype: Dict[str, Any]) -> Dict[str, Any]:
+
+    deprecated = bool(servertype.get("deprecated", False))
+    if servertype.get("deprecation", None) is not None:  # newer API
+        deprecated = True
+
+    return {
+        "name": servertype["name"],
+        "description": servertype["description"],
+        "cores": servertype["cores"],
+        "cpu_type": servertype["cpu_type"],
+        "architecture": servertype.get("architecture", "x86"),  # missing in older API
+        "memory": float(servertype["memory"]),
+        "disk": servertype["disk"],
+        "storage_type": servertype["storage_type"],
+        "deprecated": deprecated,
+        "prices": {
+            price["location"]: {
+                f"price_{period:s}_{kind:s}": float(price[f"price_{period:s}"][kind])
+                for period in ("hourly", "monthly")
+                for kind in ("net", "gross")
+            }
+            for price in servertype["prices"]
+        },
     }
-    if model.get('deprecated', None) is None:
-        model['deprecated'] = False
-    return model
 
-@typechecked
-def _parse_prices(servertype: Dict[str, Any], datacenter: str) -> Optional[Dict[str, Any]]:
-    location, _ = datacenter.split('-')
-    prices = servertype.pop('prices')
-    prices = {price['location']: price for price in prices if price['location'] == location}
-    if location not in prices.keys():
-        return None
-    price = prices[location]
-    price.pop('location')
-    for price_type in ('price_hourly', 'price_monthly'):
-        price.update({f'{price_type:s}_{k:s}': v  for k, v in price.pop(price_type).items()})
-    servertype.update(price)
-    return servertype
 
-@typechecked
-def _sort_key(servertype: Dict[str, Any]):
+async def _request_all(client: Client, kind: str) -> List[Dict[str, Any]]:
+
+    loop = get_running_loop()
+
+    items, page = [], 1
+    while page is not None:
+        response = await loop.run_in_executor(
+            None,
+            partial(
+                client.request,
+                "GET",
+                f"/{kind:s}",
+                params={"page": page, "per_page": _PER_PAGE},
+            ),
+        )
+        items.extend(response[kind])
+        page = response.get("meta", {}).get("pagination", {}).get("next_page", None)
 
-    return servertype['cpu_type'].ljust(100) + f"{servertype['cores']:05d}"
+    return items
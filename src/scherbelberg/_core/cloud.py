@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/cloud.py: Cloud API client and provider
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import os
+
+from hcloud import Client
+
+from .abc import ProviderABC
+from .const import APIVAR, HETZNER_API, LOCAL_ENGINES, PROVIDER, PROVIDERVAR, TOKENVAR
+from .debug import typechecked
+from .hetzner import HetznerProvider
+from .local import LocalProvider
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+def create_client(tokenvar: str = TOKENVAR) -> Client:
+    """
+    Creates a cloud API client.
+    The API endpoint can be redirected via the ``SCHERBELBERG_API`` environment variable, e.g. towards a :class:`scherbelberg.FakeServer`.
+
+    Args:
+        tokenvar : Name of the environment variable holding the cloud API login token.
+    Returns:
+        Cloud API client.
+    """
+
+    return Client(
+        token=os.environ[tokenvar],
+        api_endpoint=os.environ.get(APIVAR, HETZNER_API),
+    )
+
+
+@typechecked
+def create_provider(tokenvar: str = TOKENVAR) -> ProviderABC:
+    """
+    Creates a source of servers.
+    It is selected via the ``SCHERBELBERG_PROVIDER`` environment variable: ``hetzner`` (default) for a :class:`scherbelberg.HetznerProvider`, ``docker`` or ``podman`` for a :class:`scherbelberg.LocalProvider` using the respective container engine.
+
+    Args:
+        tokenvar : Name of the environment variable holding the cloud API login token.
+    Returns:
+        Provider.
+    """
+
+    provider = os.environ.get(PROVIDERVAR, PROVIDER)
+
+    if provider in LOCAL_ENGINES:
+        return LocalProvider(engine=provider)
+    if provider != PROVIDER:
+        raise ValueError(f"unknown provider '{provider:s}'")
+
+    return HetznerProvider(create_client(tokenvar))
@@ -27,30 +27,67 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from asyncio import gather, sleep, wait, wait_for, Task, TimeoutError
+from ipaddress import ip_address, ip_network
+import json
 from logging import getLogger, Logger
 import os
-from typing import Any, List, Union
-
-from hcloud import Client
-from hcloud.firewalls.client import BoundFirewall
-from hcloud.networks.client import BoundNetwork
-
-from .abc import ClusterABC, NodeABC
+from random import Random
+import shutil
+from statistics import median
+from time import perf_counter, time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .abc import (
+    AdaptorABC,
+    AdaptPolicyABC,
+    ClusterABC,
+    GraphABC,
+    NetworkABC,
+    NodeABC,
+    PoolABC,
+    ProviderABC,
+    ResourceABC,
+)
+from .adapt import Adaptor, AdaptPolicy
+from .castore import CAStore
+from .cloud import create_provider
+from .command import Command
 from .const import (
+    BENCH_PINGS,
+    BENCH_PORT,
+    BENCH_SIZE,
+    BENCH_THRESHOLD,
+    BENCH_TIMEOUT,
+    BOOTSTRAP_PROFILE,
+    CACHE_TTL,
+    CA_STORE,
     DASK_IPC,
     DASK_DASH,
     DASK_NANNY,
+    DASK_PRIVATE,
+    DASK_PROTOCOL,
+    DASK_PROTOCOLS,
     PREFIX,
+    REGISTER_TIMEOUT,
+    RETIRE_TIMEOUT,
+    SSH_KEY_TYPE,
+    TLS_KEY_TYPE,
     TOKENVAR,
     WAIT,
     HETZNER_DATACENTER,
     HETZNER_IMAGE_UBUNTU,
     HETZNER_INSTANCE_TINY,
+    NETWORK_RANGE,
     WORKERS,
 )
 from .creator import Creator
 from .debug import typechecked
+from .layout import Layout
 from .node import Node, NodeNotFound
+from .pool import Pool
+from .provider import Instance, Network, Resource
+from .ssl import create_ca, create_signed_cert, key_type_of, read_certs, write_certs
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # CLASS
@@ -73,6 +110,10 @@ class ClusterNetworkNotFound(Exception):
     pass
 
 
+class ClusterRetirementFailed(Exception):
+    pass
+
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # CLASS
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -85,14 +126,18 @@ class Cluster(ClusterABC):
     Use the asynchronous ``from_*`` classmethods to instantiate objects of this class.
 
     Args:
-        client : A cloud-API client object.
+        provider : Source of servers, e.g. :class:`scherbelberg.HetznerProvider`.
         scheduler : A node running the Dask scheduler.
         workers : A list of nodes running Dask workers.
-        network : A cloud-API network object.
-        firewall : A cloud-API firewall object.
+        network : The private network of the provider.
+        firewall : The firewall of the provider.
+        networks : All private networks of the cluster, the first one being ``network``. Defaults to ``network`` only.
         dask_ipc : Port used for Dask's interprocess communication.
         dask_dash : Port used for Dask's dashboard.
         dask_nanny : Port used for Dask's nanny.
+        dask_protocol : Protocol used for Dask's interprocess communication within the private network.
+        dask_private : Port used for Dask's interprocess communication within the private network if ``dask_protocol`` is not ``tls``.
+        ip_range : Private address range of the entire cluster, split into one block per private network.
         prefix : Name of cluster, used as a prefix in names of every component.
         wait : Timeout in seconds before actions are repeated or exceptions are raised.
         log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
@@ -100,14 +145,18 @@ class Cluster(ClusterABC):
 
     def __init__(
         self,
-        client: Client,
+        provider: ProviderABC,
         scheduler: NodeABC,
         workers: List[NodeABC],
-        network: BoundNetwork,
-        firewall: BoundFirewall,
+        network: NetworkABC,
+        firewall: ResourceABC,
+        networks: Optional[List[NetworkABC]] = None,
         dask_ipc: int = DASK_IPC,
         dask_dash: int = DASK_DASH,
         dask_nanny: int = DASK_NANNY,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
+        ip_range: str = NETWORK_RANGE,
         prefix: str = PREFIX,
         wait: float = WAIT,
         log: Union[Logger, None] = None,
@@ -118,23 +167,33 @@ class Cluster(ClusterABC):
         assert dask_ipc >= 2 ** 10
         assert dask_dash >= 2 ** 10
         assert dask_nanny >= 2 ** 10
+        assert dask_private >= 2 ** 10
 
-        assert len({dask_ipc, dask_dash, dask_nanny}) == 3
+        assert len({dask_ipc, dask_dash, dask_nanny, dask_private}) == 4
+        assert dask_protocol in DASK_PROTOCOLS
 
-        self._client = client
+        self._provider = provider
         self._scheduler = scheduler
         self._workers = workers
         self._network = network
+        self._networks = [network] if networks is None else networks.copy()
         self._firewall = firewall
 
         self._dask_ipc = dask_ipc  # port
         self._dask_dash = dask_dash  # port
         self._dask_nanny = dask_nanny  # port
+        self._dask_protocol = dask_protocol
+        self._dask_private = dask_private  # port
+        self._ip_range = ip_range
 
         self._prefix = prefix
         self._wait = wait
         self._log = getLogger(name=prefix) if log is None else log
 
+        self._adaptor = None
+        self._pending = []
+        self._graph = None  # steps of pending workers
+
     def __repr__(self) -> str:
         """
         Interactive string representation
@@ -173,6 +232,183 @@ class Cluster(ClusterABC):
             asynchronous=asynchronous,
         )
 
+    async def adapt(
+        self,
+        minimum: int = 1,
+        maximum: int = 10,
+        policy: Optional[AdaptPolicyABC] = None,
+    ) -> AdaptorABC:
+        """
+        Starts adapting the number of workers to the load of the Dask scheduler in the background.
+        An already running adaptor of this cluster is stopped first.
+
+        Args:
+            minimum : Minimum number of workers.
+            maximum : Maximum number of workers.
+            policy : Scaling policy. Defaults to :class:`scherbelberg.AdaptPolicy` with default parameters.
+        Returns:
+            The running adaptor. Call its ``stop`` method to stop adapting.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        if self._adaptor is not None:
+            await self._adaptor.stop()
+
+        self._adaptor = Adaptor(
+            cluster=self,
+            minimum=minimum,
+            maximum=maximum,
+            policy=AdaptPolicy() if policy is None else policy,
+            log=self._log,
+        )
+        await self._adaptor.start()
+
+        return self._adaptor
+
+    async def benchmark_network(
+        self,
+        size: int = BENCH_SIZE,
+        pings: int = BENCH_PINGS,
+        sample: Optional[int] = None,
+        private: bool = True,
+        public: bool = False,
+        threshold: float = BENCH_THRESHOLD,
+        timeout: float = BENCH_TIMEOUT,
+        seed: Optional[int] = None,
+        fn: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Measures latency and throughput between pairs of nodes, including the scheduler, see :meth:`scherbelberg.Node.benchmark_link`.
+        Pairs are measured in rounds. Within a round, pairs run in parallel and every node is part of at most one pair.
+        Private addresses are only measured between nodes within the same private network.
+        Measuring via public addresses temporarily opens an additional port in the firewall.
+        A link is slow if its throughput is below ``threshold`` times the median throughput or if its latency exceeds the median latency divided by ``threshold``. A node is noisy if most of its links are slow or failed.
+        The report is also written to a JSON file.
+
+        Args:
+            size : Number of bytes sent per link.
+            pings : Number of round trips per link.
+            sample : Number of randomly sampled pairs. Defaults to all pairs.
+            private : Measures via private addresses.
+            public : Measures via public addresses.
+            threshold : Fraction of median throughput below which links are slow.
+            timeout : Timeout in seconds per link.
+            seed : Seed for sampling pairs.
+            fn : Location of report. Defaults to ``.<prefix>/network.json``.
+        Returns:
+            Report with names of ``nodes``, a list of ``links``, one ``matrix`` of ``throughput`` (bytes per second) and ``latency`` (seconds) per path, i.e. ``private`` or ``public``, as well as lists of ``slow`` links and ``noisy`` nodes.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        assert private or public
+        assert 0 < threshold < 1
+
+        nodes = [self._scheduler, *self._workers]
+        pairs = [
+            (source, target)
+            for source in range(len(nodes))
+            for target in range(source + 1, len(nodes))
+        ]
+        if sample is not None:
+            pairs = sorted(Random(seed).sample(pairs, min(sample, len(pairs))))
+        paths = [
+            path for path, use in (("private", private), ("public", public)) if use
+        ]
+
+        self._log.info("Uploading network benchmark to %d node(s) ...", len(nodes))
+        await gather(*[self._upload_bench(node) for node in nodes])
+
+        firewall = self._firewall
+        if public:
+            self._log.info("Opening benchmark port in firewall ...")
+            self._firewall = await self._provider.update_firewall(
+                firewall, ports=[*self._ports(), BENCH_PORT]
+            )
+
+        links = []
+        try:
+            for path in paths:
+                for index, pairs_round in enumerate(self._rounds(len(nodes), pairs)):
+                    self._log.info(
+                        "Measuring round %d with %d %s link(s) ...",
+                        index,
+                        len(pairs_round),
+                        path,
+                    )
+                    links.extend(
+                        await gather(
+                            *[
+                                self._benchmark_link(
+                                    nodes[source],
+                                    nodes[target],
+                                    path=path,
+                                    size=size,
+                                    pings=pings,
+                                    timeout=timeout,
+                                )
+                                for source, target in pairs_round
+                            ]
+                        )
+                    )
+        finally:
+            if public:
+                self._log.info("Closing benchmark port in firewall ...")
+                self._firewall = await self._provider.update_firewall(
+                    firewall, ports=self._ports()
+                )
+
+        report = self._network_report(
+            [node.name for node in nodes], links, paths, threshold
+        )
+
+        if fn is None:
+            fn = os.path.join(os.getcwd(), f".{self._prefix:s}", "network.json")
+        with open(fn, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+        self._log.info(
+            "Measured %d link(s), %d slow, %d noisy node(s).",
+            len(links),
+            len(report["slow"]),
+            len(report["noisy"]),
+        )
+
+        return report
+
+    def get_node(self, name: str) -> NodeABC:
+        """
+        Looks up a node by the suffix of its name, i.e. ``scheduler`` or ``worker0001``.
+        Workers can also be referred to by their number with a different number of digits, e.g. ``worker1`` or ``worker001``.
+        Raises :class:`scherbelberg.NodeNotFound` if there is no such node.
+
+        Args:
+            name : Suffix of name of node.
+        Returns:
+            Node.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        if name == "scheduler":
+            return self._scheduler
+
+        for node in self._workers:
+            if node.suffix == name:
+                return node
+
+        if name.startswith("worker") and name[len("worker") :].isdigit():
+            index = int(name[len("worker") :])
+            for node in self._workers:
+                if node.index == index:
+                    return node
+
+        raise NodeNotFound(name)
+
     async def destroy(self):
         """
         Destroys a living cluster
@@ -181,17 +417,697 @@ class Cluster(ClusterABC):
         if not self.alive:
             raise SystemError("cluster is dead")
 
-        self._remove_remote(self._client, self._prefix, self._log)
+        if self._adaptor is not None:
+            await self._adaptor.stop()
+            self._adaptor = None
+
+        await self._cancel_pending()
+
+        await self._remove_remote(self._provider, self._prefix, self._log)
         self._remove_local(self._prefix, self._log)
 
-        self._client = None
+        self._provider = None
         self._scheduler = None
         self._workers = None
         self._network = None
+        self._networks = None
         self._firewall = None
 
         self._log.info("Cluster %s destroyed.", self._prefix)
 
+    async def rotate_certs(
+        self,
+        rotate_ca: bool = False,
+        ca_store: Optional[str] = None,
+    ):
+        """
+        Replaces the cluster's TLS/SSL certificate without re-creating any node.
+        The new certificate is copied to all nodes, followed by a restart of the Dask scheduler and workers.
+        Data held by workers is lost.
+
+        Args:
+            rotate_ca : If set to ``True``, the certificate authority is replaced as well. If the cluster's certificate was issued from a persistent store, every other cluster issued from the store needs to be rotated, too.
+            ca_store : Location of the persistent certificate authority the cluster's certificate was issued from. Ignored if the cluster has its own certificate authority.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        fld = os.path.join(os.getcwd(), f".{self._prefix:s}")
+        key, _ = await read_certs(os.path.join(fld, "cert"))
+        key_type = key_type_of(key)  # keep key type of cluster
+
+        if os.path.exists(os.path.join(fld, "ca")):  # cluster's own authority
+            if rotate_ca:
+                self._log.info("Creating ssl certificate authority ...")
+                ca_key, ca_cert = await create_ca(
+                    prefix=self._prefix,
+                    key_type=key_type,
+                )
+                await write_certs(ca_key, ca_cert, name=os.path.join(fld, "ca"))
+            else:
+                ca_key, ca_cert = await read_certs(os.path.join(fld, "ca"))
+            self._log.info("Creating ssl certificate ...")
+            key, cert = await create_signed_cert(
+                ca_key=ca_key,
+                ca_cert=ca_cert,
+                prefix=self._prefix,
+                key_type=key_type,
+            )
+            await write_certs(key, cert, name=os.path.join(fld, "cert"))
+        else:
+            store = CAStore(
+                path=CA_STORE if ca_store is None else ca_store,
+                key_type=key_type,
+                log=self._log,
+            )
+            if rotate_ca:
+                await store.rotate()
+            await store.export(prefix=self._prefix, path=fld, renew=True)
+
+        if len(self._pending) > 0:
+            self._log.warning(
+                "%d workers still being provisioned may carry the old certificate.",
+                len(self._pending),
+            )
+
+        await self._scheduler.update_certs()
+        await gather(*(worker.update_certs() for worker in self._workers))
+        await self._wait_for_registration(self._workers)
+
+        self._log.info("Certificates of cluster %s rotated.", self._prefix)
+
+    async def scale(
+        self,
+        workers: int,
+        pool: Optional[str] = None,
+        worker: Optional[str] = None,
+        image: Optional[str] = None,
+        datacenter: Optional[str] = None,
+        resources: Optional[Dict[str, float]] = None,
+        timeout: float = RETIRE_TIMEOUT,
+        force: bool = False,
+        bootstrap: Optional[str] = None,
+    ):
+        """
+        Adds or removes workers until the cluster or one of its pools has the requested number of workers.
+
+        Args:
+            workers : Target number of workers, at least one.
+            pool : Name of pool to scale. Defaults to the entire cluster. New workers join the pool of the worker with the highest number in this case.
+            worker : Compute instance type used for new Dask workers. Defaults to the type of existing workers of the pool.
+            image : Operating system image of new workers. Defaults to the image of existing workers.
+            datacenter : Target data center of new workers. Defaults to the data center of existing workers of the pool.
+            resources : Abstract Dask resources of new workers. Defaults to the resources of existing workers of the pool.
+            timeout : Seconds to wait for retiring workers to hand off their data, see :meth:`scherbelberg.Cluster.remove_workers`.
+            force : Delete servers of removed workers even if handing off their data failed.
+            bootstrap : System updates of new workers, see :meth:`scherbelberg.Cluster.scale_up`.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        assert workers > 0
+
+        current = len(self._members(pool))
+
+        if workers > current:
+            await self.scale_up(
+                workers=workers - current,
+                pool=pool,
+                worker=worker,
+                image=image,
+                datacenter=datacenter,
+                resources=resources,
+                bootstrap=bootstrap,
+            )
+        elif workers < current:
+            await self.scale_down(
+                workers=current - workers,
+                pool=pool,
+                timeout=timeout,
+                force=force,
+            )
+
+    async def scale_up(
+        self,
+        workers: int = 1,
+        pool: Optional[str] = None,
+        worker: Optional[str] = None,
+        image: Optional[str] = None,
+        datacenter: Optional[str] = None,
+        resources: Optional[Dict[str, float]] = None,
+        bootstrap: Optional[str] = None,
+    ) -> List[NodeABC]:
+        """
+        Creates, bootstraps and starts additional workers and attaches them to the running scheduler.
+        New workers receive the next free names and private IP addresses.
+
+        Args:
+            workers : Number of workers to add.
+            pool : Name of pool the new workers join. May be a new pool. Defaults to the pool of the worker with the highest number.
+            worker : Compute instance type used for new Dask workers. Defaults to the type of existing workers of the pool.
+            image : Operating system image of new workers. Defaults to the image of existing workers.
+            datacenter : Target data center of new workers. Defaults to the data center of existing workers of the pool.
+            resources : Abstract Dask resources of new workers. Defaults to the resources of existing workers of the pool.
+            bootstrap : System updates of new workers, either ``full``, ``security`` or ``none``. Defaults to the profile the cluster was created with.
+        Returns:
+            New worker nodes.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        assert workers > 0
+
+        members = self._members(pool)
+        reference = members[-1] if len(members) > 0 else self._members(None)[-1]
+        if resources is None:
+            resources = reference.resources if len(members) > 0 else {}
+        if bootstrap is None:
+            bootstrap = self._scheduler.labels.get("bootstrap", BOOTSTRAP_PROFILE)
+
+        creator = Creator(
+            provider=self._provider,
+            prefix=self._prefix,
+            fn_public=self._fn_public(self._prefix),
+            fn_private=self._fn_private(self._prefix),
+            wait=self._wait,
+            log=self._log,
+        )
+        new_workers = await creator.add_workers(
+            scheduler=self._scheduler,
+            workers=self._workers,
+            networks=self._networks,
+            firewall=self._firewall,
+            pool=Pool(
+                name=reference.pool if pool is None else pool,
+                servertype=reference.servertype if worker is None else worker,
+                workers=workers,
+                datacenter=reference.datacenter if datacenter is None else datacenter,
+                resources=resources,
+            ),
+            dask_ipc=self._dask_ipc,
+            dask_dash=self._dask_dash,
+            dask_nanny=self._dask_nanny,
+            dask_protocol=self._dask_protocol,
+            dask_private=self._dask_private,
+            image=(reference.image or HETZNER_IMAGE_UBUNTU) if image is None else image,
+            ip_range=self._ip_range,
+            bootstrap=bootstrap,
+        )
+
+        self._workers.extend(new_workers)
+        self._networks = creator.networks
+        self._save()
+        self._log.info(
+            "Cluster %s scaled up to %d worker(s).", self._prefix, len(self._workers)
+        )
+
+        return new_workers
+
+    async def scale_down(
+        self,
+        workers: int = 1,
+        pool: Optional[str] = None,
+        timeout: float = RETIRE_TIMEOUT,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Gracefully retires workers via the Dask scheduler and deletes their servers afterwards.
+        Workers with the highest numbers are removed first. At least one worker remains.
+
+        Args:
+            workers : Number of workers to remove.
+            pool : Name of pool to remove workers from. Defaults to the entire cluster.
+            timeout : Seconds to wait for retiring workers to hand off their data, see :meth:`scherbelberg.Cluster.remove_workers`.
+            force : Delete servers of removed workers even if handing off their data failed.
+        Returns:
+            Report, see :meth:`scherbelberg.Cluster.remove_workers`.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        members = self._members(pool)
+
+        assert 0 < workers <= len(members)
+        assert workers < len(self._workers)
+
+        nodes = members[-workers:]
+
+        return await self.remove_workers(nodes, timeout=timeout, force=force)
+
+    async def remove_workers(
+        self,
+        nodes: List[NodeABC],
+        timeout: float = RETIRE_TIMEOUT,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Gracefully retires specific workers via the Dask scheduler and deletes their servers afterwards.
+        The scheduler moves data held exclusively by retiring workers to the remaining workers first.
+        Servers are only deleted once this hand-off has finished.
+        Raises :class:`scherbelberg.ClusterRetirementFailed` if the hand-off does not finish within ``timeout`` seconds or if the scheduler refuses to retire any of the workers, unless ``force`` is set.
+        At least one worker remains.
+
+        Args:
+            nodes : Worker nodes to remove.
+            timeout : Seconds to wait for retiring workers to hand off their data.
+            force : Delete servers of removed workers even if handing off their data failed.
+        Returns:
+            Report containing the names of removed ``nodes``, the number of moved ``keys``, the number of moved ``bytes``, the duration of the hand-off in ``seconds`` and whether it ``succeeded``.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        assert len(nodes) > 0
+        assert all(node in self._workers for node in nodes)
+        assert len(nodes) < len(self._workers)
+        assert timeout > 0
+
+        report = await self._retire_workers(nodes, timeout=timeout)
+        report["nodes"] = [node.name for node in nodes]
+
+        self._log.info(
+            "Retired %d worker(s) in %0.02f s, %d key(s) and %d byte(s) moved.",
+            len(nodes),
+            report["seconds"],
+            report["keys"],
+            report["bytes"],
+        )
+
+        if not report["succeeded"]:
+            if not force:
+                raise ClusterRetirementFailed(report)
+            self._log.warning("Retirement failed, removing workers nevertheless.")
+
+        for node in nodes:
+            await node.delete()
+            self._workers.remove(node)
+        self._save()
+
+        self._log.info(
+            "Cluster %s scaled down to %d worker(s).", self._prefix, len(self._workers)
+        )
+
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializes the description of the cluster, i.e. its nodes including addresses and labels, private networks, firewall and ports.
+        A cluster can be restored from it via :meth:`scherbelberg.Cluster.from_dict` without querying the provider.
+
+        Returns:
+            JSON-compatible dictionary.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        return {
+            "prefix": self._prefix,
+            "scheduler": self._scheduler.server.to_dict(),
+            "workers": [node.server.to_dict() for node in self._workers],
+            "networks": [
+                {"name": network.name, "ip_range": network.ip_range}
+                for network in self._networks
+            ],
+            "firewall": self._firewall.name,
+            "dask_ipc": self._dask_ipc,
+            "dask_dash": self._dask_dash,
+            "dask_nanny": self._dask_nanny,
+            "dask_protocol": self._dask_protocol,
+            "dask_private": self._dask_private,
+            "ip_range": self._ip_range,
+        }
+
+    async def wait_for_workers(
+        self,
+        timeout: Union[float, int, None] = None,
+    ) -> List[NodeABC]:
+        """
+        Waits for workers still being provisioned in the background, see ``min_workers`` parameter of :meth:`scherbelberg.Cluster.from_new`.
+        Workers join the cluster as soon as they are running. Workers which failed to provision are logged and skipped.
+
+        Args:
+            timeout : Seconds to wait. Defaults to waiting for all workers.
+        Returns:
+            Workers which joined the cluster and registered with the Dask scheduler while waiting.
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        if len(self._pending) == 0:
+            return []
+
+        tasks = self._pending.copy()
+        done, _ = await wait(tasks, timeout=timeout)
+
+        nodes = [
+            task.result()
+            for task in tasks
+            if task in done and not task.cancelled() and task.exception() is None
+        ]
+        await self._wait_for_registration(nodes)
+
+        return nodes
+
+    def _adopt(self, tasks: List[Task], graph: Optional[GraphABC] = None):
+        """
+        Takes over workers still being provisioned in the background
+        """
+
+        self._graph = graph
+        for task in tasks:
+            self._pending.append(task)
+            task.add_done_callback(self._adopted)
+
+    async def _cancel_pending(self):
+        """
+        Cancels workers still being provisioned in the background and waits for them to stop
+        """
+
+        if self._graph is not None:  # earlier steps of pending workers, e.g. bootstrap
+            self._graph.cancel()
+
+        tasks = self._pending.copy()
+        for task in tasks:
+            task.cancel()
+        if len(tasks) > 0:
+            await wait(tasks)
+
+        if self._graph is not None:
+            await self._graph.join()
+
+    def _adopted(self, task: Task):
+        """
+        Called once provisioning of a worker in the background has finished
+        """
+
+        self._pending.remove(task)
+
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self._log.error("Provisioning worker failed: %s", task.exception())
+            return
+        if not self.alive:
+            return
+
+        node = task.result()
+        self._workers.append(node)
+        self._save()
+        self._log.info(
+            "Worker %s joined cluster %s, %d worker(s) still being provisioned.",
+            node.name,
+            self._prefix,
+            len(self._pending),
+        )
+
+    def _save(self):
+        """
+        Stores the description of the cluster in its local folder, see :meth:`scherbelberg.Cluster.from_cache`
+        """
+
+        if not os.path.isdir(os.path.dirname(self._fn_cache(self._prefix))):
+            return
+
+        with open(self._fn_cache(self._prefix), "w", encoding="utf-8") as f:
+            json.dump({"cached": time(), "cluster": self.to_dict()}, f)
+
+    async def _wait_for_registration(
+        self,
+        nodes: List[NodeABC],
+        timeout: Union[float, int] = REGISTER_TIMEOUT,
+    ):
+        """
+        Waits until the Dask workers running on nodes have registered with the Dask scheduler
+        """
+
+        from distributed.comm import get_address_host
+
+        if len(nodes) == 0:
+            return
+
+        async def registered():
+            while True:
+                info = await client.scheduler.identity()
+                hosts = {get_address_host(address) for address in info["workers"]}
+                missing = [
+                    node
+                    for node in nodes
+                    if node.public_ip4 not in hosts and node.private_ip4 not in hosts
+                ]
+                if len(missing) == 0:
+                    return
+                await sleep(self._wait)
+
+        self._log.info("Waiting for %d Dask worker(s) to register ...", len(nodes))
+
+        client = await self.get_client(asynchronous=True)
+        await client
+
+        try:
+            await wait_for(registered(), timeout)
+        except TimeoutError:
+            self._log.error("Dask worker(s) failed to register with the scheduler.")
+            raise
+        finally:
+            await client.close()
+
+    async def _retire_workers(
+        self, nodes: List[NodeABC], timeout: float
+    ) -> Dict[str, Any]:
+        """
+        Asks the Dask scheduler to retire the Dask workers running on nodes, moving their data to remaining workers
+        """
+
+        def held(dask_scheduler=None, addresses=None):  # nested, pickled by value
+            retiring = set(addresses)
+            tasks = {
+                ts
+                for address in addresses
+                if address in dask_scheduler.workers
+                for ts in dask_scheduler.workers[address].has_what
+                if all(ws.address in retiring for ws in ts.who_has)
+            }
+            return len(tasks), sum(ts.get_nbytes() for ts in tasks)
+
+        client = await self.get_client(asynchronous=True)
+        await client
+
+        try:
+            addresses = self._dask_addresses(client.scheduler_info()["workers"], nodes)
+            if len(addresses) == 0:
+                self._log.warning("No Dask workers found to retire.")
+                return {"keys": 0, "bytes": 0, "seconds": 0.0, "succeeded": True}
+
+            keys, nbytes = await client.run_on_scheduler(held, addresses=addresses)
+
+            self._log.info(
+                "Retiring %d Dask worker(s), moving %d key(s) and %d byte(s) ...",
+                len(addresses),
+                keys,
+                nbytes,
+            )
+
+            start = perf_counter()
+            try:
+                retired = await wait_for(
+                    client.retire_workers(workers=addresses, close_workers=True),
+                    timeout=timeout,
+                )
+                succeeded = set(retired.keys()) == set(addresses)
+            except TimeoutError:
+                self._log.error("Retiring Dask worker(s) timed out.")
+                succeeded = False
+            seconds = perf_counter() - start
+
+        finally:
+            await client.close()
+
+        return {
+            "keys": keys,
+            "bytes": nbytes,
+            "seconds": seconds,
+            "succeeded": succeeded,
+        }
+
+    async def _upload_bench(self, node: NodeABC):
+
+        await Command.from_scp(
+            os.path.abspath(
+                os.path.join(os.path.dirname(__file__), "..", "share", "bench_net.py")
+            ),
+            target=f"~/.{self._prefix:s}/",
+            host=await node.get_sshconfig(),
+        ).run(wait=self._wait)
+
+    async def _benchmark_link(
+        self,
+        source: NodeABC,
+        target: NodeABC,
+        path: str,
+        size: int,
+        pings: int,
+        timeout: float,
+    ) -> Dict[str, Any]:
+
+        link = {
+            "source": source.name,
+            "target": target.name,
+            "path": path,
+            "latency": None,
+            "jitter": None,
+            "throughput": None,
+            "error": None,
+            "slow": False,
+        }
+
+        if path == "private" and self._network_of(source) != self._network_of(target):
+            link["error"] = "different private networks"
+            return link
+
+        address = target.private_ip4 if path == "private" else target.public_ip4
+
+        try:
+            link.update(
+                await source.benchmark_link(
+                    target,
+                    address=address,
+                    size=size,
+                    pings=pings,
+                    timeout=timeout,
+                )
+            )
+        except Exception as e:  # reported as part of the results
+            link["error"] = f"{type(e).__name__:s}: {e}"
+
+        return link
+
+    def _network_of(self, node: NodeABC) -> Optional[int]:
+
+        return next(
+            (
+                index
+                for index, network in enumerate(self._networks)
+                if ip_address(node.private_ip4) in ip_network(network.ip_range)
+            ),
+            None,
+        )
+
+    def _ports(self) -> List[int]:
+
+        return [22, self._dask_ipc, self._dask_dash, self._dask_nanny]
+
+    @staticmethod
+    def _rounds(
+        count: int, pairs: List[Tuple[int, int]]
+    ) -> List[List[Tuple[int, int]]]:
+
+        slots = list(range(count + count % 2))  # circle method, odd counts get a bye
+        order = {}
+        for number in range(len(slots) - 1):
+            for index in range(len(slots) // 2):
+                order[tuple(sorted((slots[index], slots[-1 - index])))] = number
+            slots = [slots[0], slots[-1], *slots[1:-1]]
+
+        rounds = []
+        pairs = sorted(pairs, key=lambda pair: order[pair])
+        while len(pairs) > 0:
+            busy, current, remaining = set(), [], []
+            for pair in pairs:
+                if busy.isdisjoint(pair):
+                    busy.update(pair)
+                    current.append(pair)
+                else:
+                    remaining.append(pair)
+            rounds.append(current)
+            pairs = remaining
+
+        return rounds
+
+    @staticmethod
+    def _network_report(
+        names: List[str],
+        links: List[Dict[str, Any]],
+        paths: List[str],
+        threshold: float,
+    ) -> Dict[str, Any]:
+
+        for path in paths:
+            measured = [
+                link for link in links if link["path"] == path and link["error"] is None
+            ]
+            if len(measured) == 0:
+                continue
+            throughput = median([link["throughput"] for link in measured])
+            latencies = [
+                link["latency"] for link in measured if link["latency"] is not None
+            ]
+            latency = median(latencies) if len(latencies) > 0 else None
+            for link in measured:
+                link["slow"] = link["throughput"] < threshold * throughput or (
+                    latency is not None and link["latency"] > latency / threshold
+                )
+
+        counts = {name: [0, 0] for name in names}  # bad and total links per node
+        for link in links:
+            if link["error"] == "different private networks":
+                continue
+            for name in (link["source"], link["target"]):
+                counts[name][0] += int(link["error"] is not None or link["slow"])
+                counts[name][1] += 1
+
+        index = {name: number for number, name in enumerate(names)}
+        matrix = {
+            path: {
+                metric: [[None for _ in names] for _ in names]
+                for metric in ("throughput", "latency")
+            }
+            for path in paths
+        }
+        for link in links:
+            source, target = index[link["source"]], index[link["target"]]
+            for metric in ("throughput", "latency"):
+                matrix[link["path"]][metric][source][target] = link[metric]
+                matrix[link["path"]][metric][target][source] = link[metric]
+
+        return {
+            "nodes": names,
+            "links": links,
+            "matrix": matrix,
+            "slow": [link for link in links if link["slow"]],
+            "noisy": [name for name, (bad, total) in counts.items() if 2 * bad > total],
+        }
+
+    def _members(self, pool: Optional[str]) -> List[NodeABC]:
+        """
+        Workers of a pool or of the entire cluster, sorted by number
+        """
+
+        return sorted(
+            [node for node in self._workers if pool is None or node.pool == pool],
+            key=lambda node: node.index,
+        )
+
+    @staticmethod
+    def _dask_addresses(
+        info: Dict[str, Dict[str, Any]], nodes: List[NodeABC]
+    ) -> List[str]:
+        """
+        Maps nodes to addresses of Dask workers known to the scheduler
+        """
+
+        from distributed.comm import get_address_host
+
+        ips = {ip for node in nodes for ip in (node.public_ip4, node.private_ip4)}
+
+        return [address for address in info.keys() if get_address_host(address) in ips]
+
     @property
     def alive(self) -> bool:
         """
@@ -224,6 +1140,41 @@ class Cluster(ClusterABC):
 
         return self._dask_nanny
 
+    @property
+    def dask_protocol(self) -> str:
+        """
+        Protocol used for Dask's interprocess communication within the private network
+        """
+
+        return self._dask_protocol
+
+    @property
+    def dask_private(self) -> int:
+        """
+        Port used for Dask's interprocess communication within the private network if ``dask_protocol`` is not ``tls``
+        """
+
+        return self._dask_private
+
+    @property
+    def ip_range(self) -> str:
+        """
+        Private address range of the entire cluster
+        """
+
+        return self._ip_range
+
+    @property
+    def networks(self) -> List[NetworkABC]:
+        """
+        All private networks of the cluster
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        return self._networks.copy()
+
     @property
     def scheduler(self) -> NodeABC:
         """
@@ -246,6 +1197,25 @@ class Cluster(ClusterABC):
 
         return self._workers.copy()
 
+    @property
+    def pools(self) -> List[PoolABC]:
+        """
+        Pools of workers, reconstructed from the labels of the workers
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        return Pool.from_nodes(self._workers)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of workers still being provisioned in the background
+        """
+
+        return len(self._pending)
+
     @property
     def prefix(self) -> str:
         """
@@ -254,6 +1224,17 @@ class Cluster(ClusterABC):
 
         return self._prefix
 
+    @property
+    def provider(self) -> ProviderABC:
+        """
+        Source of servers of the cluster
+        """
+
+        if not self.alive:
+            raise SystemError("cluster is dead")
+
+        return self._provider
+
     @classmethod
     def _fn_private(cls, prefix: str) -> str:
         """
@@ -270,6 +1251,28 @@ class Cluster(ClusterABC):
 
         return f"{cls._fn_private(prefix):s}.pub"
 
+    @staticmethod
+    def _role_from_name(name: str) -> Optional[str]:
+        """
+        Role of node derived from name of server, for nodes lacking a role label
+        """
+
+        suffix = name.split("-node-")[-1]
+        if suffix == "scheduler":
+            return "scheduler"
+        if suffix.startswith("worker"):
+            return "worker"
+
+        return None
+
+    @classmethod
+    def _fn_cache(cls, prefix: str) -> str:
+        """
+        Path to cached description of cluster
+        """
+
+        return os.path.join(os.getcwd(), f".{prefix:s}", "cluster.json")
+
     @classmethod
     def _remove_local(
         cls,
@@ -284,47 +1287,57 @@ class Cluster(ClusterABC):
             log.info("Deleting local %s ...", cls._fn_public(prefix))
             os.unlink(cls._fn_public(prefix))
 
-        for suffix in ("ca", "ca.pub", "cert", "cert.pub"):
+        for suffix in (
+            "ca",
+            "ca.pub",
+            "cert",
+            "cert.pub",
+            "cluster.json",
+            "network.json",
+            "progress.json",
+            "timeline.jsonl",
+        ):
             fn = os.path.join(os.getcwd(), f".{prefix:s}", suffix)
             if not os.path.exists(fn):
                 continue
             log.info("Deleting local %s ...", fn)
             os.unlink(fn)
 
+        logs = os.path.join(os.getcwd(), f".{prefix:s}", "logs")
+        if os.path.exists(logs):
+            log.info("Deleting local %s ...", logs)
+            shutil.rmtree(logs)
+
         fld = os.path.join(os.getcwd(), f".{prefix:s}")
         log.info("Deleting local %s ...", fld)
         os.rmdir(fld)
 
     @staticmethod
-    def _remove_remote(
-        client: Client,
+    async def _remove_remote(
+        provider: ProviderABC,
         prefix: str,
         log: Logger,
     ):
 
-        cats = [
-            getattr(client, name)
-            for name in (
-                "servers",
-                "networks",
-                "ssh_keys",
-                "firewalls",
-            )
-        ]
-
-        for cat in cats:
-            for item in cat.get_all():
+        for kind in (
+            "server",
+            "network",
+            "ssh_key",
+            "firewall",
+        ):
+            for item in await getattr(provider, f"get_{kind:s}s")():
                 if not item.name.startswith(prefix):
                     log.warning("Not deleting %s ...", item.name)
                     continue
                 log.info("Deleting remote %s ...", item.name)
-                item.delete()
+                await getattr(provider, f"delete_{kind:s}")(item)
 
     @classmethod
     async def nuke(
         cls,
         prefix: str = PREFIX,
         tokenvar: str = TOKENVAR,
+        provider: Optional[ProviderABC] = None,
         log: Union[Logger, None] = None,
     ):
         """
@@ -333,15 +1346,17 @@ class Cluster(ClusterABC):
         Args:
             prefix : Name of cluster, used as a prefix in names of every component.
             tokenvar : Name of the environment variable holding the cloud API login token.
+            provider : Source of servers, e.g. :class:`scherbelberg.LocalProvider`. Defaults to :func:`scherbelberg.create_provider`.
             log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
         """
 
         log = getLogger(name=prefix) if log is None else log
 
-        log.info("Creating cloud client ...")
-        client = Client(token=os.environ[tokenvar])
+        if provider is None:
+            log.info("Creating provider ...")
+            provider = create_provider(tokenvar)
 
-        cls._remove_remote(client, prefix, log)
+        await cls._remove_remote(provider, prefix, log)
         cls._remove_local(prefix, log)
 
         log.info("Cluster %s nuked.", prefix)
@@ -355,15 +1370,28 @@ class Cluster(ClusterABC):
         dask_ipc: int = DASK_IPC,
         dask_dash: int = DASK_DASH,
         dask_nanny: int = DASK_NANNY,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
         scheduler: str = HETZNER_INSTANCE_TINY,
         worker: str = HETZNER_INSTANCE_TINY,
         image: str = HETZNER_IMAGE_UBUNTU,
         datacenter: str = HETZNER_DATACENTER,
         workers: int = WORKERS,
+        pools: Optional[List[PoolABC]] = None,
+        ip_range: str = NETWORK_RANGE,
+        min_workers: Optional[int] = None,
+        resume: bool = False,
+        ssh_key_type: str = SSH_KEY_TYPE,
+        tls_key_type: str = TLS_KEY_TYPE,
+        ca_store: Optional[str] = None,
+        bootstrap: str = BOOTSTRAP_PROFILE,
+        provider: Optional[ProviderABC] = None,
         log: Union[Logger, None] = None,
     ) -> ClusterABC:
         """
-        Creates a new cluster
+        Creates a new cluster.
+        Returns once the scheduler and ``min_workers`` workers are running and registered with the Dask scheduler.
+        Remaining workers keep being provisioned in the background, see :meth:`scherbelberg.Cluster.wait_for_workers`.
 
         Args:
             prefix : Name of cluster, used as a prefix in names of every component.
@@ -372,11 +1400,22 @@ class Cluster(ClusterABC):
             dask_ipc : Port used for Dask's interprocess communication.
             dask_dash : Port used for Dask's dashboard.
             dask_nanny : Port used for Dask's nanny.
+            dask_protocol : Protocol used for Dask's interprocess communication within the private network, either ``tls`` (default) or ``tcp``. External clients always connect via TLS.
+            dask_private : Port used for Dask's interprocess communication within the private network if ``dask_protocol`` is not ``tls``.
             scheduler : Compute instance type used for Dask scheduler.
             worker : Compute instance type used for Dask workers.
             image : Operating system image.
             datacenter : Target data center.
             workers : Number of workers in cluster.
+            pools : Pools of workers, each with its own compute instance type, number of workers, data center and abstract Dask resources. If provided, ``worker`` and ``workers`` are ignored.
+            ip_range : Private address range of the entire cluster. Additional private networks are carved out of it once the limit of servers per network is reached, which requires ``dask_protocol`` to be ``tls``.
+            min_workers : Minimum number of workers to wait for. Defaults to all workers.
+            resume : Resumes an interrupted or failed attempt of creating the cluster. Existing resources and nodes which completed bootstrapping are reused, incomplete nodes are replaced. Parameters recorded by the earlier attempt take precedence.
+            ssh_key_type : Type of SSH key, either ``ed25519`` (default), ``ecdsa`` or ``rsa``.
+            tls_key_type : Type of keys of TLS certificates, either ``ecdsa`` (default), ``ed25519`` or ``rsa``.
+            ca_store : Location of a persistent certificate authority, see :class:`scherbelberg.CAStore`, e.g. ``~/.scherbelberg/ca``. It issues the cluster's certificate instead of a new certificate authority being created for the cluster.
+            bootstrap : System updates during bootstrapping, either ``full`` (default) for all updates, ``security`` for security updates only or ``none``. Nodes reboot only if updates require it.
+            provider : Source of servers, e.g. :class:`scherbelberg.LocalProvider`. Defaults to :func:`scherbelberg.create_provider`.
             log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
         Returns:
             Cluster object represeting an alive cluster.
@@ -384,11 +1423,12 @@ class Cluster(ClusterABC):
 
         log = getLogger(name=prefix) if log is None else log
 
-        log.info("Creating cloud client ...")
-        client = Client(token=os.environ[tokenvar])
+        if provider is None:
+            log.info("Creating provider ...")
+            provider = create_provider(tokenvar)
 
         creator = await Creator.from_async(
-            client=client,
+            provider=provider,
             prefix=prefix,
             fn_public=cls._fn_public(prefix),
             fn_private=cls._fn_private(prefix),
@@ -396,27 +1436,52 @@ class Cluster(ClusterABC):
             dask_ipc=dask_ipc,
             dask_dash=dask_dash,
             dask_nanny=dask_nanny,
+            dask_protocol=dask_protocol,
+            dask_private=dask_private,
             scheduler=scheduler,
             worker=worker,
             image=image,
             datacenter=datacenter,
             workers=workers,
+            pools=pools,
+            ip_range=ip_range,
+            min_workers=min_workers,
+            resume=resume,
+            ssh_key_type=ssh_key_type,
+            tls_key_type=tls_key_type,
+            ca_store=ca_store,
+            bootstrap=bootstrap,
             log=log,
         )
 
-        return cls(
-            client=client,
+        parameters = creator.parameters  # recorded ones take precedence if resumed
+        cluster = cls(
+            provider=provider,
             scheduler=creator.scheduler,
             workers=creator.workers,
-            network=creator.network,
+            network=creator.networks[0],
             firewall=creator.firewall,
-            dask_ipc=dask_ipc,
-            dask_dash=dask_dash,
-            dask_nanny=dask_nanny,
+            networks=creator.networks,
+            dask_ipc=parameters["dask_ipc"],
+            dask_dash=parameters["dask_dash"],
+            dask_nanny=parameters["dask_nanny"],
+            dask_protocol=parameters["dask_protocol"],
+            dask_private=parameters["dask_private"],
+            ip_range=parameters["ip_range"],
             prefix=prefix,
             wait=wait,
             log=log,
         )
+        cluster._adopt(creator.pending, graph=creator.graph)
+
+        try:
+            await cluster._wait_for_registration(creator.workers)
+        except Exception:
+            await cluster._cancel_pending()  # nothing keeps running behind the caller's back
+            raise
+        cluster._save()
+
+        return cluster
 
     @classmethod
     async def from_existing(
@@ -424,13 +1489,16 @@ class Cluster(ClusterABC):
         prefix: str = PREFIX,
         tokenvar: str = TOKENVAR,
         wait: float = WAIT,
+        provider: Optional[ProviderABC] = None,
         log: Union[Logger, None] = None,
     ) -> ClusterABC:
         """
         Attaches to existing cluster.
+        Nodes are discovered via their ``cluster`` label and assigned roles via their ``role`` label, firewall and private networks are looked up concurrently.
+        Nodes of clusters created before nodes were labeled are discovered by name.
         Raises :class:`scherbelberg.ClusterSchedulerNotFound` if scheduler can not be found.
         This is also the most likely exception if a cluster for a given prefix simply does not exist.
-        Raises :class:`scherbelberg.ClusterWorkerNotFound` if a worker can not be found.
+        Raises :class:`scherbelberg.ClusterWorkerNotFound` if no worker can be found.
         Raises :class:`scherbelberg.ClusterFirewallNotFound` if the firewall can not be found.
         Raises :class:`scherbelberg.ClusterNetworkNotFound` if the private network can not be found.
 
@@ -438,6 +1506,7 @@ class Cluster(ClusterABC):
             prefix : Name of cluster, used as a prefix in names of every component.
             tokenvar : Name of the environment variable holding the cloud API login token.
             wait : Timeout in seconds before actions are repeated or exceptions are raised.
+            provider : Source of servers, e.g. :class:`scherbelberg.LocalProvider`. Defaults to :func:`scherbelberg.create_provider`.
             log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
         Returns:
             Cluster object represeting an alive cluster.
@@ -445,64 +1514,200 @@ class Cluster(ClusterABC):
 
         log = getLogger(name=prefix) if log is None else log
 
-        log.info("Creating cloud client ...")
-        client = Client(token=os.environ[tokenvar])
+        if provider is None:
+            log.info("Creating provider ...")
+            provider = create_provider(tokenvar)
 
-        log.info("Getting handle on scheduler ...")
-        try:
-            scheduler = await Node.from_name(
-                name=f"{prefix:s}-node-scheduler",
-                client=client,
-                fn_private=cls._fn_private(prefix),
-                prefix=prefix,
-                wait=wait,
-                log=log,
+        log.info("Getting handles on nodes, firewall and networks ...")
+        servers, firewall, networks = await gather(
+            provider.get_servers(labels={"cluster": prefix}),
+            provider.get_firewall(f"{prefix:s}-firewall"),
+            provider.get_networks(),
+        )
+        if all(server.labels.get("role") != "scheduler" for server in servers):
+            # created before nodes were labeled, possibly scaled up since
+            servers = {server.name: server for server in servers}
+            servers.update(
+                {
+                    server.name: server
+                    for server in await provider.get_servers()
+                    if server.name.startswith(f"{prefix:s}-node-")
+                    and server.name not in servers.keys()
+                }
             )
-        except NodeNotFound as e:
-            raise ClusterSchedulerNotFound() from e
+            servers = list(servers.values())
 
-        log.info("Getting handles on workers ...")
-        try:
-            workers = [
+        nodes = {"scheduler": [], "worker": []}
+        for server in sorted(servers, key=lambda server: server.name):
+            role = server.labels.get("role", cls._role_from_name(server.name))
+            if role not in nodes.keys():
+                continue
+            nodes[role].append(
                 Node(
                     server=server,
-                    client=client,
+                    provider=provider,
                     fn_private=cls._fn_private(prefix),
                     prefix=prefix,
                     wait=wait,
                     log=log,
                 )
-                for server in client.servers.get_all()
-                if server.name.startswith(prefix) and "-node-worker" in server.name
-            ]
-        except NodeNotFound as e:
-            raise ClusterWorkerNotFound() from e
+            )
 
-        log.info("Getting handle on firewall ...")
-        firewall = client.firewalls.get_by_name(
-            name=f"{prefix:s}-firewall",
-        )
+        if len(nodes["scheduler"]) == 0:
+            raise ClusterSchedulerNotFound()
+        if len(nodes["worker"]) == 0:
+            raise ClusterWorkerNotFound()
         if firewall is None:
             raise ClusterFirewallNotFound()
 
-        log.info("Getting handle on network ...")
-        network = client.networks.get_by_name(
-            name=f"{prefix:s}-network",
-        )
+        networks = {network.name: network for network in networks}
+        network = networks.get(f"{prefix:s}-network")
         if network is None:
             raise ClusterNetworkNotFound()
+        networks = sorted(
+            [
+                other
+                for other in networks.values()
+                if (Layout.network_index(prefix, other.name) or 0) > 0
+            ],
+            key=lambda other: Layout.network_index(prefix, other.name),
+        )
+        scheduler, workers = nodes["scheduler"][0], nodes["worker"]
 
         log.info("Successfully attached to existing cluster.")
-        return cls(
-            client=client,
+        cluster = cls(
+            provider=provider,
             scheduler=scheduler,
             workers=workers,
             network=network,
             firewall=firewall,
+            networks=[network, *networks],
             dask_ipc=int(scheduler.labels["dask_ipc"]),
             dask_dash=int(scheduler.labels["dask_dash"]),
             dask_nanny=int(scheduler.labels["dask_nanny"]),
+            dask_protocol=scheduler.labels.get("dask_protocol", DASK_PROTOCOL),
+            dask_private=int(scheduler.labels.get("dask_private", DASK_PRIVATE)),
+            ip_range=scheduler.labels.get("ip_range", NETWORK_RANGE).replace("-", "/"),
+            prefix=prefix,
+            wait=wait,
+            log=log,
+        )
+        cluster._save()
+
+        return cluster
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: Dict[str, Any],
+        tokenvar: str = TOKENVAR,
+        wait: float = WAIT,
+        provider: Optional[ProviderABC] = None,
+        log: Union[Logger, None] = None,
+    ) -> ClusterABC:
+        """
+        Restores a cluster from a description generated by :meth:`scherbelberg.Cluster.to_dict` without querying the provider.
+        The description may be outdated, e.g. if workers were added or removed by another process.
+
+        Args:
+            data : Description of cluster.
+            tokenvar : Name of the environment variable holding the cloud API login token.
+            wait : Timeout in seconds before actions are repeated or exceptions are raised.
+            provider : Source of servers, e.g. :class:`scherbelberg.LocalProvider`. Defaults to :func:`scherbelberg.create_provider`.
+            log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
+        Returns:
+            Cluster object represeting an alive cluster.
+        """
+
+        prefix = data["prefix"]
+        log = getLogger(name=prefix) if log is None else log
+
+        if provider is None:
+            log.info("Creating provider ...")
+            provider = create_provider(tokenvar)
+
+        def node(server):
+            return Node(
+                server=Instance.from_dict(server),
+                provider=provider,
+                fn_private=cls._fn_private(prefix),
+                prefix=prefix,
+                wait=wait,
+                log=log,
+            )
+
+        networks = [
+            Network(name=network["name"], ip_range=network["ip_range"])
+            for network in data["networks"]
+        ]
+
+        return cls(
+            provider=provider,
+            scheduler=node(data["scheduler"]),
+            workers=[node(server) for server in data["workers"]],
+            network=networks[0],
+            firewall=Resource(name=data["firewall"]),
+            networks=networks,
+            dask_ipc=data["dask_ipc"],
+            dask_dash=data["dask_dash"],
+            dask_nanny=data["dask_nanny"],
+            dask_protocol=data["dask_protocol"],
+            dask_private=data["dask_private"],
+            ip_range=data["ip_range"],
+            prefix=prefix,
+            wait=wait,
+            log=log,
+        )
+
+    @classmethod
+    async def from_cache(
+        cls,
+        prefix: str = PREFIX,
+        tokenvar: str = TOKENVAR,
+        wait: float = WAIT,
+        ttl: float = CACHE_TTL,
+        provider: Optional[ProviderABC] = None,
+        log: Union[Logger, None] = None,
+    ) -> ClusterABC:
+        """
+        Attaches to existing cluster based on the description cached in ``.<prefix>/cluster.json``, without querying the provider.
+        The description is written whenever a cluster is created or attached to and whenever workers are added or removed.
+        If it is missing or older than ``ttl`` seconds, the cluster is attached to via :meth:`scherbelberg.Cluster.from_existing` instead, which refreshes the description.
+        Raises the same exceptions as :meth:`scherbelberg.Cluster.from_existing` in this case.
+
+        Args:
+            prefix : Name of cluster, used as a prefix in names of every component.
+            tokenvar : Name of the environment variable holding the cloud API login token.
+            wait : Timeout in seconds before actions are repeated or exceptions are raised.
+            ttl : Maximum age of cached description in seconds. ``0`` always refreshes the description.
+            provider : Source of servers, e.g. :class:`scherbelberg.LocalProvider`. Defaults to :func:`scherbelberg.create_provider`.
+            log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
+        Returns:
+            Cluster object represeting an alive cluster.
+        """
+
+        log = getLogger(name=prefix) if log is None else log
+
+        try:
+            with open(cls._fn_cache(prefix), "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):  # missing or corrupted
+            cache = None
+
+        if cache is not None and 0 <= time() - cache["cached"] < ttl:
+            log.info("Using cached description of cluster ...")
+            return cls.from_dict(
+                cache["cluster"],
+                tokenvar=tokenvar,
+                wait=wait,
+                provider=provider,
+                log=log,
+            )
+
+        return await cls.from_existing(
             prefix=prefix,
+            tokenvar=tokenvar,
             wait=wait,
+            provider=provider,
             log=log,
         )
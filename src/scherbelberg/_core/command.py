@@ -27,15 +27,16 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from asyncio import sleep
+from asyncio import get_running_loop, sleep
 import itertools
+import os
 from subprocess import Popen, PIPE
-from typing import List, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import shlex
 from sys import platform
-from time import time
+from time import perf_counter, time
 
-from .abc import CommandABC, SSHConfigABC
+from .abc import BackendABC, CommandABC, SSHConfigABC
 from .const import WAIT
 from .debug import typechecked
 from .process import Process
@@ -54,6 +55,9 @@ class Command(CommandABC):
         cmd : List of list of strings. Each inner list represents one command compatible to ``subprocess.Popen``.
     """
 
+    _backend = None  # alternative to subprocess.Popen, see set_backend
+    _hooks = []  # receive spans of completed runs, see add_hook
+
     def __init__(self, cmd: List[List[str]]):
 
         self._cmd = [fragment.copy() for fragment in cmd]
@@ -133,6 +137,28 @@ class Command(CommandABC):
             A tuple, the first two elements containing data from standard output and standard error streams. If ``returncode`` is set to ``True``, the tuple has two additional entries, a list of return codes and an exception object that can be raised by the caller.
         """
 
+        start, clock = time(), perf_counter()
+        sent = self._sent() if len(type(self)._hooks) > 0 else 0
+
+        if type(self)._backend is not None:
+            output, errors, status, exception = await type(self)._backend.run(
+                self, timeout=timeout, wait=wait
+            )
+            self._trace(
+                start=start,
+                spawn=None,
+                connect=None,
+                runtime=perf_counter() - clock,
+                received=sum(len(text.encode("utf-8")) for text in output + errors),
+                sent=sent,
+                status=status,
+            )
+            if returncode:
+                return output, errors, status, exception
+            if any((code != 0 for code in status)):
+                raise exception
+            return output, errors
+
         procs = []  # all processes, connected with pipes
 
         for index, fragment in enumerate(self._cmd):  # create & connect processes
@@ -146,22 +172,125 @@ class Command(CommandABC):
             )
             procs.append(proc)
 
+        spawn = perf_counter() - clock
+
         process = Process(
             procs=procs,
             command=self,
         )
 
-        start = time()
-        while process.running:
-            await sleep(wait)
-            if timeout is not None and (time() - start) >= timeout:
-                break
+        responded = []  # time of first byte or end of any output stream
+        watched = self._watch(procs, responded) if len(type(self)._hooks) > 0 else []
+
+        try:
+            while process.running:
+                await sleep(wait)
+                if timeout is not None and (time() - start) >= timeout:
+                    break
+        finally:
+            self._unwatch(watched)
 
-        return process.communicate(
-            returncode=returncode,
+        output, errors, status, exception = process.communicate(
+            returncode=True,
             timeout=0.1 if timeout is not None else None,
         )
 
+        runtime = perf_counter() - clock
+        self._trace(
+            start=start,
+            spawn=spawn,
+            connect=responded[0] - clock if len(responded) > 0 else None,
+            runtime=runtime,
+            received=process.received,
+            sent=sent,
+            status=status,
+        )
+
+        if returncode:
+            return output, errors, status, exception
+        if any((code != 0 for code in status)):
+            raise exception
+        return output, errors
+
+    def _sent(self) -> int:
+
+        sent = 0
+
+        for fragment in self._cmd:
+            if fragment[0] == "ssh":  # remote command, see on_host
+                sent += len(fragment[-1].encode("utf-8"))
+            elif fragment[0] == "scp" and "-i" in fragment:  # files, see from_scp
+                sent += sum(
+                    os.path.getsize(path)
+                    for path in fragment[fragment.index("-i") + 2 : -1]
+                    if os.path.isfile(path)
+                )
+
+        return sent
+
+    def _trace(
+        self,
+        start: float,
+        spawn: Optional[float],
+        connect: Optional[float],
+        runtime: float,
+        received: int,
+        sent: int,
+        status: List[int],
+    ):
+
+        if len(type(self)._hooks) == 0:
+            return
+
+        span = {
+            "command": str(self),
+            "host": self.host,
+            "start": start,
+            "spawn": spawn,
+            "connect": connect,
+            "runtime": runtime,
+            "bytes_in": received,
+            "bytes_out": sent,
+            "status": status.copy(),
+            "ok": all(code == 0 for code in status),
+        }
+
+        for hook in type(self)._hooks:
+            hook(span)
+
+    @staticmethod
+    def _watch(procs: List[Popen], responded: List[float]) -> List[int]:
+
+        if platform.startswith("win"):  # no readers on pipes
+            return []
+
+        loop = get_running_loop()
+        fds = [procs[-1].stdout.fileno(), *[proc.stderr.fileno() for proc in procs]]
+
+        def respond():  # fires once, does not consume data
+            if len(responded) == 0:
+                responded.append(perf_counter())
+            for fd in fds:
+                loop.remove_reader(fd)
+
+        try:
+            for fd in fds:
+                loop.add_reader(fd, respond)
+        except NotImplementedError:  # e.g. proactor event loop
+            return []
+
+        return fds
+
+    @staticmethod
+    def _unwatch(fds: List[int]):
+
+        if len(fds) == 0:
+            return
+
+        loop = get_running_loop()
+        for fd in fds:
+            loop.remove_reader(fd)
+
     def on_host(self, host: SSHConfigABC) -> CommandABC:
         """
         Adds a ``ssh`` prefix to the command so it can be executed on a remote host.
@@ -194,6 +323,68 @@ class Command(CommandABC):
             ]
         )
 
+    @classmethod
+    def add_hook(cls, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Adds a hook which is called with a span, a dictionary describing a run, every time a command completes.
+        Fields are ``command``, ``host`` (remote host or ``None``), ``start`` (seconds since the epoch),
+        ``spawn`` (seconds until all processes were started), ``connect`` (seconds until the first byte or the end of any output stream arrived, for remote commands an upper bound of the time to connect),
+        ``runtime`` (seconds), ``bytes_in`` (bytes received via output streams), ``bytes_out`` (bytes of remote commands and files sent via ``ssh`` and ``scp``),
+        ``status`` (return codes) and ``ok``. ``spawn`` and ``connect`` are ``None`` if unknown, e.g. for commands run by a backend.
+        Spans are only assembled while at least one hook is present.
+
+        Args:
+            hook : Callable accepting one span, e.g. ``list.append``.
+        """
+
+        cls._hooks = [*cls._hooks, hook]
+
+    @classmethod
+    def remove_hook(cls, hook: Callable[[Dict[str, Any]], None]):
+        """
+        Removes a hook previously added via :meth:`scherbelberg.Command.add_hook`.
+
+        Args:
+            hook : Callable accepting one span.
+        """
+
+        cls._hooks = [item for item in cls._hooks if item != hook]
+
+    @classmethod
+    def get_hooks(cls) -> List[Callable[[Dict[str, Any]], None]]:
+        """
+        Currently active hooks receiving spans of completed runs.
+
+        Returns:
+            List of hooks.
+        """
+
+        return cls._hooks.copy()
+
+    @classmethod
+    def get_backend(cls) -> Optional[BackendABC]:
+        """
+        Currently active backend for running commands.
+
+        Returns:
+            Backend object or ``None`` if commands are run as local processes via ``subprocess.Popen``.
+        """
+
+        return cls._backend
+
+    @classmethod
+    def set_backend(cls, backend: Optional[BackendABC] = None):
+        """
+        Replaces how commands are run, e.g. by :class:`scherbelberg.FakeSSH` for benchmarking without any servers.
+        A backend provides a ``run`` coroutine method, accepting the command plus the ``timeout`` and ``wait`` parameters of :meth:`scherbelberg.Command.run`.
+        It returns standard output and standard error streams, return codes and an exception object like :meth:`scherbelberg.Process.communicate` with ``returncode`` set to ``True``.
+
+        Args:
+            backend : Backend object. ``None`` restores running commands as local processes via ``subprocess.Popen``.
+        """
+
+        cls._backend = backend
+
     @property
     def cmd(self) -> List[List[str]]:
         """
@@ -202,6 +393,24 @@ class Command(CommandABC):
 
         return [fragment.copy() for fragment in self._cmd]
 
+    @property
+    def host(self) -> Optional[str]:
+        """
+        Remote host of the first ``ssh`` or ``scp`` command in the chain, ``None`` for purely local commands
+        """
+
+        for fragment in self._cmd:
+            if fragment[0] == "ssh":
+                target = fragment[-2]
+            elif fragment[0] == "scp":
+                target = fragment[-1]
+            else:
+                continue
+            if "@" in target:
+                return target.split("@", 1)[1].split(":", 1)[0]
+
+        return None
+
     @classmethod
     def from_str(cls, cmd: str) -> CommandABC:
         """
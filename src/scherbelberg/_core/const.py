@@ -30,13 +30,66 @@ specific language governing rights and limitations under the License.
 HETZNER_INSTANCE_TINY = "cx11"
 HETZNER_IMAGE_UBUNTU = "ubuntu-20.04"
 HETZNER_DATACENTER = "fsn1-dc14"
+HETZNER_NETWORK_SERVERS = 100  # maximum number of servers per network
+HETZNER_NETWORK_ZONE = "eu-central"
+HETZNER_API = "https://api.hetzner.cloud/v1"
+HETZNER_FAKE_API = "http://api.fake.invalid/v1"  # offline stand-in, see FakeCloud
+HETZNER_CPU_TYPES = ("shared", "dedicated")
+HETZNER_ARCHITECTURES = ("x86", "arm")  # also names of Dask resources of workers
+
+LOCAL_ENGINE = "docker"
+LOCAL_ENGINES = ("docker", "podman")
+LOCAL_PATH = "~/.scherbelberg/local"  # state of local nodes, see LocalProvider
+LOCAL_RANGE = "172.29.0.0/16"  # addresses of local nodes, stand-in for public addresses
+LOCAL_WAIT = 0.05  # polling interval of container engine commands
+
+NETWORK_RANGE = "10.0.0.0/16"  # private address range of entire cluster
+NETWORK_PREFIX = 20  # prefix length of address range per network
+
+BOOTSTRAP_PROFILE = "full"
+BOOTSTRAP_PROFILES = ("full", "security", "none")  # system updates during bootstrap
 
 WORKERS = 1
+WORKER_DIGITS = 4  # zero-padded digits in names of workers
+POOL = "default"
 
 DASK_IPC = 9753
 DASK_DASH = 9756
 DASK_NANNY = 9759
+DASK_PRIVATE = 9762
+
+BENCH_PORT = 9765  # opened temporarily for network benchmarks via public addresses
+BENCH_SIZE = 2 ** 26  # bytes transferred per link
+BENCH_PINGS = 20  # round trips per link
+BENCH_THRESHOLD = 0.5  # fraction of median throughput below which links are slow
+BENCH_TIMEOUT = 120.0
+BENCH_COMMANDS = ("build", "local", "ssh", "scp")  # see bench_command
+BENCH_WORKLOADS = ("array", "shuffle", "tasks", "zarr")  # see bench_workloads
+BENCH_RESULTS = "~/.scherbelberg/workloads.jsonl"  # outlives clusters, see plan
+BENCH_IMPORTS = ("package", "version", "help", "ssh")  # see bench_imports
+BENCH_BUDGET = 0.15  # seconds, start-up of package and command line interface
+
+DASK_PROTOCOL = "tls"
+DASK_PROTOCOLS = ("tls", "tcp")
 
 PREFIX = "cluster"
 TOKENVAR = "HETZNER"
+APIVAR = "SCHERBELBERG_API"  # optional, redirects cloud API, e.g. to FakeServer
+PROVIDERVAR = "SCHERBELBERG_PROVIDER"  # optional, "hetzner" (default) or a local engine
+PROVIDER = "hetzner"
+
+SSH_KEY_TYPE = "ed25519"
+SSH_KEY_TYPES = ("ed25519", "ecdsa", "rsa")
+TLS_KEY_TYPE = "ecdsa"
+TLS_KEY_TYPES = ("ecdsa", "ed25519", "rsa")
+CA_STORE = "~/.scherbelberg/ca"  # user-level certificate authority, optional
+CA_RENEW = 30  # days of remaining validity below which certificates are renewed
 WAIT = 1.0
+RETIRE_TIMEOUT = 600.0
+REGISTER_TIMEOUT = 300.0
+CACHE_TTL = 300.0  # seconds after which a cached cluster description is revalidated
+CATALOG_CACHE = "~/.scherbelberg/catalog.json"  # server types, prices per endpoint
+CATALOG_TTL = 86400.0  # seconds after which the cached catalog is refreshed
+PLAN_OBJECTIVES = ("core", "memory", "throughput")  # see plan_cluster
+PLAN_WORKERS = 100  # maximum number of workers of planned clusters
+PLAN_LIMIT = 10  # number of planned clusters shown
@@ -27,37 +27,54 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from asyncio import create_task, gather, sleep
+from asyncio import create_task, gather, wait, Task, FIRST_COMPLETED, FIRST_EXCEPTION
 from logging import getLogger, Logger
+import json
 import os
-from typing import Dict, List, Union
-
-from hcloud import Client
-from hcloud.datacenters.domain import Datacenter
-from hcloud.firewalls.client import BoundFirewall
-from hcloud.firewalls.domain import FirewallRule
-from hcloud.images.domain import Image
-from hcloud.networks.client import BoundNetwork
-from hcloud.networks.domain import NetworkSubnet
-from hcloud.servers.domain import Server
-from hcloud.server_types.domain import ServerType
-from hcloud.ssh_keys.client import BoundSSHKey
-
-from .abc import CreatorABC, NodeABC
-from .command import Command
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
+
+from .abc import (
+    CreatorABC,
+    GraphABC,
+    InstanceABC,
+    LayoutABC,
+    NetworkABC,
+    NodeABC,
+    PoolABC,
+    ProviderABC,
+    ResourceABC,
+    TimelineABC,
+)
 from .const import (
+    BOOTSTRAP_PROFILE,
+    BOOTSTRAP_PROFILES,
     DASK_IPC,
     DASK_DASH,
     DASK_NANNY,
+    DASK_PRIVATE,
+    DASK_PROTOCOL,
+    DASK_PROTOCOLS,
     WAIT,
     WORKERS,
     HETZNER_INSTANCE_TINY,
     HETZNER_IMAGE_UBUNTU,
     HETZNER_DATACENTER,
+    NETWORK_RANGE,
+    SSH_KEY_TYPE,
+    SSH_KEY_TYPES,
+    TLS_KEY_TYPE,
+    TLS_KEY_TYPES,
+    WORKER_DIGITS,
 )
+from .castore import CAStore
+from .dag import Graph
 from .debug import typechecked
+from .layout import Layout
 from .node import Node
+from .pool import Pool
 from .ssl import create_ca, create_signed_cert, write_certs
+from .sshkey import create_ssh_key
+from .timeline import Timeline
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ERRORS
@@ -83,7 +100,7 @@ class Creator(CreatorABC):
 
     def __init__(
         self,
-        client: Client,
+        provider: ProviderABC,
         prefix: str,
         fn_public: str,
         fn_private: str,
@@ -93,7 +110,7 @@ class Creator(CreatorABC):
 
         self._log = getLogger(name=prefix) if log is None else log
 
-        self._client = client
+        self._provider = provider
         self._prefix = prefix
         self._fn_public = fn_public
         self._fn_private = fn_private
@@ -101,87 +118,338 @@ class Creator(CreatorABC):
 
         self._ssh_key = None
         self._firewall = None
-        self._network = None
+        self._layout = None
+        self._networks = None
         self._scheduler = None
         self._workers = None
+        self._pending = []
+        self._progress = None
+        self._resume = False
+        self._ca_store = None
+        self._catalog = None
+        self._bootstrap = BOOTSTRAP_PROFILE
+        self._graph = None
+        self._timeline = Timeline()
 
     async def create(
         self,
         dask_ipc: int = DASK_IPC,
         dask_dash: int = DASK_DASH,
         dask_nanny: int = DASK_NANNY,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
         scheduler: str = HETZNER_INSTANCE_TINY,
         worker: str = HETZNER_INSTANCE_TINY,
         image: str = HETZNER_IMAGE_UBUNTU,
         datacenter: str = HETZNER_DATACENTER,
         workers: int = WORKERS,
+        pools: Optional[List[PoolABC]] = None,
+        ip_range: str = NETWORK_RANGE,
+        min_workers: Optional[int] = None,
+        resume: bool = False,
+        ssh_key_type: str = SSH_KEY_TYPE,
+        tls_key_type: str = TLS_KEY_TYPE,
+        ca_store: Optional[str] = None,
+        bootstrap: str = BOOTSTRAP_PROFILE,
     ):
 
-        assert workers > 0
+        progress = self._read_progress() if resume else None
+        if progress is not None:
+            self._log.info("Resuming creation with recorded parameters ...")
+            parameters = progress["parameters"]
+            dask_ipc = parameters["dask_ipc"]
+            dask_dash = parameters["dask_dash"]
+            dask_nanny = parameters["dask_nanny"]
+            dask_protocol = parameters["dask_protocol"]
+            dask_private = parameters["dask_private"]
+            scheduler = parameters["scheduler"]
+            image = parameters["image"]
+            datacenter = parameters["datacenter"]
+            pools = [Pool.from_str(spec) for spec in parameters["pools"]]
+            ip_range = parameters["ip_range"]
+            ssh_key_type = parameters.get("ssh_key_type", SSH_KEY_TYPE)
+            tls_key_type = parameters.get("tls_key_type", TLS_KEY_TYPE)
+            ca_store = parameters.get("ca_store", None)
+            bootstrap = parameters.get("bootstrap", BOOTSTRAP_PROFILE)
+        elif pools is None:
+            pools = [Pool(servertype=worker, workers=workers, datacenter=datacenter)]
+
+        assert len(pools) > 0
+        assert len({pool.name for pool in pools}) == len(pools)
+
+        total = sum(pool.workers for pool in pools)
+        if min_workers is None:
+            min_workers = total
+        assert 0 < min_workers <= total
 
         assert dask_ipc >= 2 ** 10
         assert dask_dash >= 2 ** 10
         assert dask_nanny >= 2 ** 10
+        assert dask_private >= 2 ** 10
 
-        assert len({dask_ipc, dask_dash, dask_nanny}) == 3
+        assert len({dask_ipc, dask_dash, dask_nanny, dask_private}) == 4
+        assert dask_protocol in DASK_PROTOCOLS
+        assert ssh_key_type in SSH_KEY_TYPES
+        assert tls_key_type in TLS_KEY_TYPES
+        assert bootstrap in BOOTSTRAP_PROFILES
 
         fld = os.path.join(os.getcwd(), f".{self._prefix:s}")
-        if os.path.exists(fld):
+        if os.path.exists(fld) and not resume:
             raise ClusterPrefixFolderExists(fld)
-        os.mkdir(fld)
 
-        await self._create_certs()
-        self._ssh_key = await self._create_ssh_key()
-        self._network = await self._create_network(ip_range="10.0.1.0/24")
-        self._firewall = await self._create_firewall(dask_ipc, dask_dash, dask_nanny)
+        await self._check_servertypes(
+            [(scheduler, datacenter, 1)]
+            + [(pool.servertype, pool.datacenter, pool.workers) for pool in pools]
+        )
 
-        self._log.info("Creating nodes ...")
+        suffixes = ["scheduler"] + [
+            f"worker{index:0{WORKER_DIGITS:d}d}" for index in range(total)
+        ]
+        self._resume = resume
+        self._ca_store = ca_store
+        self._bootstrap = bootstrap
+        self._timeline = Timeline(fn=self._fn_timeline())
+        nodes = await self._find_nodes(suffixes) if resume else {}
+        self._networks = await self._find_networks() if resume else []
+
+        self._layout = Layout(
+            ip_range=ip_range,
+            networks=[network.ip_range for network in self._networks],
+            used=[ip for node in nodes.values() for ip in node.private_ip4s],
+        )
+        addresses = {
+            suffix: self._layout.allocate(network=0 if suffix == "scheduler" else None)
+            for suffix in suffixes
+            if suffix not in nodes.keys()
+        }
+        self._check_layout(dask_protocol)
+
+        if not os.path.exists(fld):
+            os.mkdir(fld)
+
+        self._progress = {
+            "parameters": {
+                "dask_ipc": dask_ipc,
+                "dask_dash": dask_dash,
+                "dask_nanny": dask_nanny,
+                "dask_protocol": dask_protocol,
+                "dask_private": dask_private,
+                "scheduler": scheduler,
+                "image": image,
+                "datacenter": datacenter,
+                "pools": [str(pool) for pool in pools],
+                "ip_range": ip_range,
+                "ssh_key_type": ssh_key_type,
+                "tls_key_type": tls_key_type,
+                "ca_store": ca_store,
+                "bootstrap": bootstrap,
+            },
+            "nodes": {suffix: node.stage for suffix, node in nodes.items()},
+        }
+        self._write_progress()
+
+        self._log.info("Creating resources and nodes ...")
+
+        graph = Graph(log=self._log)
+        self._graph = graph
+
+        graph.add(
+            "certs",
+            lambda: self._timed("certs", self._create_certs(tls_key_type)),
+        )
+        graph.add(
+            "ssh_key",
+            lambda: self._timed("ssh_key", self._create_ssh_key(ssh_key_type)),
+        )
+        graph.add(
+            "networks",
+            lambda: self._timed("networks", self._create_networks()),
+        )
+        graph.add(
+            "firewall",
+            lambda: self._timed(
+                "firewall",
+                self._create_firewall(dask_ipc, dask_dash, dask_nanny),
+            ),
+        )
 
-        scheduler_task = create_task(
-            self._create_node(
-                suffix="scheduler",
-                servertype=scheduler,
-                datacenter=datacenter,
+        self._add_node_steps(
+            graph,
+            suffix="scheduler",
+            node=nodes.get("scheduler"),
+            servertype=scheduler,
+            datacenter=datacenter,
+            image=image,
+            address=addresses.get("scheduler"),
+            labels={
+                "dask_ipc": str(dask_ipc),
+                "dask_dash": str(dask_dash),
+                "dask_nanny": str(dask_nanny),
+                "dask_protocol": dask_protocol,
+                "dask_private": str(dask_private),
+                "ip_range": ip_range.replace("/", "-"),  # "/" is not allowed
+                "bootstrap": bootstrap,
+            },
+        )
+        scheduler_task = graph.add(
+            "scheduler:start",
+            lambda: self._start_scheduler(
+                graph.result("scheduler:bootstrap"),
+                dask_ipc=dask_ipc,
+                dask_dash=dask_dash,
+                dask_protocol=dask_protocol,
+                dask_private=dask_private,
+            ),
+            requires=["scheduler:bootstrap"],
+        )
+
+        restart = (
+            nodes.get("scheduler") is None or nodes["scheduler"].stage != "started"
+        )
+        worker_tasks = []
+        for pool, suffix in zip(
+            (pool for pool in pools for _ in range(pool.workers)),
+            suffixes[1:],
+        ):
+            self._add_node_steps(
+                graph,
+                suffix=suffix,
+                node=nodes.get(suffix),
+                servertype=pool.servertype,
+                datacenter=pool.datacenter,
                 image=image,
-                ip="10.0.1.200",
-                labels={
-                    "dask_ipc": str(dask_ipc),
-                    "dask_dash": str(dask_dash),
-                    "dask_nanny": str(dask_nanny),
-                },
+                address=addresses.get(suffix),
+                labels=pool.labels,
+            )
+            worker_tasks.append(
+                self._add_worker_start_step(
+                    graph,
+                    suffix=suffix,
+                    restart=restart,
+                    dask_ipc=dask_ipc,
+                    dask_dash=dask_dash,
+                    dask_nanny=dask_nanny,
+                    dask_protocol=dask_protocol,
+                    dask_private=dask_private,
+                )
+            )
+
+        try:
+            self._scheduler = await scheduler_task
+            self._workers = []
+            self._pending = await self._wait_for_workers(worker_tasks, min_workers)
+        except Exception:
+            graph.cancel()
+            await graph.join()  # nothing keeps running behind the caller's back
+            raise
+
+        self._ssh_key = graph.result("ssh_key")
+        self._firewall = graph.result("firewall")
+
+        if len(self._pending) == 0:
+            self._log.info("Successfully created new cluster.")
+        else:
+            self._log.info(
+                "Successfully created new cluster with %d worker(s), %d worker(s) still being provisioned.",
+                len(self._workers),
+                len(self._pending),
             )
+        self._log.info("Critical path:\n%s", graph.report())
+
+    async def add_workers(
+        self,
+        scheduler: NodeABC,
+        workers: List[NodeABC],
+        networks: List[NetworkABC],
+        firewall: ResourceABC,
+        pool: PoolABC,
+        dask_ipc: int = DASK_IPC,
+        dask_dash: int = DASK_DASH,
+        dask_nanny: int = DASK_NANNY,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
+        image: str = HETZNER_IMAGE_UBUNTU,
+        ip_range: str = NETWORK_RANGE,
+        bootstrap: str = BOOTSTRAP_PROFILE,
+    ) -> List[NodeABC]:
+
+        assert dask_protocol in DASK_PROTOCOLS
+        assert bootstrap in BOOTSTRAP_PROFILES
+        assert len(networks) > 0
+
+        await self._check_servertypes(
+            [(pool.servertype, pool.datacenter, pool.workers)]
+        )
+
+        self._scheduler = scheduler
+        self._workers = workers.copy()
+        self._networks = networks.copy()
+        self._firewall = firewall
+        self._bootstrap = bootstrap
+        self._timeline = Timeline(fn=self._fn_timeline())
+
+        self._layout = Layout(
+            ip_range=ip_range,
+            networks=[network.ip_range for network in self._networks],
+            used=[
+                ip
+                for node in [self._scheduler, *self._workers]
+                for ip in node.private_ip4s
+            ],
         )
+        addresses = [self._layout.allocate() for _ in range(pool.workers)]
+        self._check_layout(dask_protocol)
+
+        self._log.info("Getting handle on ssh key ...")
+        self._ssh_key = await self._provider.get_ssh_key(f"{self._prefix:s}-key")
 
-        worker_tasks = [
+        used = {node.index for node in self._workers}
+        indices = []
+        index = 0
+        while len(indices) < pool.workers:
+            if index not in used:
+                indices.append(index)
+            index += 1
+
+        await self._create_networks()
+
+        self._log.info(
+            "Creating %d new worker(s) in pool %s ...", pool.workers, pool.name
+        )
+
+        tasks = [
             create_task(
-                self._create_node(
-                    suffix=f"worker{node:03d}",
-                    servertype=worker,
-                    datacenter=datacenter,
+                self._create_worker(
+                    index=index,
+                    pool=pool,
                     image=image,
-                    ip=f"10.0.1.{100+node:d}",
+                    address=address,
                 )
             )
-            for node in range(workers)
+            for index, address in zip(indices, addresses)
         ]
+        try:
+            new_workers = await self._gather_workers(tasks)
+            await self._start_workers(
+                new_workers,
+                scheduler=self._scheduler,
+                dask_ipc=dask_ipc,
+                dask_dash=dask_dash,
+                dask_nanny=dask_nanny,
+                dask_protocol=dask_protocol,
+                dask_private=dask_private,
+            )
+            await gather(*[self._set_stage(node, "started") for node in new_workers])
+        except Exception:  # no billed servers are left behind outside of the cluster
+            await self._delete_nodes(
+                [f"worker{index:0{WORKER_DIGITS:d}d}" for index in indices]
+            )
+            raise
 
-        self._scheduler = await scheduler_task
-        await self._scheduler.start_scheduler(dask_ipc=dask_ipc, dask_dash=dask_dash)
+        self._workers.extend(new_workers)
+        self._log.info("Successfully added %d new worker(s).", pool.workers)
 
-        self._workers = [await task for task in worker_tasks]
-        await gather(
-            *[
-                worker.start_worker(
-                    dask_ipc=dask_ipc,
-                    dask_dash=dask_dash,
-                    dask_nanny=dask_nanny,
-                    scheduler_ip4=self._scheduler.public_ip4,
-                )
-                for worker in self._workers
-            ]
-        )
-
-        self._log.info("Successfully created new cluster.")
+        return list(new_workers)
 
     @property
     def scheduler(self) -> NodeABC:
@@ -194,12 +462,37 @@ class Creator(CreatorABC):
         return self._workers.copy()
 
     @property
-    def network(self) -> BoundNetwork:
+    def graph(self) -> Optional[GraphABC]:
+
+        return self._graph
+
+    @property
+    def parameters(self) -> Dict[str, Any]:
+
+        return self._progress["parameters"].copy()  # recorded ones if resumed
+
+    @property
+    def pending(self) -> List[Task]:
+
+        return self._pending.copy()
+
+    @property
+    def timeline(self) -> TimelineABC:
 
-        return self._network
+        return self._timeline
 
     @property
-    def firewall(self) -> BoundFirewall:
+    def layout(self) -> LayoutABC:
+
+        return self._layout
+
+    @property
+    def networks(self) -> List[NetworkABC]:
+
+        return self._networks.copy()
+
+    @property
+    def firewall(self) -> ResourceABC:
 
         return self._firewall
 
@@ -208,56 +501,143 @@ class Creator(CreatorABC):
         dask_ipc: int,
         dask_dash: int,
         dask_nanny: int,
-    ) -> BoundFirewall:
+    ) -> ResourceABC:
+
+        firewall = (
+            await self._provider.get_firewall(f"{self._prefix:s}-firewall")
+            if self._resume
+            else None
+        )
+        if firewall is not None:
+            self._log.info("Reusing firewall ...")
+            return firewall
 
         self._log.info("Creating firewall ...")
 
-        _ = self._client.firewalls.create(
+        return await self._provider.create_firewall(
             name=f"{self._prefix:s}-firewall",
-            rules=[
-                FirewallRule(
-                    direction="in",
-                    protocol=protocol,
-                    source_ips=["0.0.0.0/0", "::/0"],
-                    destination_ips=[],
-                    port=port,
-                )
-                for protocol, port in (
-                    ("tcp", "22"),
-                    ("icmp", None),
-                    ("tcp", f"{dask_ipc:d}"),
-                    ("tcp", f"{dask_dash:d}"),
-                    ("tcp", f"{dask_nanny:d}"),
-                )
-            ],
+            ports=[22, dask_ipc, dask_dash, dask_nanny],
         )
 
-        self._log.info("Getting handle on firewall ...")
-
-        return self._client.firewalls.get_by_name(
-            name=f"{self._prefix:s}-firewall",
+    async def _check_servertypes(self, nodes: List[Tuple[str, str, int]]):
+
+        catalog = await self._provider.get_catalog()
+        if catalog is None:  # provider without server types
+            return
+
+        datacenters = [datacenter for _, datacenter, _ in nodes]
+        servertypes = [servertype for servertype, _, _ in nodes]
+        if not catalog.has(datacenters=datacenters, servertypes=servertypes):
+            catalog = await self._provider.get_catalog(ttl=0.0)  # possibly new
+
+        cores = {}
+        for servertype, datacenter, count in nodes:
+            specification = catalog.get_servertype(servertype, datacenter=datacenter)
+            if specification["deprecated"]:
+                self._log.warning("Server type %s is deprecated.", servertype)
+            architecture = specification["architecture"]
+            cores.setdefault(architecture, 0)
+            cores[architecture] += specification["cores"] * count
+
+        self._log.info(
+            "Server types available, %d node(s) with %s core(s).",
+            sum(count for _, _, count in nodes),
+            ", ".join(f"{count:d} {name:s}" for name, count in sorted(cores.items())),
         )
 
-    async def _create_network(self, ip_range: str) -> BoundNetwork:
+        self._catalog = catalog
 
-        self._log.info("Creating network ...")
+    def _check_layout(self, dask_protocol: str):
 
-        _ = self._client.networks.create(
-            name=f"{self._prefix:s}-network",
-            ip_range=ip_range,
-            subnets=[
-                NetworkSubnet(
-                    ip_range=ip_range,
-                    type="cloud",
-                    network_zone="eu-central",
+        if dask_protocol != "tls" and self._layout.networks > 1:
+            raise ValueError(
+                "workers spread across multiple private networks require dask_protocol tls"
+            )
+
+    async def _create_networks(self):
+
+        for index in range(len(self._networks), self._layout.networks):
+            self._networks.append(
+                await self._create_network(
+                    name=Layout.network_name(self._prefix, index),
+                    ip_range=self._layout.network_range(index),
                 )
-            ],
-        )
+            )
+
+    async def _create_network(self, name: str, ip_range: str) -> NetworkABC:
 
-        self._log.info("Getting handle on network ...")
+        self._log.info("Creating network %s ...", name)
 
-        return self._client.networks.get_by_name(
-            name=f"{self._prefix:s}-network",
+        return await self._provider.create_network(name=name, ip_range=ip_range)
+
+    def _add_node_steps(
+        self,
+        graph: GraphABC,
+        suffix: str,
+        node: Optional[NodeABC],
+        servertype: str,
+        datacenter: str,
+        image: str,
+        address: Optional[Tuple[int, str]],
+        labels: Dict[str, str],
+    ):
+
+        if node is not None:  # resuming
+            graph.add(f"{suffix:s}:bootstrap", lambda: self._reuse_node(node))
+            return
+
+        graph.add(
+            f"{suffix:s}:create",
+            lambda: self._create_server(
+                suffix=suffix,
+                servertype=servertype,
+                datacenter=datacenter,
+                image=image,
+                labels=labels,
+                ssh_key=graph.result("ssh_key"),
+                firewall=graph.result("firewall"),
+            ),
+            requires=["ssh_key", "firewall"],
+        )
+        graph.add(
+            f"{suffix:s}:attach",
+            lambda: self._attach_server(
+                graph.result(f"{suffix:s}:create"),
+                address=address,
+            ),
+            requires=[f"{suffix:s}:create", "networks"],
+        )
+        graph.add(
+            f"{suffix:s}:bootstrap",
+            lambda: self._bootstrap_node(graph.result(f"{suffix:s}:attach")),
+            requires=[f"{suffix:s}:attach", "certs"],
+        )
+
+    def _add_worker_start_step(
+        self,
+        graph: GraphABC,
+        suffix: str,
+        restart: bool,
+        dask_ipc: int,
+        dask_dash: int,
+        dask_nanny: int,
+        dask_protocol: str,
+        dask_private: int,
+    ) -> Task:
+
+        return graph.add(
+            f"{suffix:s}:start",
+            lambda: self._start_worker(
+                graph.result(f"{suffix:s}:bootstrap"),
+                scheduler=graph.result("scheduler:start"),
+                restart=restart,
+                dask_ipc=dask_ipc,
+                dask_dash=dask_dash,
+                dask_nanny=dask_nanny,
+                dask_protocol=dask_protocol,
+                dask_private=dask_private,
+            ),
+            requires=[f"{suffix:s}:bootstrap", "scheduler:start"],
         )
 
     async def _create_node(
@@ -266,103 +646,324 @@ class Creator(CreatorABC):
         servertype: str,
         datacenter: str,
         image: str,
-        ip: str,
+        address: Tuple[int, str],
         labels: Union[Dict[str, str], None] = None,
     ) -> NodeABC:
 
+        server = await self._create_server(
+            suffix=suffix,
+            servertype=servertype,
+            datacenter=datacenter,
+            image=image,
+            labels=labels,
+            ssh_key=self._ssh_key,
+            firewall=self._firewall,
+        )
+        node = await self._attach_server(server, address=address)
+
+        return await self._bootstrap_node(node)
+
+    async def _create_server(
+        self,
+        suffix: str,
+        servertype: str,
+        datacenter: str,
+        image: str,
+        labels: Union[Dict[str, str], None],
+        ssh_key: ResourceABC,
+        firewall: ResourceABC,
+    ) -> InstanceABC:
+
         name = f"{self._prefix:s}-node-{suffix:s}"
 
         self._log.info("Creating node %s ...", name)
 
-        _ = self._client.servers.create(
-            name=name,
-            server_type=ServerType(name=servertype),
-            image=Image(name=image),
-            datacenter=Datacenter(name=datacenter),
-            ssh_keys=[self._ssh_key],
-            firewalls=[self._firewall],
-            labels=labels,
-        )
+        labels = {} if labels is None else labels.copy()
+        labels["stage"] = "created"
+        # selector for discovery and role of node, see Cluster.from_existing
+        labels["cluster"] = self._prefix
+        labels["role"] = "scheduler" if suffix == "scheduler" else "worker"
+        if self._catalog is not None:  # nodes of mixed clusters differ
+            specification = self._catalog.get_servertype(servertype, datacenter)
+            labels["architecture"] = specification["architecture"]
+
+        with self._timeline.span(suffix, "api_create", servertype=servertype):
+            await self._provider.create_server(
+                name=name,
+                servertype=servertype,
+                image=image,
+                datacenter=datacenter,
+                labels=labels,
+                ssh_key=ssh_key,
+                firewall=firewall,
+            )
+        self._record(suffix, "created")
 
         self._log.info("Waiting for node %s to become available ...", name)
 
-        while True:
-            server = self._client.servers.get_by_name(name=name)
-            if server.status == Server.STATUS_RUNNING:
-                break
-            await sleep(self._wait)
+        with self._timeline.span(suffix, "running_wait"):
+            return await self._provider.wait_for_server(name, wait=self._wait)
+
+    async def _attach_server(
+        self,
+        server: InstanceABC,
+        address: Tuple[int, str],
+    ) -> NodeABC:
 
-        self._log.info("Attaching network to node %s ...", name)
+        self._log.info("Attaching network to node %s ...", server.name)
 
-        server.attach_to_network(
-            network=self._network,
-            ip=ip,
-        )
+        network, ip = address
+        suffix = server.name.split("-node-")[1]
 
-        self._log.info("Bootstrapping node %s ...", name)
+        with self._timeline.span(suffix, "attach"):
+            server = await self._provider.attach_server(
+                server,
+                network=self._networks[network],
+                ip=ip,
+            )
 
-        node = await Node.from_async(
+        return await Node.from_async(
             server=server,
-            client=self._client,
+            provider=self._provider,
             fn_private=self._fn_private,
             prefix=self._prefix,
             wait=self._wait,
             log=self._log,
+            timeline=self._timeline,
         )
 
-        await node.bootstrap()  # TODO param?
+    async def _bootstrap_node(self, node: NodeABC) -> NodeABC:
+
+        self._log.info("Bootstrapping node %s ...", node.name)
+
+        await node.bootstrap(profile=self._bootstrap)
         await node.update()
+        await self._set_stage(node, "bootstrapped")
 
         return node
 
-    async def _create_ssh_key(self) -> BoundSSHKey:
+    async def _timed(self, phase: str, coro: Awaitable) -> Any:
 
-        self._log.info("Creating ssh key ...")
+        with self._timeline.span("cluster", phase):
+            return await coro
+
+    async def _reuse_node(self, node: NodeABC) -> NodeABC:
+
+        return node
+
+    async def _create_worker(
+        self,
+        index: int,
+        pool: PoolABC,
+        image: str,
+        address: Tuple[int, str],
+    ) -> NodeABC:
+
+        assert 0 <= index < 10 ** WORKER_DIGITS
+
+        return await self._create_node(
+            suffix=f"worker{index:0{WORKER_DIGITS:d}d}",
+            servertype=pool.servertype,
+            datacenter=pool.datacenter,
+            image=image,
+            address=address,
+            labels=pool.labels,
+        )
+
+    async def _start_scheduler(
+        self,
+        node: NodeABC,
+        dask_ipc: int,
+        dask_dash: int,
+        dask_protocol: str,
+        dask_private: int,
+    ) -> NodeABC:
+
+        if node.stage != "started":
+            await node.start_scheduler(
+                dask_ipc=dask_ipc,
+                dask_dash=dask_dash,
+                dask_protocol=dask_protocol,
+                dask_private=dask_private,
+            )
+            await self._set_stage(node, "started")
+
+        return node
+
+    async def _start_worker(
+        self,
+        node: NodeABC,
+        scheduler: NodeABC,
+        restart: bool,
+        dask_ipc: int,
+        dask_dash: int,
+        dask_nanny: int,
+        dask_protocol: str,
+        dask_private: int,
+    ) -> NodeABC:
+
+        if restart or node.stage != "started":
+            await self._start_workers(
+                [node],
+                scheduler=scheduler,
+                dask_ipc=dask_ipc,
+                dask_dash=dask_dash,
+                dask_nanny=dask_nanny,
+                dask_protocol=dask_protocol,
+                dask_private=dask_private,
+            )
+            await self._set_stage(node, "started")
+
+        return node
+
+    async def _wait_for_workers(self, tasks: List[Task], minimum: int) -> List[Task]:
+
+        pending = set(tasks)
+        failures = []
+
+        while len(self._workers) < minimum:
+
+            done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+
+            for task in done:
+                if task.exception() is None:
+                    self._workers.append(task.result())
+                else:
+                    self._log.error("Provisioning worker failed: %s", task.exception())
+                    failures.append(task.exception())
+
+            if len(self._workers) + len(pending) < minimum:
+                for task in pending:
+                    task.cancel()
+                raise failures[0]
+
+        self._workers.sort(key=lambda node: node.index)
+
+        return [task for task in tasks if task in pending]  # keep order
+
+    async def _gather_workers(self, tasks: List[Task]) -> List[NodeABC]:
+
+        try:
+            await wait(tasks, return_when=FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()  # no effect on finished tasks
+            await gather(*tasks, return_exceptions=True)
+
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                self._log.error("Provisioning worker failed: %s", task.exception())
+                raise task.exception()
+
+        return [task.result() for task in tasks]
+
+    async def _delete_nodes(self, suffixes: List[str]):
+
+        names = [f"{self._prefix:s}-node-{suffix:s}" for suffix in suffixes]
+        servers = [
+            server
+            for server in await self._provider.get_servers()
+            if server.name in names
+        ]
+
+        for server in servers:
+            self._log.info("Deleting incomplete node %s ...", server.name)
+        await gather(
+            *[self._provider.delete_server(server, wait=True) for server in servers]
+        )
+
+    async def _start_workers(
+        self,
+        workers: List[NodeABC],
+        scheduler: NodeABC,
+        dask_ipc: int,
+        dask_dash: int,
+        dask_nanny: int,
+        dask_protocol: str,
+        dask_private: int,
+    ):
+
+        await gather(
+            *[
+                worker.start_worker(
+                    dask_ipc=dask_ipc,
+                    dask_dash=dask_dash,
+                    dask_nanny=dask_nanny,
+                    scheduler_ip4=scheduler.public_ip4
+                    if dask_protocol == "tls"
+                    else scheduler.private_ip4,
+                    dask_protocol=dask_protocol,
+                    dask_private=dask_private,
+                )
+                for worker in workers
+            ]
+        )
+
+    async def _create_ssh_key(self, key_type: str) -> ResourceABC:
+
+        ssh_key = (
+            await self._provider.get_ssh_key(f"{self._prefix:s}-key")
+            if self._resume
+            else None
+        )
+        if ssh_key is not None:
+            if os.path.exists(self._fn_private) and os.path.exists(self._fn_public):
+                self._log.info("Reusing ssh key ...")
+                return ssh_key
+            self._log.info("Deleting incomplete ssh key ...")
+            await self._provider.delete_ssh_key(ssh_key)
+
+        for fn in (self._fn_private, self._fn_public):  # incomplete, if resuming
+            if os.path.exists(fn) and self._resume:
+                os.unlink(fn)
 
         if os.path.exists(self._fn_private):
             raise SystemError("ssh private key file already exists")
         if os.path.exists(self._fn_public):
             raise SystemError("ssh public key file already exists")
 
-        _, _ = await Command.from_list(
-            [
-                "ssh-keygen",
-                "-f",
-                self._fn_private,  # path to file
-                "-P",
-                "",  # no password
-                "-t",
-                "rsa",  # RSA
-                "-b",
-                "4096",  # bits for RSA
-                "-C",
-                f"{self._prefix:s}-key",  # comment
-            ]
-        ).run(wait=self._wait)
+        self._log.info("Creating ssh key ...")
+
+        await create_ssh_key(
+            fn_private=self._fn_private,
+            fn_public=self._fn_public,
+            comment=f"{self._prefix:s}-key",
+            key_type=key_type,
+        )
 
         self._log.info("Uploading ssh key ...")
 
         with open(self._fn_public, "r", encoding="utf-8") as f:
             public = f.read()
 
-        _ = self._client.ssh_keys.create(
+        return await self._provider.create_ssh_key(
             name=f"{self._prefix:s}-key",
             public_key=public,
         )
 
-        self._log.info("Getting handle on ssh key ...")
-
-        return self._client.ssh_keys.get_by_name(
-            name=f"{self._prefix:s}-key",
-        )
-
-    @typechecked
-    async def _create_certs(self) -> None:
+    async def _create_certs(self, key_type: str) -> None:
+
+        if self._resume and all(os.path.exists(fn) for fn in self._fn_certs()):
+            self._log.info("Reusing ssl certificates ...")
+            return
+
+        if self._ca_store is not None:
+            self._log.info("Issuing ssl certificates from store ...")
+            await CAStore(
+                path=self._ca_store,
+                key_type=key_type,
+                log=self._log,
+            ).export(
+                prefix=self._prefix,
+                path=os.path.join(os.getcwd(), f".{self._prefix:s}"),
+            )
+            return
 
         self._log.info("Creating ssl certificates ...")
 
         ca_key, ca_cert = await create_ca(
             prefix=self._prefix,
+            key_type=key_type,
         )
         await write_certs(
             ca_key,
@@ -374,6 +975,7 @@ class Creator(CreatorABC):
             ca_key=ca_key,
             ca_cert=ca_cert,
             prefix=self._prefix,
+            key_type=key_type,
         )
         await write_certs(
             ca_key,
@@ -381,10 +983,106 @@ class Creator(CreatorABC):
             name=os.path.join(f".{self._prefix:s}", "cert"),
         )
 
+    def _fn_certs(self) -> List[str]:
+
+        return [
+            os.path.join(f".{self._prefix:s}", suffix)
+            for suffix in ("ca.pub", "cert", "cert.pub")
+            + (("ca",) if self._ca_store is None else ())  # CA key stays in store
+        ]
+
+    def _fn_timeline(self) -> str:
+
+        return os.path.join(f".{self._prefix:s}", "timeline.jsonl")
+
+    def _fn_progress(self) -> str:
+
+        return os.path.join(f".{self._prefix:s}", "progress.json")
+
+    def _read_progress(self) -> Optional[Dict[str, Any]]:
+
+        if not os.path.exists(self._fn_progress()):
+            return None
+
+        with open(self._fn_progress(), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_progress(self):
+
+        with open(f"{self._fn_progress():s}.tmp", "w", encoding="utf-8") as f:
+            json.dump(self._progress, f, indent=4, sort_keys=True)
+        os.replace(f"{self._fn_progress():s}.tmp", self._fn_progress())
+
+    def _record(self, suffix: str, stage: str):
+
+        if self._progress is None:  # not creating a new cluster
+            return
+
+        self._progress["nodes"][suffix] = stage
+        self._write_progress()
+
+    async def _set_stage(self, node: NodeABC, stage: str):
+
+        await node.set_label("stage", stage)
+        self._record(node.suffix, stage)
+
+    async def _find_nodes(self, suffixes: List[str]) -> Dict[str, NodeABC]:
+
+        reusable = all(
+            os.path.exists(fn)
+            for fn in (self._fn_private, self._fn_public, *self._fn_certs())
+        ) and (await self._provider.get_ssh_key(f"{self._prefix:s}-key") is not None)
+        servers = {
+            server.name: server
+            for server in await self._provider.get_servers()
+            if server.name.startswith(f"{self._prefix:s}-node-")
+        }
+
+        nodes = {}
+        for suffix in suffixes:
+            server = servers.get(f"{self._prefix:s}-node-{suffix:s}")
+            if server is None:
+                continue
+            if (
+                reusable
+                and server.labels.get("stage") in ("bootstrapped", "started")
+                and server.running
+                and len(server.private_ip4s) > 0
+            ):
+                self._log.info("Reusing node %s ...", server.name)
+                nodes[suffix] = Node(
+                    server=server,
+                    provider=self._provider,
+                    fn_private=self._fn_private,
+                    prefix=self._prefix,
+                    wait=self._wait,
+                    log=self._log,
+                    timeline=self._timeline,
+                )
+                continue
+            self._log.info("Deleting incomplete node %s ...", server.name)
+            await self._provider.delete_server(server, wait=True)
+
+        return nodes
+
+    async def _find_networks(self) -> List[NetworkABC]:
+
+        networks = {
+            Layout.network_index(self._prefix, network.name): network
+            for network in await self._provider.get_networks()
+        }
+
+        found = []
+        while len(found) in networks.keys():  # consecutive indices only
+            self._log.info("Reusing network %s ...", networks[len(found)].name)
+            found.append(networks[len(found)])
+
+        return found
+
     @classmethod
     async def from_async(
         cls,
-        client: Client,
+        provider: ProviderABC,
         prefix: str,
         fn_public: str,
         fn_private: str,
@@ -393,15 +1091,25 @@ class Creator(CreatorABC):
         dask_ipc: int = DASK_IPC,
         dask_dash: int = DASK_DASH,
         dask_nanny: int = DASK_NANNY,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
         scheduler: str = HETZNER_INSTANCE_TINY,
         worker: str = HETZNER_INSTANCE_TINY,
         image: str = HETZNER_IMAGE_UBUNTU,
         datacenter: str = HETZNER_DATACENTER,
         workers: int = WORKERS,
+        pools: Optional[List[PoolABC]] = None,
+        ip_range: str = NETWORK_RANGE,
+        min_workers: Optional[int] = None,
+        resume: bool = False,
+        ssh_key_type: str = SSH_KEY_TYPE,
+        tls_key_type: str = TLS_KEY_TYPE,
+        ca_store: Optional[str] = None,
+        bootstrap: str = BOOTSTRAP_PROFILE,
     ) -> CreatorABC:
 
         obj = cls(
-            client=client,
+            provider=provider,
             prefix=prefix,
             fn_public=fn_public,
             fn_private=fn_private,
@@ -413,11 +1121,21 @@ class Creator(CreatorABC):
             dask_ipc=dask_ipc,
             dask_dash=dask_dash,
             dask_nanny=dask_nanny,
+            dask_protocol=dask_protocol,
+            dask_private=dask_private,
             scheduler=scheduler,
             worker=worker,
             image=image,
             datacenter=datacenter,
             workers=workers,
+            pools=pools,
+            ip_range=ip_range,
+            min_workers=min_workers,
+            resume=resume,
+            ssh_key_type=ssh_key_type,
+            tls_key_type=tls_key_type,
+            ca_store=ca_store,
+            bootstrap=bootstrap,
         )
 
         return obj
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/dag.py: Dependency graph of asynchronous steps
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import create_task, wait, Task
+from logging import getLogger, Logger
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from tabulate import tabulate
+
+from .abc import GraphABC, StepABC
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Step(StepABC):
+    """
+    A single step within a :class:`scherbelberg.Graph`. Mutable.
+
+    Args:
+        name : Unique name of step.
+        func : Coroutine function without arguments, doing the actual work.
+        requires : Names of steps which must be completed before this step can start.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        requires: Optional[List[str]] = None,
+    ):
+
+        self._name = name
+        self._func = func
+        self._requires = [] if requires is None else requires.copy()
+
+        self._start = None
+        self._stop = None
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<Step name={self._name:s} requires={len(self._requires):d} done={str(self.done):s}>"
+
+    async def run(self, origin: float) -> Any:
+        """
+        Runs the step and records its start and stop times.
+
+        Args:
+            origin : Reference time, i.e. start of graph, see ``time.perf_counter``.
+        Returns:
+            Return value of ``func``.
+        """
+
+        self._start = perf_counter() - origin
+        result = await self._func()
+        self._stop = perf_counter() - origin
+
+        return result
+
+    @property
+    def done(self) -> bool:
+        """
+        Has the step been completed?
+        """
+
+        return self._stop is not None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Duration of step in seconds if completed
+        """
+
+        if not self.done:
+            return None
+
+        return self._stop - self._start
+
+    @property
+    def name(self) -> str:
+        """
+        Name of step
+        """
+
+        return self._name
+
+    @property
+    def requires(self) -> List[str]:
+        """
+        Names of steps which must be completed before this step can start
+        """
+
+        return self._requires.copy()
+
+    @property
+    def start(self) -> Optional[float]:
+        """
+        Start time of step in seconds relative to start of graph if started
+        """
+
+        return self._start
+
+    @property
+    def stop(self) -> Optional[float]:
+        """
+        Stop time of step in seconds relative to start of graph if completed
+        """
+
+        return self._stop
+
+
+@typechecked
+class Graph(GraphABC):
+    """
+    Directed acyclic graph of asynchronous steps. Mutable.
+    Steps start as soon as they are added and all steps they require are completed, i.e. independent steps run concurrently.
+    If a step fails, all steps requiring it fail with the same exception.
+
+    Args:
+        log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
+    """
+
+    def __init__(self, log: Union[Logger, None] = None):
+
+        self._log = getLogger(name="scherbelberg") if log is None else log
+
+        self._origin = perf_counter()
+        self._steps = {}
+        self._tasks = {}
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        done = sum(step.done for step in self._steps.values())
+
+        return f"<Graph steps={len(self._steps):d} done={done:d}>"
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        requires: Optional[List[str]] = None,
+    ) -> Task:
+        """
+        Adds a step to the graph and schedules it.
+        Required steps must have been added before, which guarantees that the graph remains acyclic.
+
+        Args:
+            name : Unique name of step.
+            func : Coroutine function without arguments, doing the actual work. Results of required steps are available via :meth:`scherbelberg.Graph.result`.
+            requires : Names of steps which must be completed before this step can start.
+        Returns:
+            Task running the step.
+        """
+
+        assert name not in self._steps.keys()
+
+        step = Step(name=name, func=func, requires=requires)
+        assert all(required in self._steps.keys() for required in step.requires)
+
+        self._steps[name] = step
+        self._tasks[name] = create_task(self._run(step))
+
+        return self._tasks[name]
+
+    def cancel(self):
+        """
+        Cancels all unfinished steps.
+        """
+
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+    async def join(self):
+        """
+        Waits until all steps are done, failed or cancelled, e.g. after :meth:`scherbelberg.Graph.cancel`.
+        """
+
+        tasks = list(self._tasks.values())
+        if len(tasks) > 0:
+            await wait(tasks)
+
+        for task in tasks:
+            if not task.cancelled():
+                _ = task.exception()  # failures are the caller's to report
+
+    def critical_path(self) -> List[StepABC]:
+        """
+        Determines the critical path, i.e. the chain of steps which determined the total run time.
+        Starting from the last completed step, the required step which completed last is followed backwards.
+
+        Returns:
+            Steps along the critical path in order of execution.
+        """
+
+        done = [step for step in self._steps.values() if step.done]
+        if len(done) == 0:
+            return []
+
+        path = [max(done, key=lambda step: step.stop)]
+        while len(path[-1].requires) > 0:
+            path.append(
+                max(
+                    (self._steps[name] for name in path[-1].requires),
+                    key=lambda step: step.stop,
+                )
+            )
+
+        return path[::-1]
+
+    def report(self) -> str:
+        """
+        Renders the critical path as a table.
+
+        Returns:
+            Table with start time, duration and share of total run time of every step along the critical path.
+        """
+
+        path = self.critical_path()
+        if len(path) == 0:
+            return ""
+
+        total = path[-1].stop
+
+        return tabulate(
+            [
+                (
+                    step.name,
+                    f"{step.start:0.02f}",
+                    f"{step.duration:0.02f}",
+                    f"{100 * step.duration / total:0.01f}" if total > 0 else "-",
+                )
+                for step in path
+            ],
+            headers=("critical path", "start [s]", "duration [s]", "share [%]"),
+            tablefmt="github",
+            disable_numparse=True,
+        )
+
+    def result(self, name: str) -> Any:
+        """
+        Result of a completed step.
+
+        Args:
+            name : Name of step.
+        Returns:
+            Return value of the step's ``func``.
+        """
+
+        return self._tasks[name].result()
+
+    def task(self, name: str) -> Task:
+        """
+        Task running a step.
+
+        Args:
+            name : Name of step.
+        Returns:
+            Task.
+        """
+
+        return self._tasks[name]
+
+    async def _run(self, step: StepABC) -> Any:
+
+        required = [self._tasks[name] for name in step.requires]
+        if len(required) > 0:
+            await wait(required)  # unlike gather, cancellation does not propagate
+        for task in required:
+            _ = task.result()  # raises if required step failed
+
+        self._log.debug("Starting step %s ...", step.name)
+        result = await step.run(self._origin)
+        self._log.debug("Step %s done after %0.02f s.", step.name, step.duration)
+
+        return result
+
+    @property
+    def steps(self) -> Dict[str, StepABC]:
+        """
+        All steps of the graph by name
+        """
+
+        return self._steps.copy()
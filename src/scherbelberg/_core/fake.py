@@ -0,0 +1,1451 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/fake.py: Offline stand-ins for cloud API and SSH
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import sleep
+from base64 import b64decode
+from collections import Counter
+from datetime import datetime, timezone
+from hashlib import md5
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import islice
+from ipaddress import IPv4Address, ip_address, ip_network
+import json
+from logging import getLogger
+from math import ceil
+from random import Random
+from threading import RLock, Thread
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from hcloud import Client
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .abc import BackendABC, CommandABC, FakeCloudABC, FakeServerABC
+from .command import Command
+from .const import APIVAR, HETZNER_API, HETZNER_DATACENTER, HETZNER_FAKE_API, WAIT
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_LOCATIONS = {  # name: description, country, city, latitude, longitude, network zone, price factor
+    "fsn1": (
+        "Falkenstein DC Park 1",
+        "DE",
+        "Falkenstein",
+        50.47612,
+        12.370071,
+        "eu-central",
+        1.0,
+    ),
+    "nbg1": (
+        "Nuremberg DC Park 1",
+        "DE",
+        "Nuremberg",
+        49.452102,
+        11.076665,
+        "eu-central",
+        1.0,
+    ),
+    "hel1": (
+        "Helsinki DC Park 1",
+        "FI",
+        "Helsinki",
+        60.169855,
+        24.938379,
+        "eu-central",
+        1.0,
+    ),
+    "ash": ("Ashburn, VA", "US", "Ashburn, VA", 39.045821, -77.487073, "us-east", 1.2),
+}
+_DATACENTERS = {  # name: location
+    "fsn1-dc14": "fsn1",
+    "nbg1-dc3": "nbg1",
+    "hel1-dc2": "hel1",
+    "ash-dc1": "ash",
+}
+_SERVER_TYPES = {  # name: cores, memory (GB), disk (GB), cpu type, architecture, net price per hour (EUR)
+    "cx11": (1, 2.0, 20, "shared", "x86", 0.0052),
+    "cx21": (2, 4.0, 40, "shared", "x86", 0.0095),
+    "cx31": (2, 8.0, 80, "shared", "x86", 0.0170),
+    "cx41": (4, 16.0, 160, "shared", "x86", 0.0312),
+    "cpx11": (2, 2.0, 40, "shared", "x86", 0.0071),
+    "cpx31": (4, 8.0, 160, "shared", "x86", 0.0236),
+    "ccx12": (2, 8.0, 80, "dedicated", "x86", 0.0381),
+    "cax11": (2, 4.0, 40, "shared", "arm", 0.0062),
+    "cax21": (4, 8.0, 80, "shared", "arm", 0.0110),
+}
+_IMAGES = {  # name: version, description
+    "ubuntu-20.04": ("20.04", "Ubuntu 20.04"),
+    "ubuntu-22.04": ("22.04", "Ubuntu 22.04"),
+}
+_ARCHITECTURES = ("x86", "arm")
+_SINGULAR = {
+    "servers": "server",
+    "networks": "network",
+    "firewalls": "firewall",
+    "ssh_keys": "ssh_key",
+    "datacenters": "datacenter",
+    "locations": "location",
+    "server_types": "server_type",
+    "images": "image",
+}
+_PUBLIC = IPv4Address("100.64.0.0")  # shared address space, never routed
+_PER_PAGE = 25
+_PER_PAGE_MAX = 50
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class FakeCloud(FakeCloudABC):
+    """
+    In-memory stand-in for the Hetzner Cloud API, for benchmarking and testing without an account or network access. Mutable.
+    It serves servers, networks, firewalls, SSH keys and actions plus a static catalog of data centers, locations, server types and images.
+    A regular ``hcloud.Client`` talks to it through its transport layer, see :meth:`scherbelberg.FakeCloud.client`, so the client library's pagination, error handling and retries are exercised as usual.
+
+    Args:
+        latency : Time in seconds each request blocks the caller, i.e. the round trip to the actual API.
+        boot : Time in seconds until a newly created server is running and reachable via SSH.
+        reboot : Time in seconds a server is unreachable after a reboot.
+        failure : Probability of a server creation being rejected with ``resource_unavailable``.
+        rate_limit : Sustained number of requests per second. Exceeding requests are rejected with ``rate_limit_exceeded``. ``None`` disables rate limiting.
+        burst : Number of requests which can be sent at once before the rate limit applies.
+        seed : Seed for random failures.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        boot: float = 0.0,
+        reboot: float = 0.0,
+        failure: float = 0.0,
+        rate_limit: Optional[float] = None,
+        burst: int = 3600,
+        seed: Optional[int] = None,
+    ):
+
+        assert latency >= 0.0
+        assert boot >= 0.0
+        assert reboot >= 0.0
+        assert 0.0 <= failure <= 1.0
+        assert rate_limit is None or rate_limit > 0.0
+        assert burst > 0
+
+        self._latency = latency
+        self._boot = boot
+        self._reboot = reboot
+        self._failure = failure
+        self._rate_limit = rate_limit
+        self._burst = burst
+
+        self._random = Random(seed)
+        self._lock = RLock()  # requests may arrive from multiple threads
+
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+
+        self._id = 0
+        self._resources = {
+            "servers": {},
+            "networks": {},
+            "firewalls": {},
+            "ssh_keys": {},
+        }
+        self._actions = {}
+        self._addresses = {}  # public IPv4 address: server id
+        self._requests = Counter()
+
+        self._catalog = self._build_catalog()
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<FakeCloud servers={len(self._resources['servers']):d}>"
+
+    def client(self, poll_interval: float = WAIT) -> Client:
+        """
+        Creates a cloud API client connected to this fake cloud.
+
+        Args:
+            poll_interval : Time in seconds between polls of the client when waiting for actions to finish.
+        Returns:
+            Regular ``hcloud.Client`` object.
+        """
+
+        client = Client(
+            token="fake",
+            api_endpoint=HETZNER_FAKE_API,
+            poll_interval=poll_interval,
+        )
+
+        session = getattr(client, "_requests_session", None)  # hcloud < 2
+        if session is None:
+            session = client._client._session  # hcloud >= 2
+        session.mount(HETZNER_FAKE_API, FakeAdapter(self))
+
+        return client
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Union[str, List[str]]]] = None,
+        body: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, Dict[str, str], Optional[Dict[str, Any]]]:
+        """
+        Handles one API request.
+
+        Args:
+            method : HTTP method.
+            path : Path relative to the root of the API, e.g. ``/servers/42``.
+            params : Query parameters.
+            body : Decoded JSON body.
+        Returns:
+            HTTP status code, response headers and JSON payload, which is ``None`` for empty responses.
+        """
+
+        method = method.upper()
+        segments = [segment for segment in path.split("?")[0].split("/") if segment]
+        params = {
+            key: value if isinstance(value, list) else [value]
+            for key, value in ({} if params is None else params).items()
+        }
+        body = {} if body is None else body
+
+        if self._latency > 0.0:
+            time.sleep(self._latency)  # blocks, like the synchronous client
+
+        with self._lock:
+
+            self._requests[self._endpoint(method, segments)] += 1
+
+            allowed, headers = self._throttle()
+            if not allowed:
+                status, payload = self._error(
+                    429, "rate_limit_exceeded", "limit of requests per hour reached"
+                )
+            else:
+                status, payload = self._dispatch(method, segments, params, body)
+
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+
+        return status, headers, payload
+
+    def reachable(self, ip: str) -> bool:
+        """
+        Is a server with the given public IPv4 address booted and not rebooting, i.e. reachable via SSH?
+
+        Args:
+            ip : Public IPv4 address.
+        Returns:
+            Reachability.
+        """
+
+        with self._lock:
+            server = self._resources["servers"].get(self._addresses.get(ip))
+            if server is None:
+                return False
+            now = time.monotonic()
+            return server["ready"] <= now and server["down"] <= now
+
+    @property
+    def requests(self) -> Dict[str, int]:
+        """
+        Number of requests per endpoint so far, e.g. ``GET /servers``
+        """
+
+        with self._lock:
+            return dict(self._requests)
+
+    @property
+    def servers(self) -> int:
+        """
+        Number of existing servers
+        """
+
+        return len(self._resources["servers"])
+
+    def _dispatch(
+        self,
+        method: str,
+        segments: List[str],
+        params: Dict[str, List[str]],
+        body: Dict[str, Any],
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+
+        if len(segments) == 0:
+            return self._error(404, "not_found", "not found")
+
+        kind = segments[0]
+
+        if method == "GET" and len(segments) == 2 and kind == "actions":
+            return self._get_action(segments[1])
+        if method == "GET" and len(segments) == 3 and segments[1] == "actions":
+            return self._get_action(segments[2])
+
+        if kind in self._catalog.keys() and method == "GET":
+            if len(segments) == 1:
+                return self._list(kind, list(self._catalog[kind].values()), params)
+            if len(segments) == 2:
+                item = self._catalog[kind].get(self._int(segments[1]))
+                if item is None:
+                    return self._error(
+                        404, "not_found", f"{_SINGULAR[kind]:s} not found"
+                    )
+                return 200, {_SINGULAR[kind]: item}
+
+        if kind not in self._resources.keys():
+            return self._error(404, "not_found", "not found")
+
+        if len(segments) == 1 and method == "GET":
+            return self._list(kind, list(self._resources[kind].values()), params)
+        if len(segments) == 1 and method == "POST":
+            return {
+                "servers": self._create_server,
+                "networks": self._create_network,
+                "firewalls": self._create_firewall,
+                "ssh_keys": self._create_ssh_key,
+            }[kind](body)
+
+        item = (
+            self._resources[kind].get(self._int(segments[1]))
+            if len(segments) > 1
+            else None
+        )
+        if item is None:
+            return self._error(404, "not_found", f"{_SINGULAR[kind]:s} not found")
+
+        if len(segments) == 2 and method == "GET":
+            return 200, {_SINGULAR[kind]: self._render(kind, item)}
+        if len(segments) == 2 and method == "PUT":
+            return self._update(kind, item, body)
+        if len(segments) == 2 and method == "DELETE":
+            return self._delete(kind, item)
+        if (
+            len(segments) == 4
+            and method == "POST"
+            and kind == "servers"
+            and segments[2] == "actions"
+        ):
+            return self._server_action(item, segments[3], body)
+        if (
+            len(segments) == 4
+            and method == "POST"
+            and kind == "firewalls"
+            and segments[2] == "actions"
+        ):
+            return self._firewall_action(item, segments[3], body)
+
+        return self._error(404, "not_found", "not found")
+
+    def _list(
+        self,
+        kind: str,
+        items: List[Dict[str, Any]],
+        params: Dict[str, List[str]],
+    ) -> Tuple[int, Dict[str, Any]]:
+
+        for name in params.get("name", []):
+            items = [item for item in items if item["name"] == name]
+        for selector in params.get("label_selector", []):
+            items = [item for item in items if self._selected(item, selector)]
+        if kind == "servers" and "status" in params.keys():
+            items = [item for item in items if self._status(item) in params["status"]]
+        for architecture in params.get("architecture", []):
+            items = [item for item in items if item["architecture"] == architecture]
+
+        try:
+            page = max(1, int(params.get("page", ["1"])[0]))
+            per_page = min(
+                _PER_PAGE_MAX,
+                max(1, int(params.get("per_page", [str(_PER_PAGE)])[0])),
+            )
+        except ValueError:
+            return self._error(400, "invalid_input", "invalid pagination")
+
+        total = len(items)
+        last = max(1, ceil(total / per_page))
+        items = items[(page - 1) * per_page : page * per_page]
+
+        return 200, {
+            kind: [
+                self._render(kind, item) if kind in self._resources.keys() else item
+                for item in items
+            ],
+            "meta": {
+                "pagination": {
+                    "page": page,
+                    "per_page": per_page,
+                    "previous_page": page - 1 if page > 1 else None,
+                    "next_page": page + 1 if page < last else None,
+                    "last_page": last,
+                    "total_entries": total,
+                }
+            },
+        }
+
+    def _create_server(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+
+        name = body.get("name")
+        if not isinstance(name, str) or len(name) == 0:
+            return self._error(422, "invalid_input", "invalid name")
+        if self._by_name("servers", name) is not None:
+            return self._error(409, "uniqueness_error", "server name is already used")
+
+        servertype = self._lookup("server_types", body.get("server_type"))
+        if servertype is None:
+            return self._error(422, "invalid_input", "unknown server type")
+
+        if body.get("datacenter") is not None:
+            datacenter = self._lookup("datacenters", body["datacenter"])
+        elif body.get("location") is not None:
+            location = self._lookup("locations", body["location"])
+            datacenter = (
+                None
+                if location is None
+                else next(
+                    item
+                    for item in self._catalog["datacenters"].values()
+                    if item["location"]["name"] == location["name"]
+                )
+            )
+        else:
+            datacenter = self._lookup("datacenters", HETZNER_DATACENTER)
+        if datacenter is None:
+            return self._error(422, "invalid_input", "unknown location")
+
+        image = next(
+            (
+                item
+                for item in self._catalog["images"].values()
+                if body.get("image") in (item["name"], item["id"])
+                and item["architecture"] == servertype["architecture"]
+            ),
+            None,
+        )
+        if image is None:
+            return self._error(422, "invalid_input", "unknown image")
+
+        ssh_keys = [
+            self._resources["ssh_keys"].get(key) or self._by_name("ssh_keys", key)
+            for key in body.get("ssh_keys", [])
+        ]
+        if any(key is None for key in ssh_keys):
+            return self._error(422, "invalid_input", "unknown ssh key")
+        firewalls = [rule.get("firewall") for rule in body.get("firewalls", [])]
+        if any(fid not in self._resources["firewalls"].keys() for fid in firewalls):
+            return self._error(422, "invalid_input", "unknown firewall")
+        networks = body.get("networks", [])
+        if any(nid not in self._resources["networks"].keys() for nid in networks):
+            return self._error(422, "invalid_input", "unknown network")
+
+        if self._random.random() < self._failure:
+            return self._error(
+                412,
+                "resource_unavailable",
+                f"{servertype['name']:s} is unavailable in {datacenter['name']:s}",
+            )
+
+        now = time.monotonic()
+        server = {
+            "id": self._next_id(),
+            "name": name,
+            "created": self._now(),
+            "labels": dict(body.get("labels") or {}),
+            "server_type": servertype,
+            "datacenter": datacenter,
+            "image": image,
+            "ssh_keys": [key["id"] for key in ssh_keys],
+            "firewalls": firewalls,
+            "private_net": [],
+            "ready": now + self._boot,
+            "down": 0.0,
+        }
+        server["ip4"] = str(_PUBLIC + server["id"])
+        self._resources["servers"][server["id"]] = server
+        self._addresses[server["ip4"]] = server["id"]
+
+        for nid in networks:
+            self._attach(server, self._resources["networks"][nid], None)
+
+        return 201, {
+            "server": self._render("servers", server),
+            "action": self._action("create_server", server, self._boot),
+            "next_actions": [],
+            "root_password": None,
+        }
+
+    def _create_network(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+
+        name = body.get("name")
+        if not isinstance(name, str) or len(name) == 0:
+            return self._error(422, "invalid_input", "invalid name")
+        if self._by_name("networks", name) is not None:
+            return self._error(409, "uniqueness_error", "network name is already used")
+
+        try:
+            ip_range = ip_network(body.get("ip_range"))
+            subnets = [
+                {
+                    "type": subnet.get("type", "cloud"),
+                    "ip_range": str(ip_network(subnet["ip_range"])),
+                    "network_zone": subnet["network_zone"],
+                    "gateway": str(next(ip_network(ip_range).hosts())),
+                    "vswitch_id": None,
+                }
+                for subnet in body.get("subnets", [])
+            ]
+        except (KeyError, TypeError, ValueError):
+            return self._error(422, "invalid_input", "invalid ip range")
+        if not all(
+            ip_network(subnet["ip_range"]).subnet_of(ip_range) for subnet in subnets
+        ):
+            return self._error(422, "invalid_input", "subnet outside of ip range")
+
+        network = {
+            "id": self._next_id(),
+            "name": name,
+            "created": self._now(),
+            "labels": dict(body.get("labels") or {}),
+            "ip_range": str(ip_range),
+            "subnets": subnets,
+            "routes": list(body.get("routes", [])),
+        }
+        self._resources["networks"][network["id"]] = network
+
+        return 201, {"network": self._render("networks", network)}
+
+    def _firewall_action(
+        self, firewall: Dict[str, Any], command: str, body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+
+        if command != "set_rules":
+            return self._error(404, "not_found", "action not found")
+
+        firewall["rules"] = self._rules(body)
+
+        return 201, {
+            "actions": [self._action("set_firewall_rules", firewall, 0.0, "firewall")]
+        }
+
+    def _create_firewall(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+
+        name = body.get("name")
+        if not isinstance(name, str) or len(name) == 0:
+            return self._error(422, "invalid_input", "invalid name")
+        if self._by_name("firewalls", name) is not None:
+            return self._error(409, "uniqueness_error", "firewall name is already used")
+
+        firewall = {
+            "id": self._next_id(),
+            "name": name,
+            "created": self._now(),
+            "labels": dict(body.get("labels") or {}),
+            "rules": self._rules(body),
+        }
+        self._resources["firewalls"][firewall["id"]] = firewall
+
+        return 201, {"firewall": self._render("firewalls", firewall), "actions": []}
+
+    @staticmethod
+    def _rules(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+
+        return [
+            {
+                "direction": rule["direction"],
+                "protocol": rule["protocol"],
+                "port": rule.get("port"),
+                "source_ips": rule.get("source_ips", []),
+                "destination_ips": rule.get("destination_ips", []),
+                "description": rule.get("description"),
+            }
+            for rule in body.get("rules", [])
+        ]
+
+    def _create_ssh_key(self, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+
+        name = body.get("name")
+        if not isinstance(name, str) or len(name) == 0:
+            return self._error(422, "invalid_input", "invalid name")
+        if self._by_name("ssh_keys", name) is not None:
+            return self._error(409, "uniqueness_error", "SSH key name is already used")
+
+        try:
+            fingerprint = md5(b64decode(body["public_key"].split()[1])).hexdigest()
+        except (KeyError, IndexError, AttributeError, ValueError):
+            return self._error(422, "invalid_input", "invalid public key")
+
+        ssh_key = {
+            "id": self._next_id(),
+            "name": name,
+            "created": self._now(),
+            "labels": dict(body.get("labels") or {}),
+            "public_key": body["public_key"],
+            "fingerprint": ":".join(
+                fingerprint[index : index + 2] for index in range(0, 32, 2)
+            ),
+        }
+        self._resources["ssh_keys"][ssh_key["id"]] = ssh_key
+
+        return 201, {"ssh_key": self._render("ssh_keys", ssh_key)}
+
+    def _update(
+        self, kind: str, item: Dict[str, Any], body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+
+        name = body.get("name")
+        if name is not None and name != item["name"]:
+            if self._by_name(kind, name) is not None:
+                return self._error(409, "uniqueness_error", "name is already used")
+            item["name"] = name
+        if body.get("labels") is not None:
+            item["labels"] = dict(body["labels"])
+
+        return 200, {_SINGULAR[kind]: self._render(kind, item)}
+
+    def _delete(
+        self, kind: str, item: Dict[str, Any]
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+
+        if kind == "firewalls" and any(
+            item["id"] in server["firewalls"]
+            for server in self._resources["servers"].values()
+        ):
+            return self._error(422, "resource_in_use", "firewall is still applied")
+
+        if kind == "networks":
+            for server in self._resources["servers"].values():
+                server["private_net"] = [
+                    net for net in server["private_net"] if net["network"] != item["id"]
+                ]
+
+        self._resources[kind].pop(item["id"])
+
+        if kind != "servers":
+            return 204, None
+
+        self._addresses.pop(item["ip4"])
+        return 200, {"action": self._action("delete_server", item, 0.0)}
+
+    def _server_action(
+        self, server: Dict[str, Any], command: str, body: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, Any]]:
+
+        if command in ("reboot", "reset"):
+            server["down"] = time.monotonic() + self._reboot
+            return 201, {
+                "action": self._action(f"{command:s}_server", server, self._reboot)
+            }
+
+        if command not in ("attach_to_network", "detach_from_network"):
+            return self._error(404, "not_found", "action not found")
+
+        network = self._resources["networks"].get(body.get("network"))
+        if network is None:
+            return self._error(404, "not_found", "network not found")
+
+        attached = any(net["network"] == network["id"] for net in server["private_net"])
+
+        if command == "detach_from_network":
+            if not attached:
+                return self._error(422, "server_not_attached", "server is not attached")
+            server["private_net"] = [
+                net for net in server["private_net"] if net["network"] != network["id"]
+            ]
+            return 201, {
+                "action": self._action("detach_server_from_network", server, 0.0)
+            }
+
+        if attached:
+            return self._error(
+                422, "server_already_attached", "server is already attached"
+            )
+
+        error = self._attach(server, network, body.get("ip"))
+        if error is not None:
+            return error
+
+        return 201, {"action": self._action("attach_to_network", server, 0.0)}
+
+    def _attach(
+        self, server: Dict[str, Any], network: Dict[str, Any], ip: Optional[str]
+    ) -> Optional[Tuple[int, Dict[str, Any]]]:
+
+        used = {
+            net["ip"]
+            for other in self._resources["servers"].values()
+            for net in other["private_net"]
+            if net["network"] == network["id"]
+        }
+        subnets = [ip_network(subnet["ip_range"]) for subnet in network["subnets"]]
+
+        if ip is None:
+            ip = next(
+                (
+                    str(host)
+                    for subnet in subnets
+                    for host in islice(subnet.hosts(), 1, None)  # first is the gateway
+                    if str(host) not in used
+                ),
+                None,
+            )
+            if ip is None:
+                return self._error(422, "no_subnet_available", "network is full")
+        else:
+            try:
+                address = ip_address(ip)
+            except ValueError:
+                return self._error(422, "invalid_input", "invalid ip")
+            if not any(address in subnet for subnet in subnets):
+                return self._error(422, "invalid_input", "ip outside of subnets")
+            if ip in used:
+                return self._error(422, "ip_not_available", "ip is already in use")
+
+        server["private_net"].append(
+            {
+                "network": network["id"],
+                "ip": ip,
+                "alias_ips": [],
+                "mac_address": "86:00:00:{:02x}:{:02x}:{:02x}".format(
+                    *(server["id"] % 2 ** 24).to_bytes(3, "big")
+                ),
+            }
+        )
+        return None
+
+    def _get_action(self, aid: str) -> Tuple[int, Dict[str, Any]]:
+
+        action = self._actions.get(self._int(aid))
+        if action is None:
+            return self._error(404, "not_found", "action not found")
+
+        return 200, {"action": self._render_action(action)}
+
+    def _action(
+        self,
+        command: str,
+        resource: Dict[str, Any],
+        duration: float,
+        kind: str = "server",
+    ) -> Dict[str, Any]:
+
+        action = {
+            "id": self._next_id(),
+            "command": command,
+            "started": self._now(),
+            "done": time.monotonic() + duration,
+            "resources": [{"id": resource["id"], "type": kind}],
+        }
+        self._actions[action["id"]] = action
+
+        return self._render_action(action)
+
+    def _render(self, kind: str, item: Dict[str, Any]) -> Dict[str, Any]:
+
+        if kind == "servers":
+            return self._render_server(item)
+
+        data = {
+            key: value for key, value in item.items() if key not in ("ready", "down")
+        }
+        data["labels"] = dict(item["labels"])
+
+        if kind == "networks":
+            data["servers"] = [
+                server["id"]
+                for server in self._resources["servers"].values()
+                if any(net["network"] == item["id"] for net in server["private_net"])
+            ]
+            data["load_balancers"] = []
+            data["protection"] = {"delete": False}
+            data["expose_routes_to_vswitch"] = False
+        elif kind == "firewalls":
+            data["applied_to"] = [
+                {"type": "server", "server": {"id": server["id"]}}
+                for server in self._resources["servers"].values()
+                if item["id"] in server["firewalls"]
+            ]
+
+        return data
+
+    def _render_server(self, server: Dict[str, Any]) -> Dict[str, Any]:
+
+        return {
+            "id": server["id"],
+            "name": server["name"],
+            "status": self._status(server),
+            "created": server["created"],
+            "labels": dict(server["labels"]),
+            "public_net": {
+                "ipv4": {
+                    "id": server["id"],
+                    "ip": server["ip4"],
+                    "blocked": False,
+                    "dns_ptr": f"static.{server['ip4']:s}.fake.invalid",
+                },
+                "ipv6": None,
+                "floating_ips": [],
+                "firewalls": [
+                    {"id": fid, "status": "applied"} for fid in server["firewalls"]
+                ],
+            },
+            "private_net": [dict(net) for net in server["private_net"]],
+            "server_type": server["server_type"],
+            "datacenter": server["datacenter"],
+            "location": server["datacenter"]["location"],
+            "image": server["image"],
+            "iso": None,
+            "rescue_enabled": False,
+            "locked": False,
+            "backup_window": None,
+            "outgoing_traffic": 0,
+            "ingoing_traffic": 0,
+            "included_traffic": 21990232555520,
+            "protection": {"delete": False, "rebuild": False},
+            "volumes": [],
+            "load_balancers": [],
+            "primary_disk_size": server["server_type"]["disk"],
+            "placement_group": None,
+        }
+
+    @staticmethod
+    def _render_action(action: Dict[str, Any]) -> Dict[str, Any]:
+
+        done = action["done"] <= time.monotonic()
+
+        return {
+            "id": action["id"],
+            "command": action["command"],
+            "status": "success" if done else "running",
+            "progress": 100 if done else 50,
+            "started": action["started"],
+            "finished": FakeCloud._now() if done else None,
+            "resources": [dict(resource) for resource in action["resources"]],
+            "error": None,
+        }
+
+    @staticmethod
+    def _status(server: Dict[str, Any]) -> str:
+
+        return "running" if server["ready"] <= time.monotonic() else "initializing"
+
+    def _throttle(self) -> Tuple[bool, Dict[str, str]]:
+
+        if self._rate_limit is None:
+            return True, {
+                "RateLimit-Limit": f"{self._burst:d}",
+                "RateLimit-Remaining": f"{self._burst:d}",
+                "RateLimit-Reset": f"{int(time.time()):d}",
+            }
+
+        now = time.monotonic()
+        self._tokens = min(
+            float(self._burst),
+            self._tokens + (now - self._refilled) * self._rate_limit,
+        )
+        self._refilled = now
+
+        allowed = self._tokens >= 1.0
+        if allowed:
+            self._tokens -= 1.0
+
+        return allowed, {
+            "RateLimit-Limit": f"{self._burst:d}",
+            "RateLimit-Remaining": f"{int(self._tokens):d}",
+            "RateLimit-Reset": f"{ceil(time.time() + (self._burst - self._tokens) / self._rate_limit):d}",
+        }
+
+    def _by_name(self, kind: str, name: Any) -> Optional[Dict[str, Any]]:
+
+        return next(
+            (item for item in self._resources[kind].values() if item["name"] == name),
+            None,
+        )
+
+    def _lookup(self, kind: str, key: Any) -> Optional[Dict[str, Any]]:
+
+        return next(
+            (
+                item
+                for item in self._catalog[kind].values()
+                if key in (item["id"], item["name"])
+            ),
+            None,
+        )
+
+    def _next_id(self) -> int:
+
+        self._id += 1
+        return self._id
+
+    @staticmethod
+    def _build_catalog() -> Dict[str, Dict[int, Dict[str, Any]]]:
+
+        locations = {
+            index: {
+                "id": index,
+                "name": name,
+                "description": description,
+                "country": country,
+                "city": city,
+                "latitude": latitude,
+                "longitude": longitude,
+                "network_zone": zone,
+            }
+            for index, (
+                name,
+                (description, country, city, latitude, longitude, zone, _),
+            ) in enumerate(_LOCATIONS.items(), start=1)
+        }
+
+        server_types = {
+            index: {
+                "id": index,
+                "name": name,
+                "description": name.upper(),
+                "cores": cores,
+                "memory": memory,
+                "disk": disk,
+                "deprecated": False,
+                "prices": [
+                    {
+                        "location": location,
+                        "price_hourly": {
+                            "net": f"{hourly * factor:.4f}",
+                            "gross": f"{hourly * factor * 1.19:.4f}",
+                        },
+                        "price_monthly": {
+                            "net": f"{hourly * factor * 730:.4f}",
+                            "gross": f"{hourly * factor * 730 * 1.19:.4f}",
+                        },
+                    }
+                    for location, (*_, factor) in _LOCATIONS.items()
+                ],
+                "storage_type": "local",
+                "cpu_type": cpu_type,
+                "architecture": architecture,
+                "included_traffic": 21990232555520,
+            }
+            for index, (
+                name,
+                (cores, memory, disk, cpu_type, architecture, hourly),
+            ) in enumerate(_SERVER_TYPES.items(), start=1)
+        }
+
+        datacenters = {
+            index: {
+                "id": index,
+                "name": name,
+                "description": f"{_LOCATIONS[location][2]:s} DC {name.split('-dc')[1]:s}",
+                "location": next(
+                    item for item in locations.values() if item["name"] == location
+                ),
+                "server_types": {
+                    key: list(server_types.keys())
+                    for key in ("supported", "available", "available_for_migration")
+                },
+            }
+            for index, (name, location) in enumerate(_DATACENTERS.items(), start=1)
+        }
+
+        images = {
+            index: {
+                "id": index,
+                "type": "system",
+                "status": "available",
+                "name": name,
+                "description": description,
+                "image_size": None,
+                "disk_size": 5,
+                "created": "2020-04-23T00:00:00+00:00",
+                "created_from": None,
+                "bound_to": None,
+                "os_flavor": "ubuntu",
+                "os_version": version,
+                "rapid_deploy": True,
+                "protection": {"delete": False},
+                "deprecated": None,
+                "labels": {},
+                "architecture": architecture,
+            }
+            for index, (name, (version, description), architecture) in enumerate(
+                (
+                    (name, spec, architecture)
+                    for name, spec in _IMAGES.items()
+                    for architecture in _ARCHITECTURES
+                ),
+                start=1,
+            )
+        }
+
+        return {
+            "locations": locations,
+            "datacenters": datacenters,
+            "server_types": server_types,
+            "images": images,
+        }
+
+    @staticmethod
+    def _endpoint(method: str, segments: List[str]) -> str:
+
+        return (
+            method
+            + " /"
+            + "/".join("{id}" if segment.isdigit() else segment for segment in segments)
+        )
+
+    @staticmethod
+    def _error(status: int, code: str, message: str) -> Tuple[int, Dict[str, Any]]:
+
+        return status, {"error": {"code": code, "message": message, "details": {}}}
+
+    @staticmethod
+    def _int(value: str) -> Optional[int]:
+
+        return int(value) if value.isdigit() else None
+
+    @staticmethod
+    def _now() -> str:
+
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    @staticmethod
+    def _selected(item: Dict[str, Any], selector: str) -> bool:
+
+        labels = item.get("labels", {})
+
+        for expression in (part.strip() for part in selector.split(",")):
+            if len(expression) == 0:
+                continue
+            if expression.startswith("!"):
+                if expression[1:] in labels.keys():
+                    return False
+            elif "!=" in expression:
+                key, value = expression.split("!=", 1)
+                if labels.get(key) == value:
+                    return False
+            elif "=" in expression:
+                key, value = expression.replace("==", "=").split("=", 1)
+                if labels.get(key) != value:
+                    return False
+            elif expression not in labels.keys():
+                return False
+
+        return True
+
+
+class FakeAdapter(BaseAdapter):
+    """
+    Transport adapter for ``requests``, answering requests towards :data:`HETZNER_FAKE_API` from a :class:`scherbelberg.FakeCloud` object instead of the network.
+
+    Args:
+        cloud : Fake cloud.
+    """
+
+    def __init__(self, cloud: FakeCloudABC):
+
+        super().__init__()
+        self._cloud = cloud
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        """
+        Answers a request.
+
+        Args:
+            request : Request prepared by the ``requests`` library.
+        Returns:
+            Response.
+        """
+
+        url = urlsplit(request.url)
+        root = urlsplit(HETZNER_FAKE_API).path
+
+        status, headers, payload = self._cloud.handle(
+            method=request.method,
+            path=url.path[len(root) :],
+            params=parse_qs(url.query),
+            body=json.loads(request.body) if request.body else None,
+        )
+
+        response = Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = (
+            b"" if payload is None else json.dumps(payload).encode("utf-8")
+        )
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def close(self):
+        """
+        Nothing to clean up.
+        """
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of :class:`scherbelberg.FakeServer`, answering requests from the server's fake cloud.
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the actual API
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def do_DELETE(self):
+        """
+        Handles ``DELETE`` requests.
+        """
+
+        self._handle()
+
+    def do_GET(self):
+        """
+        Handles ``GET`` requests.
+        """
+
+        self._handle()
+
+    def do_POST(self):
+        """
+        Handles ``POST`` requests.
+        """
+
+        self._handle()
+
+    def do_PUT(self):
+        """
+        Handles ``PUT`` requests.
+        """
+
+        self._handle()
+
+    def log_message(self, format: str, *args: Any):
+        """
+        Logs requests via the ``fake`` logger instead of standard error.
+        """
+
+        getLogger(name="fake").debug(format, *args)
+
+    def _handle(self):
+
+        url = urlsplit(self.path)
+        root = urlsplit(HETZNER_API).path
+        length = int(self.headers.get("Content-Length", "0"))
+        content = self.rfile.read(length) if length > 0 else b""
+
+        try:
+            body = json.loads(content) if len(content) > 0 else None
+        except ValueError:
+            body = False
+
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            error = FakeCloud._error(401, "unauthorized", "invalid or unknown token")
+        elif not url.path.startswith(root):
+            error = FakeCloud._error(404, "not_found", "not found")
+        elif body is not None and not isinstance(body, dict):
+            error = FakeCloud._error(400, "json_error", "invalid JSON")
+        else:
+            error = None
+
+        if error is None:
+            status, headers, payload = self.server.cloud.handle(
+                method=self.command,
+                path=url.path[len(root) :],
+                params=parse_qs(url.query),
+                body=body,
+            )
+        else:
+            (status, payload), headers = error, {"Content-Type": "application/json"}
+
+        content = b"" if payload is None else json.dumps(payload).encode("utf-8")
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", f"{len(content):d}")
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@typechecked
+class FakeServer(FakeServerABC):
+    """
+    Serves a :class:`scherbelberg.FakeCloud` via HTTP like the actual Hetzner Cloud API, e.g. for end-to-end tests of the command line interface. Mutable.
+    Clients are pointed at it via :meth:`scherbelberg.FakeServer.client` or, in other processes, via the ``SCHERBELBERG_API`` environment variable set to :attr:`scherbelberg.FakeServer.url`.
+    The socket is bound on construction. Requests are handled in threads once the server is started.
+
+    Args:
+        cloud : Fake cloud to serve. Defaults to a new fake cloud without latencies.
+        host : Address to listen on.
+        port : Port to listen on. ``0`` picks a free port.
+    """
+
+    def __init__(
+        self,
+        cloud: Optional[FakeCloudABC] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+
+        assert 0 <= port < 2 ** 16
+
+        self._cloud = FakeCloud() if cloud is None else cloud
+        self._server = ThreadingHTTPServer((host, port), FakeHandler)
+        self._server.daemon_threads = True
+        self._server.cloud = self._cloud
+        self._thread = None
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<FakeServer url={self.url:s} running={self.running!r}>"
+
+    def __enter__(self) -> FakeServerABC:
+
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any):
+
+        self.stop()
+
+    def client(self, poll_interval: float = WAIT) -> Client:
+        """
+        Creates a cloud API client connected to this server.
+
+        Args:
+            poll_interval : Time in seconds between polls of the client when waiting for actions to finish.
+        Returns:
+            Regular ``hcloud.Client`` object.
+        """
+
+        return Client(
+            token="fake",
+            api_endpoint=self.url,
+            poll_interval=poll_interval,
+        )
+
+    def serve(self):
+        """
+        Serves requests in the current thread until interrupted.
+        """
+
+        assert not self.running
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self):
+        """
+        Serves requests in a background thread.
+        """
+
+        assert not self.running
+
+        self._thread = Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops serving requests and closes the socket.
+        """
+
+        if self.running:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    @property
+    def cloud(self) -> FakeCloudABC:
+        """
+        Served fake cloud
+        """
+
+        return self._cloud
+
+    @property
+    def environ(self) -> Dict[str, str]:
+        """
+        Environment variables pointing scherbelberg in other processes at this server
+        """
+
+        return {APIVAR: self.url}
+
+    @property
+    def running(self) -> bool:
+        """
+        Is the server serving requests in a background thread?
+        """
+
+        return self._thread is not None
+
+    @property
+    def url(self) -> str:
+        """
+        API endpoint, e.g. ``http://127.0.0.1:8080/v1``
+        """
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host:s}:{port:d}{urlsplit(HETZNER_API).path:s}"
+
+
+@typechecked
+class FakeSSH(BackendABC):
+    """
+    Stand-in for running commands, in particular ``ssh`` and ``scp`` towards nodes, without starting any processes. Mutable.
+    Becomes active as a context manager, see :meth:`scherbelberg.Command.set_backend`.
+
+    Args:
+        latency : Time in seconds each command takes.
+        delays : Additional time in seconds for commands containing a given string, e.g. ``{"bootstrap_01.sh": 90.0}``.
+        failure : Probability of a command failing.
+        cloud : Fake cloud which is asked whether the target host of ``ssh`` and ``scp`` commands is reachable. Commands towards unreachable hosts fail like ``ssh`` does.
+        seed : Seed for random failures.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        delays: Optional[Dict[str, float]] = None,
+        failure: float = 0.0,
+        cloud: Optional[FakeCloudABC] = None,
+        seed: Optional[int] = None,
+    ):
+
+        assert latency >= 0.0
+        assert 0.0 <= failure <= 1.0
+
+        self._latency = latency
+        self._delays = {} if delays is None else delays.copy()
+        self._failure = failure
+        self._cloud = cloud
+
+        self._random = Random(seed)
+        self._commands = Counter()
+        self._previous = None
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<FakeSSH commands={sum(self._commands.values()):d}>"
+
+    def __enter__(self) -> BackendABC:
+
+        self._previous = Command.get_backend()
+        Command.set_backend(self)
+        return self
+
+    def __exit__(self, *args: Any):
+
+        Command.set_backend(self._previous)
+        self._previous = None
+
+    async def run(
+        self,
+        command: CommandABC,
+        timeout: Union[float, int, None] = None,
+        wait: float = WAIT,
+    ) -> Tuple[List[str], List[str], List[int], Exception]:
+        """
+        Pretends to run a command.
+
+        Args:
+            command : Command.
+            timeout : Total timeout in seconds.
+            wait : Ignored.
+        Returns:
+            Data from standard output and standard error streams, return codes and an exception object that can be raised by the caller.
+        """
+
+        text = str(command)
+        program = command.cmd[0][0]
+        self._commands[program] += 1
+
+        output = ["" for _ in command.cmd]
+        errors = ["" for _ in command.cmd]
+        status = [0 for _ in command.cmd]
+
+        host = command.host
+        if (
+            host is not None
+            and self._cloud is not None
+            and not self._cloud.reachable(host)
+        ):
+            await sleep(self._latency)
+            errors[0] = f"ssh: connect to host {host:s} port 22: Connection refused\r\n"
+            status[0] = 255
+        else:
+            duration = self._latency + sum(
+                delay for fragment, delay in self._delays.items() if fragment in text
+            )
+            if timeout is not None and duration > timeout:
+                await sleep(timeout)
+                status[-1] = -9  # killed
+            else:
+                await sleep(duration)
+                if self._random.random() < self._failure:
+                    errors[-1] = "fake failure\n"
+                    status[-1] = 1
+
+        return (
+            output,
+            errors,
+            status,
+            SystemError("command failed", text, output, errors),
+        )
+
+    @property
+    def commands(self) -> Dict[str, int]:
+        """
+        Number of commands run so far per program, e.g. ``ssh``
+        """
+
+        return dict(self._commands)
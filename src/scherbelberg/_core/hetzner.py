@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/hetzner.py: Servers from the Hetzner cloud
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import CancelledError, gather, get_running_loop, shield, wait
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from hcloud import Client
+from hcloud.datacenters.domain import Datacenter
+from hcloud.firewalls.domain import FirewallRule
+from hcloud.images.domain import Image
+from hcloud.networks.client import BoundNetwork
+from hcloud.networks.domain import NetworkSubnet
+from hcloud.servers.client import BoundServer
+from hcloud.server_types.domain import ServerType
+
+from .abc import (
+    CatalogABC,
+    HetznerProviderABC,
+    InstanceABC,
+    NetworkABC,
+    ResourceABC,
+)
+from .const import CATALOG_TTL, HETZNER_NETWORK_ZONE
+from .debug import typechecked
+from .provider import Instance, Network, Provider, Resource
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class HetznerProvider(Provider, HetznerProviderABC):
+    """
+    Provides servers, private networks, firewalls and ssh keys via the Hetzner cloud API. Mutable.
+
+    Args:
+        client : A cloud API client object, e.g. from :func:`scherbelberg.create_client` or :meth:`scherbelberg.FakeCloud.client`.
+    """
+
+    def __init__(self, client: Client):
+
+        self._client = client
+
+    @property
+    def client(self) -> Client:
+        """
+        Cloud API client
+        """
+
+        return self._client
+
+    async def create_ssh_key(self, name: str, public_key: str) -> ResourceABC:
+
+        _ = await self._call(
+            self._client.ssh_keys.create,
+            name=name,
+            public_key=public_key,
+        )
+
+        return await self.get_ssh_key(name)
+
+    async def get_ssh_key(self, name: str) -> Optional[ResourceABC]:
+
+        ssh_key = await self._call(self._client.ssh_keys.get_by_name, name=name)
+        if ssh_key is None:
+            return None
+
+        return Resource(name=ssh_key.name, handle=ssh_key)
+
+    async def get_ssh_keys(self) -> List[ResourceABC]:
+
+        return [
+            Resource(name=ssh_key.name, handle=ssh_key)
+            for ssh_key in await self._call(self._client.ssh_keys.get_all)
+        ]
+
+    async def delete_ssh_key(self, ssh_key: ResourceABC):
+
+        await self._call((await self._bound("ssh_keys", ssh_key)).delete)
+
+    async def create_firewall(self, name: str, ports: List[int]) -> ResourceABC:
+
+        _ = await self._call(
+            self._client.firewalls.create,
+            name=name,
+            rules=self._rules(ports),
+        )
+
+        return await self.get_firewall(name)
+
+    async def update_firewall(
+        self, firewall: ResourceABC, ports: List[int]
+    ) -> ResourceABC:
+
+        bound = await self._bound("firewalls", firewall)
+        actions = await self._call(bound.set_rules, rules=self._rules(ports))
+        await gather(*[self._call(action.wait_until_finished) for action in actions])
+
+        return firewall
+
+    async def get_firewall(self, name: str) -> Optional[ResourceABC]:
+
+        firewall = await self._call(self._client.firewalls.get_by_name, name=name)
+        if firewall is None:
+            return None
+
+        return Resource(name=firewall.name, handle=firewall)
+
+    async def get_firewalls(self) -> List[ResourceABC]:
+
+        return [
+            Resource(name=firewall.name, handle=firewall)
+            for firewall in await self._call(self._client.firewalls.get_all)
+        ]
+
+    async def delete_firewall(self, firewall: ResourceABC):
+
+        await self._call((await self._bound("firewalls", firewall)).delete)
+
+    async def create_network(self, name: str, ip_range: str) -> NetworkABC:
+
+        _ = await self._call(
+            self._client.networks.create,
+            name=name,
+            ip_range=ip_range,
+            subnets=[
+                NetworkSubnet(
+                    ip_range=ip_range,
+                    type="cloud",
+                    network_zone=HETZNER_NETWORK_ZONE,
+                )
+            ],
+        )
+
+        return await self.get_network(name)
+
+    async def get_network(self, name: str) -> Optional[NetworkABC]:
+
+        network = await self._call(self._client.networks.get_by_name, name=name)
+        if network is None:
+            return None
+
+        return self._network(network)
+
+    async def get_networks(self) -> List[NetworkABC]:
+
+        return [
+            self._network(network)
+            for network in await self._call(self._client.networks.get_all)
+        ]
+
+    async def delete_network(self, network: NetworkABC):
+
+        await self._call((await self._bound("networks", network)).delete)
+
+    async def create_server(
+        self,
+        name: str,
+        servertype: str,
+        image: str,
+        datacenter: str,
+        labels: Dict[str, str],
+        ssh_key: ResourceABC,
+        firewall: ResourceABC,
+    ):
+
+        bound_ssh_key, bound_firewall = await gather(
+            self._bound("ssh_keys", ssh_key),
+            self._bound("firewalls", firewall),
+        )
+        _ = await self._call(
+            self._client.servers.create,
+            name=name,
+            server_type=ServerType(name=servertype),
+            image=Image(name=image),
+            datacenter=Datacenter(name=datacenter),
+            ssh_keys=[bound_ssh_key],
+            firewalls=[bound_firewall],
+            labels=labels,
+        )
+
+    async def get_server(self, name: str) -> Optional[InstanceABC]:
+
+        server = await self._call(self._client.servers.get_by_name, name=name)
+        if server is None:
+            return None
+
+        return self._instance(server)
+
+    async def get_servers(
+        self, labels: Optional[Dict[str, str]] = None
+    ) -> List[InstanceABC]:
+
+        selector = None
+        if labels is not None:
+            selector = ",".join(f"{key:s}={value:s}" for key, value in labels.items())
+
+        return [
+            self._instance(server)
+            for server in await self._call(
+                self._client.servers.get_all, label_selector=selector
+            )
+        ]
+
+    async def attach_server(
+        self, server: InstanceABC, network: NetworkABC, ip: str
+    ) -> InstanceABC:
+
+        bound_server, bound_network = await gather(
+            self._bound("servers", server),
+            self._bound("networks", network),
+        )
+        await self._call(bound_server.attach_to_network, network=bound_network, ip=ip)
+
+        return server.copy(private_ip4s=[*server.private_ip4s, ip])
+
+    async def set_labels(
+        self, server: InstanceABC, labels: Dict[str, str]
+    ) -> InstanceABC:
+
+        bound = await self._bound("servers", server)
+
+        return self._instance(await self._call(bound.update, labels=labels))
+
+    async def reboot_server(self, server: InstanceABC, wait: bool = False):
+
+        action = await self._call((await self._bound("servers", server)).reboot)
+        if wait:
+            await self._call(action.wait_until_finished)
+
+    async def delete_server(self, server: InstanceABC, wait: bool = False):
+
+        action = await self._call((await self._bound("servers", server)).delete)
+        if wait:
+            await self._call(action.wait_until_finished)
+
+    async def get_catalog(self, ttl: float = CATALOG_TTL) -> Optional[CatalogABC]:
+
+        # catalog creates clients via cloud, which imports this module
+        from .catalog import get_catalog
+
+        return await get_catalog(client=self._client, ttl=ttl)
+
+    async def _call(self, func: Callable, **kwargs: Any) -> Any:
+
+        # blocking client in thread, allows concurrent requests, e.g. via gather
+        future = get_running_loop().run_in_executor(None, partial(func, **kwargs))
+        try:
+            return await shield(future)
+        except CancelledError:
+            await wait([future])  # request is in flight, let it land for clean-up
+            raise
+
+    async def _bound(self, kind: str, resource: ResourceABC) -> Any:
+
+        if resource.handle is not None:
+            return resource.handle
+
+        # e.g. restored from a cached cluster description
+        client = getattr(self._client, kind)
+        return await self._call(client.get_by_name, name=resource.name)
+
+    @staticmethod
+    def _instance(server: BoundServer) -> InstanceABC:
+
+        return Instance(
+            name=server.name,
+            status=server.status,
+            created=server.created,
+            datacenter=server.datacenter.name,
+            servertype=server.server_type.name,
+            image=None if server.image is None else server.image.name,
+            labels=server.labels,
+            public_ip4=server.public_net.ipv4.ip,
+            private_ip4s=[net.ip for net in server.private_net],
+            handle=server,
+        )
+
+    @staticmethod
+    def _rules(ports: List[int]) -> List[FirewallRule]:
+
+        return [
+            FirewallRule(
+                direction="in",
+                protocol=protocol,
+                source_ips=["0.0.0.0/0", "::/0"],
+                destination_ips=[],
+                port=port,
+            )
+            for protocol, port in [
+                ("icmp", None),
+                *[("tcp", f"{port:d}") for port in ports],
+            ]
+        ]
+
+    @staticmethod
+    def _network(network: BoundNetwork) -> NetworkABC:
+
+        return Network(name=network.name, ip_range=network.ip_range, handle=network)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/layout.py: Private network layout and address allocation
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from ipaddress import ip_address, ip_network, IPv4Network
+import re
+from typing import List, Optional, Tuple
+
+from .abc import LayoutABC
+from .const import HETZNER_NETWORK_SERVERS, NETWORK_PREFIX, NETWORK_RANGE
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Layout(LayoutABC):
+    """
+    Allocates private networks and addresses for the nodes of a cluster. Mutable.
+    The cluster's address range is split into blocks, one per network.
+    Additional networks are added once the per-network limit of servers is reached.
+    Nodes in different networks can not reach each other via their private addresses.
+
+    Args:
+        ip_range : Private address range of the entire cluster.
+        prefix : Prefix length of the address range of every network.
+        servers : Maximum number of servers per network.
+        networks : Address ranges of already existing networks, in order.
+        used : Already used addresses.
+    """
+
+    def __init__(
+        self,
+        ip_range: str = NETWORK_RANGE,
+        prefix: int = NETWORK_PREFIX,
+        servers: int = HETZNER_NETWORK_SERVERS,
+        networks: Optional[List[str]] = None,
+        used: Optional[List[str]] = None,
+    ):
+
+        self._ip_range = ip_network(ip_range)
+
+        assert self._ip_range.is_private
+        assert self._ip_range.prefixlen <= prefix <= 28
+        assert servers > 0
+
+        self._prefix = prefix
+        self._servers = servers
+
+        self._networks = []  # address ranges
+        self._used = []  # sets of used addresses per network
+
+        for network in [] if networks is None else networks:
+            self._add_network(ip_network(network))
+        for address in [] if used is None else used:
+            self.reserve(address)
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<Layout ip_range={str(self._ip_range):s} networks={len(self._networks):d} used={sum(len(used) for used in self._used):d}>"
+
+    def allocate(self, network: Optional[int] = None) -> Tuple[int, str]:
+        """
+        Allocates a free address. If all existing networks are full, a new network is added to the layout.
+
+        Args:
+            network : Index of network to allocate the address in. Defaults to the first network with free capacity.
+        Returns:
+            Index of network and allocated address.
+        """
+
+        if network is None:
+            network = next(
+                (
+                    index
+                    for index, used in enumerate(self._used)
+                    if len(used) < self._servers
+                ),
+                len(self._networks),
+            )
+        if network == len(self._networks):
+            self._add_network(self._next_range())
+
+        assert 0 <= network < len(self._networks)
+        if len(self._used[network]) >= self._servers:
+            raise ValueError(f"network {network:d} is full")
+
+        hosts = self._networks[network].hosts()
+        _ = next(hosts)  # first host is reserved for the gateway
+
+        for address in hosts:
+            if address not in self._used[network]:
+                self._used[network].add(address)
+                return network, str(address)
+
+        raise ValueError(f"network {network:d} has no free addresses")
+
+    def network_range(self, network: int) -> str:
+        """
+        Address range of a network.
+
+        Args:
+            network : Index of network.
+        Returns:
+            Address range.
+        """
+
+        return str(self._networks[network])
+
+    def reserve(self, address: str) -> int:
+        """
+        Marks an address as used.
+
+        Args:
+            address : Address.
+        Returns:
+            Index of the network containing the address.
+        """
+
+        address = ip_address(address)
+
+        for index, network in enumerate(self._networks):
+            if address in network:
+                self._used[index].add(address)
+                return index
+
+        raise ValueError(f"address {str(address):s} is not part of any network")
+
+    def _add_network(self, network: IPv4Network):
+
+        assert all(not network.overlaps(other) for other in self._networks)
+
+        self._networks.append(network)
+        self._used.append(set())
+
+    def _next_range(self) -> IPv4Network:
+
+        for candidate in self._ip_range.subnets(new_prefix=self._prefix):
+            if all(not candidate.overlaps(other) for other in self._networks):
+                return candidate
+
+        raise ValueError(f"address range {str(self._ip_range):s} is exhausted")
+
+    @property
+    def networks(self) -> int:
+        """
+        Number of networks
+        """
+
+        return len(self._networks)
+
+    @staticmethod
+    def network_name(prefix: str, network: int) -> str:
+        """
+        Name of a network of a cluster.
+
+        Args:
+            prefix : Name of cluster, used as a prefix in names of every component.
+            network : Index of network.
+        Returns:
+            Name of network.
+        """
+
+        assert network >= 0
+
+        if network == 0:
+            return f"{prefix:s}-network"  # backwards compatible
+
+        return f"{prefix:s}-network{network:03d}"
+
+    @staticmethod
+    def network_index(prefix: str, name: str) -> Optional[int]:
+        """
+        Index of a network of a cluster based on its name.
+
+        Args:
+            prefix : Name of cluster, used as a prefix in names of every component.
+            name : Name of network.
+        Returns:
+            Index of network or ``None`` if the name does not match.
+        """
+
+        if name == f"{prefix:s}-network":
+            return 0
+
+        match = re.fullmatch(f"{re.escape(prefix):s}-network([0-9]{{3,}})", name)
+        if match is None:
+            return None
+
+        return int(match.group(1))
@@ -0,0 +1,489 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/local.py: Servers as local containers
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import Lock
+from datetime import datetime, timezone
+from ipaddress import ip_network
+import json
+import os
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional
+
+from .abc import InstanceABC, LocalProviderABC, NetworkABC, ResourceABC
+from .command import Command
+from .const import LOCAL_ENGINE, LOCAL_ENGINES, LOCAL_PATH, LOCAL_RANGE, LOCAL_WAIT
+from .debug import typechecked
+from .provider import Instance, Network, Provider, Resource, STATUS_RUNNING
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+LABEL = "scherbelberg"  # marks containers and networks managed by scherbelberg
+PUBLIC = "scherbelberg-public"  # network of addresses standing in for public addresses
+
+CONTAINERFILE = """FROM {base:s}
+ENV DEBIAN_FRONTEND=noninteractive
+RUN apt-get -q update \\
+    && apt-get -q -y install --no-install-recommends \\
+        systemd systemd-sysv dbus openssh-server sudo patch wget ca-certificates iproute2 \\
+    && rm -rf /var/lib/apt/lists/* \\
+    && mkdir -p /root/.ssh \\
+    && chmod 700 /root/.ssh \\
+    && systemctl enable ssh
+STOPSIGNAL SIGRTMIN+3
+CMD ["/sbin/init"]
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class LocalProvider(Provider, LocalProviderABC):
+    """
+    Provides servers as local containers running systemd and an ssh daemon, so clusters can be bootstrapped and profiled on a single Linux machine.
+    Containers are privileged and require a rootful container engine, i.e. ``docker`` or ``podman``.
+    Operating system images such as ``ubuntu-20.04`` are built from the corresponding official base images on first use.
+    Every container receives a fixed address from ``ip_range`` standing in for its public address, reachable from the host.
+    Private networks are bridge networks of the engine. Server types and data centers are recorded but not enforced, firewalls are recorded only.
+    Labels and other state are kept in JSON files below ``path``. Mutable.
+
+    Args:
+        engine : Container engine, either ``docker`` (default) or ``podman``.
+        path : Location of state, e.g. ``~/.scherbelberg/local``.
+        ip_range : Address range of network standing in for public addresses.
+        wait : Interval defining every how many seconds the status of engine commands is being observed.
+    """
+
+    def __init__(
+        self,
+        engine: str = LOCAL_ENGINE,
+        path: str = LOCAL_PATH,
+        ip_range: str = LOCAL_RANGE,
+        wait: float = LOCAL_WAIT,
+    ):
+
+        assert engine in LOCAL_ENGINES
+        assert ip_network(ip_range).is_private
+
+        self._engine = engine
+        self._path = os.path.abspath(os.path.expanduser(path))
+        self._ip_range = ip_range
+        self._wait = wait
+
+        self._lock = None  # created within event loop
+        self._images = set()  # images known to exist
+        self._public_exists = False
+
+        for kind in ("servers", "networks", "ssh_keys", "firewalls"):
+            os.makedirs(os.path.join(self._path, kind), exist_ok=True)
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<LocalProvider engine={self._engine:s} path={self._path:s}>"
+
+    @property
+    def engine(self) -> str:
+        """
+        Container engine
+        """
+
+        return self._engine
+
+    @property
+    def path(self) -> str:
+        """
+        Location of state
+        """
+
+        return self._path
+
+    async def create_ssh_key(self, name: str, public_key: str) -> ResourceABC:
+
+        self._write("ssh_keys", name, {"public_key": public_key})
+
+        return Resource(name=name, handle=public_key)
+
+    async def get_ssh_key(self, name: str) -> Optional[ResourceABC]:
+
+        state = self._read("ssh_keys", name)
+        if state is None:
+            return None
+
+        return Resource(name=name, handle=state["public_key"])
+
+    async def get_ssh_keys(self) -> List[ResourceABC]:
+
+        return [await self.get_ssh_key(name) for name in self._names("ssh_keys")]
+
+    async def delete_ssh_key(self, ssh_key: ResourceABC):
+
+        self._remove("ssh_keys", ssh_key.name)
+
+    async def create_firewall(self, name: str, ports: List[int]) -> ResourceABC:
+
+        self._write("firewalls", name, {"ports": ports})
+
+        return Resource(name=name, handle=ports)
+
+    async def update_firewall(
+        self, firewall: ResourceABC, ports: List[int]
+    ) -> ResourceABC:
+
+        self._write("firewalls", firewall.name, {"ports": ports})
+
+        return Resource(name=firewall.name, handle=ports)
+
+    async def get_firewall(self, name: str) -> Optional[ResourceABC]:
+
+        state = self._read("firewalls", name)
+        if state is None:
+            return None
+
+        return Resource(name=name, handle=state["ports"])
+
+    async def get_firewalls(self) -> List[ResourceABC]:
+
+        return [await self.get_firewall(name) for name in self._names("firewalls")]
+
+    async def delete_firewall(self, firewall: ResourceABC):
+
+        self._remove("firewalls", firewall.name)
+
+    async def create_network(self, name: str, ip_range: str) -> NetworkABC:
+
+        await self._run(
+            "network",
+            "create",
+            "--driver",
+            "bridge",
+            "--subnet",
+            ip_range,
+            "--label",
+            f"{LABEL:s}=1",
+            name,
+        )
+        self._write("networks", name, {"ip_range": ip_range})
+
+        return Network(name=name, ip_range=ip_range)
+
+    async def get_network(self, name: str) -> Optional[NetworkABC]:
+
+        state = self._read("networks", name)
+        if state is None:
+            return None
+
+        return Network(name=name, ip_range=state["ip_range"])
+
+    async def get_networks(self) -> List[NetworkABC]:
+
+        return [await self.get_network(name) for name in self._names("networks")]
+
+    async def delete_network(self, network: NetworkABC):
+
+        await self._run("network", "rm", network.name, check=False)
+        self._remove("networks", network.name)
+
+    async def create_server(
+        self,
+        name: str,
+        servertype: str,
+        image: str,
+        datacenter: str,
+        labels: Dict[str, str],
+        ssh_key: ResourceABC,
+        firewall: ResourceABC,
+    ):
+
+        async with self._get_lock():  # one build per image, unique addresses
+            tag = await self._build(image)
+            await self._public()
+            public_ip4 = self._allocate()
+            self._write(
+                "servers",
+                name,
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "datacenter": datacenter,
+                    "servertype": servertype,
+                    "image": image,
+                    "labels": labels,
+                    "public_ip4": public_ip4,
+                    "private_ip4s": [],
+                },
+            )
+
+        await self._run(
+            "run",
+            "--detach",
+            "--name",
+            name,
+            "--hostname",
+            name,
+            "--label",
+            f"{LABEL:s}=1",
+            "--privileged",
+            "--cgroupns=host",
+            "--volume",
+            "/sys/fs/cgroup:/sys/fs/cgroup:rw",
+            "--tmpfs",
+            "/run",
+            "--tmpfs",
+            "/run/lock",
+            "--network",
+            PUBLIC,
+            "--ip",
+            public_ip4,
+            tag,
+        )
+        await self._run(
+            "exec",
+            name,
+            "sh",
+            "-c",
+            'printf "%s\\n" "$1" > /root/.ssh/authorized_keys && chmod 600 /root/.ssh/authorized_keys',
+            "sh",
+            ssh_key.handle.strip(),
+        )
+
+    async def get_server(self, name: str) -> Optional[InstanceABC]:
+
+        state = self._read("servers", name)
+        if state is None:
+            return None
+
+        return self._instance(name, state, await self._status([name]))
+
+    async def get_servers(
+        self, labels: Optional[Dict[str, str]] = None
+    ) -> List[InstanceABC]:
+
+        states = {name: self._read("servers", name) for name in self._names("servers")}
+        if labels is not None:
+            states = {
+                name: state
+                for name, state in states.items()
+                if all(
+                    state["labels"].get(key) == value for key, value in labels.items()
+                )
+            }
+        status = await self._status(list(states.keys()))
+
+        return [self._instance(name, state, status) for name, state in states.items()]
+
+    async def attach_server(
+        self, server: InstanceABC, network: NetworkABC, ip: str
+    ) -> InstanceABC:
+
+        await self._run("network", "connect", "--ip", ip, network.name, server.name)
+
+        state = self._read("servers", server.name)
+        state["private_ip4s"].append(ip)
+        self._write("servers", server.name, state)
+
+        return server.copy(private_ip4s=state["private_ip4s"])
+
+    async def set_labels(
+        self, server: InstanceABC, labels: Dict[str, str]
+    ) -> InstanceABC:
+
+        state = self._read("servers", server.name)
+        state["labels"] = labels
+        self._write("servers", server.name, state)
+
+        return server.copy(labels=labels)
+
+    async def reboot_server(self, server: InstanceABC, wait: bool = False):
+
+        await self._run("restart", server.name)  # returns once restarted
+
+    async def delete_server(self, server: InstanceABC, wait: bool = False):
+
+        await self._run("rm", "--force", "--volumes", server.name, check=False)
+        self._remove("servers", server.name)
+
+    def _get_lock(self) -> Lock:
+
+        if self._lock is None:
+            self._lock = Lock()
+
+        return self._lock
+
+    async def _run(self, *args: str, check: bool = True) -> str:
+
+        output, _, status, exception = await Command.from_list(
+            [self._engine, *args]
+        ).run(returncode=True, wait=self._wait)
+
+        if check and any(code != 0 for code in status):
+            raise exception
+
+        return output[0]
+
+    async def _build(self, image: str) -> str:
+
+        tag = f"{LABEL:s}/{image:s}:latest"
+
+        if tag in self._images:
+            return tag
+
+        _, _, status, _ = await Command.from_list(
+            [self._engine, "image", "inspect", tag]
+        ).run(returncode=True, wait=self._wait)
+        if status[0] != 0:
+            distribution, version = image.split("-", 1)
+            with TemporaryDirectory() as fld:
+                with open(
+                    os.path.join(fld, "Containerfile"), "w", encoding="utf-8"
+                ) as f:
+                    f.write(CONTAINERFILE.format(base=f"{distribution:s}:{version:s}"))
+                await self._run(
+                    "build",
+                    "--tag",
+                    tag,
+                    "--file",
+                    os.path.join(fld, "Containerfile"),
+                    fld,
+                )
+
+        self._images.add(tag)
+
+        return tag
+
+    async def _public(self):
+
+        if self._public_exists:
+            return
+
+        _, _, status, _ = await Command.from_list(
+            [self._engine, "network", "inspect", PUBLIC]
+        ).run(returncode=True, wait=self._wait)
+        if status[0] != 0:
+            await self._run(
+                "network",
+                "create",
+                "--driver",
+                "bridge",
+                "--subnet",
+                self._ip_range,
+                "--label",
+                f"{LABEL:s}=1",
+                PUBLIC,
+            )
+
+        self._public_exists = True
+
+    def _allocate(self) -> str:
+
+        used = {
+            self._read("servers", name)["public_ip4"] for name in self._names("servers")
+        }
+
+        hosts = ip_network(self._ip_range).hosts()
+        _ = next(hosts)  # first host is reserved for the gateway
+
+        for address in hosts:
+            if str(address) not in used:
+                return str(address)
+
+        raise ValueError("no free local addresses")
+
+    async def _status(self, names: List[str]) -> Dict[str, str]:
+
+        if len(names) == 0:
+            return {}
+
+        output = await self._run(
+            "ps",
+            "--all",
+            "--filter",
+            f"label={LABEL:s}",
+            "--format",
+            "{{.Names}} {{.State}}",
+        )
+
+        return dict(
+            line.split(" ", 1)[:2]
+            for line in output.splitlines()
+            if len(line.split(" ", 1)) == 2
+        )
+
+    def _fn(self, kind: str, name: str) -> str:
+
+        return os.path.join(self._path, kind, f"{name:s}.json")
+
+    def _names(self, kind: str) -> List[str]:
+
+        return sorted(
+            fn[: -len(".json")]
+            for fn in os.listdir(os.path.join(self._path, kind))
+            if fn.endswith(".json")
+        )
+
+    def _read(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+
+        if not os.path.exists(self._fn(kind, name)):
+            return None
+
+        with open(self._fn(kind, name), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self, kind: str, name: str, state: Dict[str, Any]):
+
+        with open(f"{self._fn(kind, name):s}.tmp", "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=4, sort_keys=True)
+        os.replace(f"{self._fn(kind, name):s}.tmp", self._fn(kind, name))
+
+    def _remove(self, kind: str, name: str):
+
+        if os.path.exists(self._fn(kind, name)):
+            os.unlink(self._fn(kind, name))
+
+    @staticmethod
+    def _instance(
+        name: str, state: Dict[str, Any], status: Dict[str, str]
+    ) -> InstanceABC:
+
+        return Instance(
+            name=name,
+            status=STATUS_RUNNING if status.get(name) == "running" else "off",
+            created=datetime.fromisoformat(state["created"]),
+            datacenter=state["datacenter"],
+            servertype=state["servertype"],
+            image=state["image"],
+            labels=state["labels"],
+            public_ip4=state["public_ip4"],
+            private_ip4s=state["private_ip4s"],
+        )
@@ -27,18 +27,38 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-from asyncio import sleep
+from asyncio import gather, sleep
+from contextlib import nullcontext
+from datetime import datetime
+import json
 from logging import getLogger, Logger
 import os
 import sys
-from typing import Dict, Optional, Union
-
-from hcloud import Client
-from hcloud.servers.client import BoundServer
-
-from .abc import NodeABC, SSHConfigABC
+from typing import Any, ContextManager, Dict, List, Optional, Union
+
+from .abc import (
+    CommandABC,
+    InstanceABC,
+    NodeABC,
+    ProviderABC,
+    SSHConfigABC,
+    TimelineABC,
+)
 from .command import Command
+from .const import (
+    BENCH_PINGS,
+    BENCH_PORT,
+    BENCH_SIZE,
+    BENCH_TIMEOUT,
+    BOOTSTRAP_PROFILE,
+    BOOTSTRAP_PROFILES,
+    DASK_PRIVATE,
+    DASK_PROTOCOL,
+    DASK_PROTOCOLS,
+    POOL,
+)
 from .debug import typechecked
+from .pool import Pool
 from .sshconfig import SSHConfig
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -61,22 +81,24 @@ class Node(NodeABC):
     Represents one node of the cluster, i.e. a server. Mutable.
 
     Args:
-        server : A cloud API server object.
-        client : A cloud API client object.
+        server : A server object of the provider.
+        provider : Source of servers, e.g. :class:`scherbelberg.HetznerProvider`.
         fn_private : Location of private SSH key.
         prefix : Name of cluster, used as a prefix in names of every component.
         wait : Timeout in seconds before actions are repeated or exceptions are raised.
         log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
+        timeline : Records timed phases of bootstrapping and starting Dask, if provided.
     """
 
     def __init__(
         self,
-        server: BoundServer,
-        client: Client,
+        server: InstanceABC,
+        provider: ProviderABC,
         fn_private: str,
         prefix: str,
         wait: float,
         log: Union[Logger, None] = None,
+        timeline: Optional[TimelineABC] = None,
     ):
 
         self._log = getLogger(name=prefix) if log is None else log
@@ -85,10 +107,11 @@ class Node(NodeABC):
         assert wait > 0
 
         self._server = server
-        self._client = client
+        self._provider = provider
         self._fn_private = fn_private
         self._prefix = prefix
         self._wait = wait
+        self._timeline = timeline
 
     def __repr__(self) -> str:
         """
@@ -105,6 +128,51 @@ class Node(NodeABC):
 
         return f"[{self.suffix:s}] {msg:s}"
 
+    def _span(self, phase: str, **info: Any) -> ContextManager:
+
+        if self._timeline is None:
+            return nullcontext()
+
+        return self._timeline.span(self.suffix, phase, **info)
+
+    async def _run_script(self, phase: str, command: CommandABC):
+        """
+        Runs a command, appending its output to the node's log file
+        """
+
+        with self._span(phase):
+            output, errors, status, exception = await command.run(
+                returncode=True, wait=self._wait
+            )
+
+            fld = os.path.join(os.getcwd(), f".{self._prefix:s}", "logs")
+            os.makedirs(fld, exist_ok=True)
+            with open(
+                os.path.join(fld, f"{self.suffix:s}.log"), "a", encoding="utf-8"
+            ) as f:
+                f.write(f"=== {phase:s} ({datetime.now().isoformat():s}) ===\n")
+                f.write("".join(output))
+                f.write("".join(errors))
+
+            if any(code != 0 for code in status):
+                raise exception
+
+    async def _reboot_required(self) -> bool:
+        """
+        Checks whether installed updates require a reboot
+        """
+
+        cmd = Command.from_list(["test", "-f", "/var/run/reboot-required"])
+        host = await self.get_sshconfig(user="root")
+        _, _, status, exception = await cmd.on_host(host=host).run(
+            returncode=True, wait=self._wait
+        )
+
+        if status[-1] not in (0, 1):  # e.g. ssh failed
+            raise exception
+
+        return status[-1] == 0
+
     async def get_sshconfig(self, user: Optional[str] = None) -> SSHConfigABC:
         """
         Generates SSH configuration for commands that are supposed to be executed on this node.
@@ -151,100 +219,187 @@ class Node(NodeABC):
 
         return status == 0
 
-    async def reboot(self):
+    async def delete(self):
+        """
+        Deletes the underlying server. The node object becomes unusable.
+        """
+
+        self._log.info(self._l("Deleting server ..."))
+
+        await self._provider.delete_server(self._server)
+
+    async def reboot(self, wait: bool = True):
+        """
+        Reboots the server.
+
+        Args:
+            wait : Returns only once the provider reports the reboot as finished. Otherwise, SSH may still be reachable from before the reboot.
+        """
+
+        await self._provider.reboot_server(self._server, wait=wait)
+
+    async def set_label(self, key: str, value: str):
         """
-        Triggers a server reboot.
+        Sets a label of the node / server via the provider.
+
+        Args:
+            key : Name of label.
+            value : Value of label.
         """
 
-        self._server.reboot()
+        labels = self.labels
+        labels[key] = value
+
+        self._server = await self._provider.set_labels(self._server, labels)
 
     async def update(self):
         """
-        Updates the internal cloud API server object by requesting new information about the node from the cloud API.
+        Updates the internal server object by requesting new information about the node from the provider.
         """
 
-        self._server = self._client.servers.get_by_name(name=self.name)
+        server = await self._provider.get_server(self.name)
+        if server is None:
+            raise NodeNotFound(
+                f"node '{self.name:s}' in '{self._prefix:s}' could not be found"
+            )
+
+        self._server = server
 
-    async def bootstrap(self):
+    async def bootstrap(self, profile: str = BOOTSTRAP_PROFILE):
         """
         Bootstraps scherbelberg's basic infrastructure on the node, i.e.
 
-        - System updates
+        - System updates, followed by a reboot if the updates require one
         - Secure user & SSH configuration
         - TLS/SSL certificate
-        - Conda-forge base install via mamba-forge
+        - Conda-forge base install via mamba-forge, for the architecture of the node
+
+        Output of the bootstrap scripts is appended to ``.<prefix>/logs/<suffix>.log``.
+
+        Args:
+            profile : System updates, either ``full`` (default) for all updates, ``security`` for security updates only or ``none``.
         """
 
-        await self.wait_for_ssh(user="root")
+        assert profile in BOOTSTRAP_PROFILES
 
-        self._log.info(self._l("Create folder for root files on node ..."))
-        await Command.from_list(["mkdir", f"/root/.{self._prefix:s}"]).on_host(
-            host=await self.get_sshconfig(user="root")
-        ).run(wait=self._wait)
+        await self.wait_for_ssh(user="root")
 
-        self._log.info(self._l("Copying root files to node ..."))
-        await Command.from_scp(
-            *[
-                os.path.abspath(
-                    os.path.join(
-                        os.path.dirname(__file__),
-                        "..",
-                        "share",
-                        fn,
+        with self._span("upload_root"):
+            self._log.info(self._l("Create folder for root files on node ..."))
+            await Command.from_list(["mkdir", f"/root/.{self._prefix:s}"]).on_host(
+                host=await self.get_sshconfig(user="root")
+            ).run(wait=self._wait)
+
+            self._log.info(self._l("Copying root files to node ..."))
+            await Command.from_scp(
+                *[
+                    os.path.abspath(
+                        os.path.join(
+                            os.path.dirname(__file__),
+                            "..",
+                            "share",
+                            fn,
+                        )
                     )
-                )
-                for fn in (
-                    "bootstrap_01.sh",
-                    "bootstrap_02.sh",
-                    "sshd_config.patch",
-                )
-            ],
-            target=f"~/.{self._prefix:s}/",
-            host=await self.get_sshconfig(user="root"),
-        ).run(wait=self._wait)
+                    for fn in (
+                        "bootstrap_01.sh",
+                        "bootstrap_02.sh",
+                        "sshd_config.patch",
+                    )
+                ],
+                target=f"~/.{self._prefix:s}/",
+                host=await self.get_sshconfig(user="root"),
+            ).run(wait=self._wait)
 
         self._log.info(self._l("Running first bootstrap script ..."))
-        await Command.from_list(["bash", f"/root/.{self._prefix:s}/bootstrap_01.sh"]).on_host(
-            host=await self.get_sshconfig(user="root")
-        ).run(wait=self._wait)
+        await self._run_script(
+            "bootstrap_01",
+            Command.from_list(
+                ["bash", f"/root/.{self._prefix:s}/bootstrap_01.sh", profile]
+            ).on_host(host=await self.get_sshconfig(user="root")),
+        )
 
-        self._log.info(self._l("Rebooting ..."))
-        await self.reboot()
-        await self.wait_for_ssh(user="root")
+        if await self._reboot_required():
+            self._log.info(self._l("Rebooting ..."))
+            with self._span("reboot"):
+                await self.reboot()
+            await self.wait_for_ssh(user="root")
+        else:
+            self._log.info(self._l("No reboot required."))
 
         self._log.info(self._l("Running second bootstrap script ..."))
-        await Command.from_list(["bash", f"/root/.{self._prefix:s}/bootstrap_02.sh", self._prefix]).on_host(
-            host=await self.get_sshconfig(user="root")
-        ).run(wait=self._wait)
+        await self._run_script(
+            "bootstrap_02",
+            Command.from_list(
+                ["bash", f"/root/.{self._prefix:s}/bootstrap_02.sh", self._prefix]
+            ).on_host(host=await self.get_sshconfig(user="root")),
+        )
         await self.wait_for_ssh(user=f"{self._prefix:s}user")
 
-        self._log.info(self._l("Create folder for user files on node ..."))
-        await Command.from_list(["mkdir", f"/home/{self._prefix:s}user/.{self._prefix:s}"]).on_host(
-            host=await self.get_sshconfig()
-        ).run(wait=self._wait)
+        with self._span("upload_user"):
+            self._log.info(self._l("Create folder for user files on node ..."))
+            await Command.from_list(
+                ["mkdir", f"/home/{self._prefix:s}user/.{self._prefix:s}"]
+            ).on_host(host=await self.get_sshconfig()).run(wait=self._wait)
+
+            self._log.info(self._l("Copying user files to node ..."))
+            await Command.from_scp(
+                *[
+                    os.path.abspath(
+                        os.path.join(
+                            os.path.dirname(__file__),
+                            "..",
+                            "share",
+                            fn,
+                        )
+                    )
+                    for fn in (
+                        "bootstrap_03.sh",
+                        "bootstrap_scheduler.sh",
+                        "bootstrap_worker.sh",
+                        "requirements_conda.txt",
+                    )
+                ],
+                *[
+                    os.path.abspath(
+                        os.path.join(os.getcwd(), f".{self._prefix:s}", suffix)
+                    )
+                    for suffix in (
+                        "ca.pub",
+                        "cert",
+                        "cert.pub",
+                    )
+                ],
+                target=f"~/.{self._prefix:s}/",
+                host=await self.get_sshconfig(),
+            ).run(wait=self._wait)
+
+        self._log.info(self._l("Running third (user) bootstrap script ..."))
+        await self._run_script(
+            "bootstrap_03",
+            Command.from_list(
+                [
+                    "bash",
+                    f"/home/{self._prefix:s}user/.{self._prefix:s}/bootstrap_03.sh",
+                    self._prefix,
+                    f"{sys.version_info.major:d}.{sys.version_info.minor:d}",
+                ]
+            ).on_host(host=await self.get_sshconfig()),
+        )
+
+        self._log.info(self._l("Bootstrapping done."))
+
+    async def update_certs(self):
+        """
+        Replaces the TLS/SSL certificate on the node by the one found in the local ``.<prefix>`` folder and restarts the Dask scheduler or worker, whichever runs on the node.
+        """
+
+        await self.wait_for_ssh()
 
-        self._log.info(self._l("Copying user files to node ..."))
+        self._log.info(self._l("Copying certificates to node ..."))
         await Command.from_scp(
             *[
-                os.path.abspath(
-                    os.path.join(
-                        os.path.dirname(__file__),
-                        "..",
-                        "share",
-                        fn,
-                    )
-                )
-                for fn in (
-                    "bootstrap_03.sh",
-                    "bootstrap_scheduler.sh",
-                    "bootstrap_worker.sh",
-                    "requirements_conda.txt",
-                )
-            ],
-            *[
-                os.path.abspath(
-                    os.path.join(os.getcwd(), f".{self._prefix:s}", suffix)
-                )
+                os.path.abspath(os.path.join(os.getcwd(), f".{self._prefix:s}", suffix))
                 for suffix in (
                     "ca.pub",
                     "cert",
@@ -255,85 +410,177 @@ class Node(NodeABC):
             host=await self.get_sshconfig(),
         ).run(wait=self._wait)
 
-        self._log.info(self._l("Running third (user) bootstrap script ..."))
+        self._log.info(self._l("Restarting dask ..."))
         await Command.from_list(
             [
-                "bash",
-                f"/home/{self._prefix:s}user/.{self._prefix:s}/bootstrap_03.sh",
-                self._prefix,
-                f"{sys.version_info.major:d}.{sys.version_info.minor:d}",
+                "sudo",
+                "systemctl",
+                "restart",
+                "dask_scheduler" if self.suffix == "scheduler" else "dask_worker",
             ]
         ).on_host(host=await self.get_sshconfig()).run(wait=self._wait)
 
-        self._log.info(self._l("Bootstrapping done."))
-
-    async def start_scheduler(self, dask_ipc: int, dask_dash: int):
+    async def start_scheduler(
+        self,
+        dask_ipc: int,
+        dask_dash: int,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
+    ):
         """
         Starts Dask scheduler on node.
 
         Args:
             dask_ipc : Port used for Dask's interprocess communication.
             dask_dash : Port used for Dask's dashboard.
+            dask_protocol : Protocol used for Dask's interprocess communication within the private network.
+            dask_private : Port used for Dask's interprocess communication within the private network if ``dask_protocol`` is not ``tls``.
         """
 
         assert dask_ipc >= 2 ** 10
         assert dask_dash >= 2 ** 10
+        assert dask_private >= 2 ** 10
 
-        assert dask_ipc != dask_dash
+        assert len({dask_ipc, dask_dash, dask_private}) == 3
+        assert dask_protocol in DASK_PROTOCOLS
 
         await self.wait_for_ssh()
 
         self._log.info(self._l("Staring dask scheduler ..."))
 
-        await Command.from_list(
-            [
-                "bash",
-                f"/home/{self._prefix:s}user/.{self._prefix:s}/bootstrap_scheduler.sh",
-                f"{dask_ipc:d}",
-                f"{dask_dash:d}",
-                self._prefix,
-            ]
-        ).on_host(host=await self.get_sshconfig()).run(wait=self._wait)
+        await self._run_script(
+            "start_scheduler",
+            Command.from_list(
+                [
+                    "bash",
+                    f"/home/{self._prefix:s}user/.{self._prefix:s}/bootstrap_scheduler.sh",
+                    f"{dask_ipc:d}",
+                    f"{dask_dash:d}",
+                    self._prefix,
+                    dask_protocol,
+                    f"{dask_private:d}",
+                ]
+            ).on_host(host=await self.get_sshconfig()),
+        )
 
         self._log.info(self._l("Dask scheduler started."))
 
     async def start_worker(
-        self, dask_ipc: int, dask_dash: int, dask_nanny: int, scheduler_ip4: str
+        self,
+        dask_ipc: int,
+        dask_dash: int,
+        dask_nanny: int,
+        scheduler_ip4: str,
+        dask_protocol: str = DASK_PROTOCOL,
+        dask_private: int = DASK_PRIVATE,
     ):
         """
-        Starts Dask scheduler on node.
+        Starts Dask worker on node.
+        The worker provides the abstract Dask resources of its pool, see :attr:`scherbelberg.Node.resources`.
 
         Args:
             dask_ipc : Port used for Dask's interprocess communication.
             dask_dash : Port used for Dask's dashboard.
             dask_nanny : Port used for Dask's nanny.
-            scheduler_ip4 : IPv4 address of scheduler node.
+            scheduler_ip4 : IPv4 address of scheduler node. Must be the private address if ``dask_protocol`` is not ``tls``.
+            dask_protocol : Protocol used for Dask's interprocess communication within the private network.
+            dask_private : Port used for Dask's interprocess communication within the private network if ``dask_protocol`` is not ``tls``.
         """
 
         assert dask_ipc >= 2 ** 10
         assert dask_dash >= 2 ** 10
         assert dask_nanny >= 2 ** 10
+        assert dask_private >= 2 ** 10
 
-        assert len({dask_ipc, dask_dash, dask_nanny}) == 3
+        assert len({dask_ipc, dask_dash, dask_nanny, dask_private}) == 4
+        assert dask_protocol in DASK_PROTOCOLS
 
         await self.wait_for_ssh()
 
         self._log.info(self._l("Staring dask worker ..."))
 
-        await Command.from_list(
-            [
-                "bash",
-                f"/home/{self._prefix:s}user/.{self._prefix:s}/bootstrap_worker.sh",
-                scheduler_ip4,
-                f"{dask_ipc:d}",
-                f"{dask_dash:d}",
-                f"{dask_nanny:d}",
-                self._prefix,
-            ]
-        ).on_host(host=await self.get_sshconfig()).run(wait=self._wait)
+        await self._run_script(
+            "start_worker",
+            Command.from_list(
+                [
+                    "bash",
+                    f"/home/{self._prefix:s}user/.{self._prefix:s}/bootstrap_worker.sh",
+                    scheduler_ip4,
+                    f"{dask_ipc:d}",
+                    f"{dask_dash:d}",
+                    f"{dask_nanny:d}",
+                    self._prefix,
+                    dask_protocol,
+                    f"{dask_private:d}",
+                    self.private_ip4,
+                    ",".join(
+                        f"{key:s}={value:g}"
+                        for key, value in sorted(self.resources.items())
+                    ),
+                ]
+            ).on_host(host=await self.get_sshconfig()),
+        )
 
         self._log.info(self._l("Dask worker started."))
 
+    async def benchmark_link(
+        self,
+        target: NodeABC,
+        address: str,
+        size: int = BENCH_SIZE,
+        pings: int = BENCH_PINGS,
+        port: int = BENCH_PORT,
+        timeout: float = BENCH_TIMEOUT,
+    ) -> Dict[str, Optional[float]]:
+        """
+        Measures latency and throughput from this node towards another node.
+        The other node listens for exactly one connection while this node connects, times round trips and sends incompressible data.
+        Requires ``bench_net.py`` in ``~/.<prefix>/`` on both nodes, see :meth:`scherbelberg.Cluster.benchmark_network`.
+
+        Args:
+            target : Receiving node.
+            address : IPv4 address of receiving node, either public or private.
+            size : Number of bytes sent.
+            pings : Number of round trips.
+            port : TCP port the receiving node listens on.
+            timeout : Timeout in seconds of both sides.
+        Returns:
+            Median round-trip time in seconds as ``latency``, standard deviation of round-trip times in seconds as ``jitter`` and bytes per second as ``throughput``.
+        """
+
+        assert size > 0
+        assert pings >= 0
+
+        script = f"/home/{self._prefix:s}user/.{self._prefix:s}/bench_net.py"
+
+        results = await gather(
+            Command.from_list(
+                [
+                    "python3",
+                    script,
+                    "measure",
+                    address,
+                    f"{port:d}",
+                    f"{size:d}",
+                    f"{pings:d}",
+                    f"{timeout:f}",
+                ]
+            )
+            .on_host(host=await self.get_sshconfig())
+            .run(wait=self._wait),
+            Command.from_list(["python3", script, "serve", f"{port:d}", f"{timeout:f}"])
+            .on_host(host=await target.get_sshconfig())
+            .run(wait=self._wait),
+            return_exceptions=True,  # both sides end, server at latest after timeout
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+
+        (output, _), _ = results
+
+        return json.loads(output[0])
+
     async def wait_for_ssh(self, user: Optional[str] = None):
         """
         Keeps pinging the server on SSH via :meth:`scherbelberg.Node.ping_ssh` until success in ``wait`` second intervals.
@@ -347,12 +594,13 @@ class Node(NodeABC):
 
         self._log.info(self._l("[%s] Waiting for SSH ..."), user)
 
-        while True:
-            ssh_up = await self.ping_ssh(user)
-            if ssh_up:
-                break
-            await sleep(self._wait)
-            self._log.info(self._l("[%s] Continuing to wait for SSH ..."), user)
+        with self._span("ssh_wait", user=user):
+            while True:
+                ssh_up = await self.ping_ssh(user)
+                if ssh_up:
+                    break
+                await sleep(self._wait)
+                self._log.info(self._l("[%s] Continuing to wait for SSH ..."), user)
 
         self._log.info(self._l("[%s] SSH up."), user)
 
@@ -364,13 +612,65 @@ class Node(NodeABC):
 
         return self._server.name
 
+    @property
+    def architecture(self) -> Optional[str]:
+        """
+        Architecture of node / server, e.g. ``x86`` or ``arm``, if known from the catalog
+        """
+
+        return self._server.labels.get("architecture", None)
+
+    @property
+    def created(self) -> datetime:
+        """
+        Point in time of creation of node / server
+        """
+
+        return self._server.created
+
+    @property
+    def datacenter(self) -> str:
+        """
+        Name of data center of node / server
+        """
+
+        return self._server.datacenter
+
+    @property
+    def image(self) -> Optional[str]:
+        """
+        Name of operating system image of node / server, if known
+        """
+
+        return self._server.image
+
+    @property
+    def index(self) -> Optional[int]:
+        """
+        Number of node / server if it is a worker
+        """
+
+        suffix = self.suffix
+        if not suffix.startswith("worker"):
+            return None
+
+        return int(suffix[len("worker") :])
+
     @property
     def labels(self) -> Dict[str, str]:
         """
         Labels of node / server
         """
 
-        return self._server.labels.copy()
+        return self._server.labels
+
+    @property
+    def pool(self) -> str:
+        """
+        Name of pool of node / server if it is a worker
+        """
+
+        return self._server.labels.get("pool", POOL)
 
     @property
     def public_ip4(self) -> str:
@@ -378,7 +678,7 @@ class Node(NodeABC):
         Public IPv4 address of node / server
         """
 
-        return self._server.public_net.ipv4.ip
+        return self._server.public_ip4
 
     @property
     def private_ip4(self) -> str:
@@ -386,9 +686,49 @@ class Node(NodeABC):
         Private IPv4 address of node / server
         """
 
-        assert len(self._server.private_net) == 1
+        assert len(self._server.private_ip4s) > 0
+
+        return self._server.private_ip4s[0]
+
+    @property
+    def private_ip4s(self) -> List[str]:
+        """
+        Private IPv4 addresses of node / server in all attached networks
+        """
+
+        return self._server.private_ip4s
+
+    @property
+    def resources(self) -> Dict[str, float]:
+        """
+        Abstract Dask resources of node / server if it is a worker
+        """
+
+        return Pool.resources_from_labels(self._server.labels)
+
+    @property
+    def server(self) -> InstanceABC:
+        """
+        Provider-neutral snapshot of server behind node
+        """
+
+        return self._server
+
+    @property
+    def servertype(self) -> str:
+        """
+        Name of server type of node / server
+        """
+
+        return self._server.servertype
+
+    @property
+    def stage(self) -> Optional[str]:
+        """
+        Last completed stage of the creation of node / server, if recorded
+        """
 
-        return self._server.private_net[0].ip
+        return self._server.labels.get("stage")
 
     @property
     def suffix(self) -> str:
@@ -413,11 +753,12 @@ class Node(NodeABC):
     async def from_name(
         cls,
         name: str,
-        client: Client,
+        provider: ProviderABC,
         fn_private: str,
         prefix: str,
         wait: float,
         log: Union[Logger, None] = None,
+        timeline: Optional[TimelineABC] = None,
     ) -> NodeABC:
         """
         Creates :class:`scherbelberg.Node` object by connecting to an existing server.
@@ -425,24 +766,26 @@ class Node(NodeABC):
 
         Args:
             name : Full name of node / server.
-            client : Cloud API client object.
+            provider : Source of servers, e.g. :class:`scherbelberg.HetznerProvider`.
             fn_private : Location of private SSH key.
             prefix : Name of cluster, used as a prefix in names of every component.
             wait : Timeout in seconds before actions are repeated or exceptions are raised.
             log : Allows to pass custom logger objects. Defaults to scherbelberg's own default logger.
+            timeline : Records timed phases of bootstrapping and starting Dask, if provided.
         Returns:
             New node object
         """
 
-        server = client.servers.get_by_name(name=name)
+        server = await provider.get_server(name)
         if server is None:
             raise NodeNotFound(f"node '{name:s}' in '{prefix:s}' could not be found")
 
         return cls(
             server=server,
-            client=client,
+            provider=provider,
             fn_private=fn_private,
             prefix=prefix,
             wait=wait,
             log=log,
+            timeline=timeline,
         )
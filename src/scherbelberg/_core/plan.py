@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/plan.py: Rank cluster configurations by price and performance
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from math import ceil
+from statistics import median
+from typing import Any, Dict, List, Optional
+
+from hcloud import Client
+
+from .abc import CatalogABC
+from .catalog import CatalogServerTypeNotFound, get_catalog
+from .const import (
+    BENCH_WORKLOADS,
+    CATALOG_TTL,
+    HETZNER_ARCHITECTURES,
+    HETZNER_CPU_TYPES,
+    HETZNER_INSTANCE_TINY,
+    PLAN_LIMIT,
+    PLAN_OBJECTIVES,
+    PLAN_WORKERS,
+    PREFIX,
+    TOKENVAR,
+)
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_OBJECTIVES = {  # objective: ranked field of candidates
+    "core": "core_hourly",
+    "memory": "memory_hourly",
+    "throughput": "unit_price",
+}
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+async def plan_cluster(
+    cores: int = 0,
+    memory: float = 0.0,
+    worker_memory: float = 0.0,
+    budget: Optional[float] = None,
+    cpu_type: Optional[str] = None,
+    architecture: Optional[str] = None,
+    datacenters: Optional[List[str]] = None,
+    scheduler: str = HETZNER_INSTANCE_TINY,
+    results: Optional[List[Dict[str, Any]]] = None,
+    workload: Optional[str] = None,
+    throughput: float = 0.0,
+    objective: str = PLAN_OBJECTIVES[0],
+    max_workers: int = PLAN_WORKERS,
+    limit: int = PLAN_LIMIT,
+    prefix: str = PREFIX,
+    tokenvar: str = TOKENVAR,
+    client: Optional[Client] = None,
+    ttl: float = CATALOG_TTL,
+) -> List[Dict[str, Any]]:
+    """
+    Ranks clusters of identical workers, i.e. combinations of server type, number of workers and data center, by price.
+    For every server type and data center, the smallest number of workers satisfying all requirements is considered.
+    Prices are gross hourly prices from the catalog, see :func:`scherbelberg.get_catalog`, including the scheduler.
+    Throughput is estimated from results of :func:`scherbelberg.bench_workloads` on clusters of identical workers,
+    assuming it scales linearly with the number of workers. Server types without results have no throughput estimate.
+
+    Args:
+        cores : Minimum number of cores of all workers.
+        memory : Minimum memory of all workers in GB.
+        worker_memory : Minimum memory per worker in GB.
+        budget : Maximum hourly price of cluster. Defaults to no limit.
+        cpu_type : Type of CPU of workers, either ``shared`` or ``dedicated``. Defaults to both.
+        architecture : Architecture of workers, either ``x86`` or ``arm``. Defaults to both.
+        datacenters : Names of data centers to consider. Defaults to all.
+        scheduler : Compute instance type used for Dask scheduler.
+        results : Results of :func:`scherbelberg.bench_workloads`.
+        workload : Workload of ``results`` throughput is estimated for, e.g. ``array``.
+        throughput : Minimum estimated throughput of ``workload`` in units per second. Requires ``results`` and ``workload``.
+        objective : Ranks by price per ``core`` hour (default), per GB of ``memory`` per hour or per unit of ``throughput`` of ``workload``.
+        max_workers : Maximum number of workers.
+        limit : Maximum number of ranked clusters.
+        prefix : Name of cluster used in emitted ``scherbelberg create`` commands.
+        tokenvar : Name of the environment variable holding the cloud API login token.
+        client : Cloud API client. Defaults to a new client logged in via ``tokenvar``.
+        ttl : Maximum age of cached catalog in seconds.
+    Returns:
+        Ranked clusters, cheapest first, including ready-to-run ``scherbelberg create`` commands.
+    """
+
+    assert cores >= 0
+    assert memory >= 0
+    assert worker_memory >= 0
+    assert budget is None or budget > 0
+    assert cpu_type is None or cpu_type in HETZNER_CPU_TYPES
+    assert architecture is None or architecture in HETZNER_ARCHITECTURES
+    assert workload is None or workload in BENCH_WORKLOADS
+    assert throughput >= 0
+    assert objective in PLAN_OBJECTIVES
+    assert max_workers > 0
+    assert limit > 0
+
+    estimates = {}
+    if results is not None and workload is not None:
+        estimates = _plan_estimates(results, workload)
+    if throughput > 0 or objective == "throughput":
+        assert workload is not None and len(estimates) > 0
+
+    catalog = await get_catalog(
+        tokenvar=tokenvar,
+        client=client,
+        ttl=ttl,
+        datacenters=datacenters,
+        servertypes=[scheduler],
+    )
+    if datacenters is None:
+        datacenters = [datacenter["name"] for datacenter in catalog.get_datacenters()]
+
+    candidates = []
+    for datacenter in datacenters:
+        candidates.extend(
+            _plan_datacenter(
+                catalog,
+                datacenter=datacenter,
+                scheduler=scheduler,
+                cores=cores,
+                memory=memory,
+                worker_memory=worker_memory,
+                cpu_type=cpu_type,
+                architecture=architecture,
+                estimates=estimates,
+                throughput=throughput,
+                max_workers=max_workers,
+            )
+        )
+
+    if budget is not None:
+        candidates = [
+            candidate for candidate in candidates if candidate["hourly"] <= budget
+        ]
+    if objective == "throughput":
+        candidates = [
+            candidate for candidate in candidates if candidate["throughput"] is not None
+        ]
+
+    key = _OBJECTIVES[objective]
+    candidates.sort(key=lambda candidate: (candidate[key], candidate["hourly"]))
+    candidates = candidates[:limit]
+
+    for rank, candidate in enumerate(candidates, start=1):
+        candidate["rank"] = rank
+        candidate["command"] = (
+            f"scherbelberg create --prefix {prefix:s} --scheduler {scheduler:s} "
+            f"--worker {candidate['servertype']:s} --workers {candidate['workers']:d} "
+            f"--datacenter {candidate['datacenter']:s}"
+        )
+
+    return candidates
+
+
+def _plan_datacenter(
+    catalog: CatalogABC,
+    datacenter: str,
+    scheduler: str,
+    cores: int,
+    memory: float,
+    worker_memory: float,
+    cpu_type: Optional[str],
+    architecture: Optional[str],
+    estimates: Dict[str, float],
+    throughput: float,
+    max_workers: int,
+) -> List[Dict[str, Any]]:
+
+    try:
+        specification = catalog.get_servertype(scheduler, datacenter=datacenter)
+    except CatalogServerTypeNotFound:  # scheduler not offered, skip data center
+        return []
+    scheduler_hourly = specification["price_hourly_gross"]
+
+    candidates = []
+    for servertype in catalog.get_servertypes(datacenter):
+        try:
+            servertype = catalog.get_servertype(
+                servertype["name"], datacenter=datacenter
+            )
+        except CatalogServerTypeNotFound:  # priced but not supported
+            continue
+        if servertype["deprecated"]:
+            continue
+        if cpu_type is not None and servertype["cpu_type"] != cpu_type:
+            continue
+        if architecture is not None and servertype["architecture"] != architecture:
+            continue
+        if servertype["memory"] < worker_memory:
+            continue
+
+        estimate = estimates.get(servertype["name"], None)
+        if throughput > 0 and estimate is None:
+            continue
+
+        workers = max(
+            1,
+            ceil(cores / servertype["cores"]),
+            ceil(memory / servertype["memory"]),
+            0 if throughput == 0 else ceil(throughput / estimate),
+        )
+        if workers > max_workers:
+            continue
+
+        hourly = scheduler_hourly + workers * servertype["price_hourly_gross"]
+        total = None if estimate is None else workers * estimate
+        candidates.append(
+            {
+                "datacenter": datacenter,
+                "servertype": servertype["name"],
+                "workers": workers,
+                "cpu_type": servertype["cpu_type"],
+                "architecture": servertype["architecture"],
+                "cores": workers * servertype["cores"],
+                "memory": workers * servertype["memory"],
+                "hourly": hourly,
+                "core_hourly": hourly / (workers * servertype["cores"]),
+                "memory_hourly": hourly / (workers * servertype["memory"]),
+                "throughput": total,
+                "unit_price": None if total is None else hourly / 3600 / total,
+            }
+        )
+
+    return candidates
+
+
+def _plan_estimates(results: List[Dict[str, Any]], workload: str) -> Dict[str, float]:
+
+    throughputs = {}
+    for result in results:
+        if result["workload"] != workload or result["error"] is not None:
+            continue
+        if len(result["workers"]) != 1:  # mixed server types, not attributable
+            continue
+        (servertype, count), *_ = result["workers"].items()
+        throughputs.setdefault(servertype, []).append(result["throughput"] / count)
+
+    return {servertype: median(values) for servertype, values in throughputs.items()}
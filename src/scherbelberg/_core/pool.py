@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/pool.py: Pools of workers
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import re
+from typing import Dict, List, Optional
+
+from .abc import NodeABC, PoolABC
+from .const import HETZNER_DATACENTER, HETZNER_INSTANCE_TINY, POOL, WORKERS
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+_NAME = re.compile(r"^[a-z0-9]([a-z0-9_.\-]{0,61}[a-z0-9])?$")  # cloud API label value
+_RESOURCE = re.compile(r"^[A-Za-z0-9]([A-Za-z0-9_.\-]{0,41}[A-Za-z0-9])?$")
+_RESOURCE_LABEL = "resource_"
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Pool(PoolABC):
+    """
+    Describes a named pool of identical workers. Immutable.
+
+    Args:
+        name : Name of pool. Lower case letters, digits, ``-``, ``_`` and ``.`` only.
+        servertype : Compute instance type used for the workers of this pool.
+        workers : Number of workers in pool.
+        datacenter : Target data center of this pool.
+        resources : Abstract Dask resources provided by every worker of this pool, e.g. ``{"MEM": 1}``.
+    """
+
+    def __init__(
+        self,
+        name: str = POOL,
+        servertype: str = HETZNER_INSTANCE_TINY,
+        workers: int = WORKERS,
+        datacenter: str = HETZNER_DATACENTER,
+        resources: Optional[Dict[str, float]] = None,
+    ):
+
+        if resources is None:
+            resources = {}
+
+        assert _NAME.match(name) is not None
+        assert len(servertype) > 0
+        assert workers > 0
+        assert len(datacenter) > 0
+        assert all(_RESOURCE.match(key) is not None for key in resources.keys())
+        assert all(value >= 0 for value in resources.values())
+
+        self._name = name
+        self._servertype = servertype
+        self._workers = workers
+        self._datacenter = datacenter
+        self._resources = {key: float(value) for key, value in resources.items()}
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f'<Pool name={self._name:s} servertype={self._servertype:s} workers={self._workers:d} datacenter={self._datacenter:s} resources="{self.resources_str:s}">'
+
+    def __str__(self) -> str:
+        """
+        Specification string, see :meth:`scherbelberg.Pool.from_str`
+        """
+
+        return f"{self._name:s}:{self._servertype:s}:{self._workers:d}:{self._datacenter:s}:{self.resources_str:s}"
+
+    @property
+    def name(self) -> str:
+        """
+        Name of pool
+        """
+
+        return self._name
+
+    @property
+    def servertype(self) -> str:
+        """
+        Compute instance type used for the workers of this pool
+        """
+
+        return self._servertype
+
+    @property
+    def workers(self) -> int:
+        """
+        Number of workers in pool
+        """
+
+        return self._workers
+
+    @property
+    def datacenter(self) -> str:
+        """
+        Target data center of this pool
+        """
+
+        return self._datacenter
+
+    @property
+    def resources(self) -> Dict[str, float]:
+        """
+        Abstract Dask resources provided by every worker of this pool
+        """
+
+        return self._resources.copy()
+
+    @property
+    def resources_str(self) -> str:
+        """
+        Abstract Dask resources as expected by ``dask-worker --resources``
+        """
+
+        return ",".join(
+            f"{key:s}={value:g}" for key, value in sorted(self._resources.items())
+        )
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        """
+        Cloud API labels describing pool membership of a worker
+        """
+
+        labels = {"pool": self._name}
+        labels.update(
+            {
+                f"{_RESOURCE_LABEL:s}{key:s}": f"{value:g}"
+                for key, value in self._resources.items()
+            }
+        )
+
+        return labels
+
+    @classmethod
+    def from_str(
+        cls,
+        spec: str,
+        datacenter: str = HETZNER_DATACENTER,
+    ) -> PoolABC:
+        """
+        Parses a pool specification of the form ``NAME:SERVERTYPE:WORKERS[:DATACENTER[:RESOURCES]]``, e.g. ``mem:ccx52:4::MEM=1,CPU=1``.
+
+        Args:
+            spec : Specification string.
+            datacenter : Data center used if not part of the specification.
+        Returns:
+            New pool object.
+        """
+
+        fragments = spec.split(":")
+        if not 3 <= len(fragments) <= 5:
+            raise ValueError(f'invalid pool specification "{spec:s}"')
+        fragments.extend([""] * (5 - len(fragments)))
+        name, servertype, workers, datacenter_, resources = fragments
+
+        return cls(
+            name=name,
+            servertype=servertype,
+            workers=int(workers),
+            datacenter=datacenter if len(datacenter_) == 0 else datacenter_,
+            resources={
+                key: float(value)
+                for key, value in (
+                    item.split("=") for item in resources.split(",") if len(item) > 0
+                )
+            },
+        )
+
+    @classmethod
+    def from_nodes(cls, nodes: List[NodeABC]) -> List[PoolABC]:
+        """
+        Reconstructs pools from the labels of existing worker nodes.
+
+        Args:
+            nodes : Worker nodes.
+        Returns:
+            Pools, sorted by name.
+        """
+
+        members = {}
+        for node in nodes:
+            members.setdefault(node.labels.get("pool", POOL), []).append(node)
+
+        return [
+            cls(
+                name=name,
+                servertype=members[name][0].servertype,
+                workers=len(members[name]),
+                datacenter=members[name][0].datacenter,
+                resources=cls.resources_from_labels(members[name][0].labels),
+            )
+            for name in sorted(members.keys())
+        ]
+
+    @staticmethod
+    def resources_from_labels(labels: Dict[str, str]) -> Dict[str, float]:
+        """
+        Extracts abstract Dask resources from cloud API labels.
+
+        Args:
+            labels : Cloud API labels of a worker node.
+        Returns:
+            Abstract Dask resources.
+        """
+
+        return {
+            key[len(_RESOURCE_LABEL) :]: float(value)
+            for key, value in labels.items()
+            if key.startswith(_RESOURCE_LABEL)
+        }
@@ -58,6 +58,7 @@ class Process(ProcessABC):
         self._errors = []
         self._status = []
         self._exception = None
+        self._received = 0
 
     def __repr__(self) -> str:
         """
@@ -102,6 +103,14 @@ class Process(ProcessABC):
 
         return any((proc.poll() is None for proc in self._procs))
 
+    @property
+    def received(self) -> int:
+        """
+        Number of bytes received via standard output and standard error streams, available once completed
+        """
+
+        return self._received
+
     def _complete(
         self,
         timeout: Union[float, int, None] = None,
@@ -118,6 +127,7 @@ class Process(ProcessABC):
                 proc.kill()
                 out, err = proc.communicate()
 
+            self._received += len(out or b"") + len(err or b"")
             self._output.append(self._com_to_str(out))
             self._errors.append(self._com_to_str(err))
             self._status.append(int(proc.returncode))
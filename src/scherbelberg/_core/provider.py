@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/provider.py: Interface of sources of servers
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from abc import abstractmethod
+from asyncio import sleep
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .abc import CatalogABC, InstanceABC, NetworkABC, ProviderABC, ResourceABC
+from .const import CATALOG_TTL, WAIT
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+STATUS_RUNNING = "running"
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Resource(ResourceABC):
+    """
+    Named resource of a provider, e.g. an ssh key or a firewall. Immutable.
+
+    Args:
+        name : Name of resource.
+        handle : Provider-specific object behind the resource.
+    """
+
+    def __init__(self, name: str, handle: Any = None):
+
+        self._name = name
+        self._handle = handle
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<{type(self).__name__:s} name={self._name:s}>"
+
+    @property
+    def handle(self) -> Any:
+        """
+        Provider-specific object behind the resource
+        """
+
+        return self._handle
+
+    @property
+    def name(self) -> str:
+        """
+        Name of resource
+        """
+
+        return self._name
+
+
+@typechecked
+class Network(Resource, NetworkABC):
+    """
+    Private network of a provider. Immutable.
+
+    Args:
+        name : Name of network.
+        ip_range : Address range of network.
+        handle : Provider-specific object behind the network.
+    """
+
+    def __init__(self, name: str, ip_range: str, handle: Any = None):
+
+        super().__init__(name=name, handle=handle)
+        self._ip_range = ip_range
+
+    @property
+    def ip_range(self) -> str:
+        """
+        Address range of network
+        """
+
+        return self._ip_range
+
+
+@typechecked
+class Instance(Resource, InstanceABC):
+    """
+    Provider-neutral snapshot of a server. Immutable.
+
+    Args:
+        name : Full name of server.
+        status : Status of server, ``running`` once it can be booted into.
+        created : Point in time of creation of server.
+        datacenter : Name of data center of server.
+        servertype : Name of server type of server.
+        image : Name of operating system image of server, if known.
+        labels : Labels of server.
+        public_ip4 : Public IPv4 address of server.
+        private_ip4s : Private IPv4 addresses of server in all attached networks.
+        handle : Provider-specific object behind the server.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        created: datetime,
+        datacenter: str,
+        servertype: str,
+        image: Optional[str],
+        labels: Dict[str, str],
+        public_ip4: str,
+        private_ip4s: List[str],
+        handle: Any = None,
+    ):
+
+        super().__init__(name=name, handle=handle)
+
+        self._status = status
+        self._created = created
+        self._datacenter = datacenter
+        self._servertype = servertype
+        self._image = image
+        self._labels = labels.copy()
+        self._public_ip4 = public_ip4
+        self._private_ip4s = private_ip4s.copy()
+
+    def copy(self, **changes: Any) -> InstanceABC:
+        """
+        Returns a copy of the snapshot with some fields replaced.
+
+        Args:
+            changes : Fields to replace, named like the parameters of the constructor.
+        Returns:
+            New instance object.
+        """
+
+        fields = dict(
+            name=self._name,
+            status=self._status,
+            created=self._created,
+            datacenter=self._datacenter,
+            servertype=self._servertype,
+            image=self._image,
+            labels=self._labels,
+            public_ip4=self._public_ip4,
+            private_ip4s=self._private_ip4s,
+            handle=self._handle,
+        )
+        fields.update(changes)
+
+        return type(self)(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializes the snapshot without its handle, see :meth:`scherbelberg.Instance.from_dict`.
+
+        Returns:
+            JSON-compatible dictionary.
+        """
+
+        return dict(
+            name=self._name,
+            status=self._status,
+            created=self._created.isoformat(),
+            datacenter=self._datacenter,
+            servertype=self._servertype,
+            image=self._image,
+            labels=self._labels.copy(),
+            public_ip4=self._public_ip4,
+            private_ip4s=self._private_ip4s.copy(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> InstanceABC:
+        """
+        Restores a snapshot serialized by :meth:`scherbelberg.Instance.to_dict`.
+        It has no handle, providers look up the server by name if required.
+
+        Args:
+            data : Serialized snapshot.
+        Returns:
+            New instance object.
+        """
+
+        fields = dict(data)
+        fields["created"] = datetime.fromisoformat(fields["created"])
+
+        return cls(**fields)
+
+    @property
+    def created(self) -> datetime:
+        """
+        Point in time of creation of server
+        """
+
+        return self._created
+
+    @property
+    def datacenter(self) -> str:
+        """
+        Name of data center of server
+        """
+
+        return self._datacenter
+
+    @property
+    def image(self) -> Optional[str]:
+        """
+        Name of operating system image of server, if known
+        """
+
+        return self._image
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        """
+        Labels of server
+        """
+
+        return self._labels.copy()
+
+    @property
+    def private_ip4s(self) -> List[str]:
+        """
+        Private IPv4 addresses of server in all attached networks
+        """
+
+        return self._private_ip4s.copy()
+
+    @property
+    def public_ip4(self) -> str:
+        """
+        Public IPv4 address of server
+        """
+
+        return self._public_ip4
+
+    @property
+    def running(self) -> bool:
+        """
+        Is the server running?
+        """
+
+        return self._status == STATUS_RUNNING
+
+    @property
+    def servertype(self) -> str:
+        """
+        Name of server type of server
+        """
+
+        return self._servertype
+
+    @property
+    def status(self) -> str:
+        """
+        Status of server
+        """
+
+        return self._status
+
+
+@typechecked
+class Provider(ProviderABC):
+    """
+    Interface between scherbelberg and a source of servers, private networks, firewalls and ssh keys.
+    Every method is a coroutine. Providers implement all abstract methods, i.e. all except :meth:`scherbelberg.Provider.wait_for_server` and :meth:`scherbelberg.Provider.get_catalog`.
+    See :class:`scherbelberg.HetznerProvider` and :class:`scherbelberg.LocalProvider`.
+    """
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<{type(self).__name__:s}>"
+
+    @abstractmethod
+    async def create_ssh_key(self, name: str, public_key: str) -> ResourceABC:
+        """
+        Registers a public ssh key which is granted root access to new servers.
+
+        Args:
+            name : Name of ssh key.
+            public_key : Public key in OpenSSH format.
+        Returns:
+            New ssh key.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_ssh_key(self, name: str) -> Optional[ResourceABC]:
+        """
+        Looks up an ssh key by name.
+
+        Args:
+            name : Name of ssh key.
+        Returns:
+            ssh key if it exists.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_ssh_keys(self) -> List[ResourceABC]:
+        """
+        Lists all ssh keys.
+
+        Returns:
+            ssh keys.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_ssh_key(self, ssh_key: ResourceABC):
+        """
+        Deletes an ssh key.
+
+        Args:
+            ssh_key : ssh key.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def create_firewall(self, name: str, ports: List[int]) -> ResourceABC:
+        """
+        Creates a firewall admitting ICMP and incoming TCP connections on certain ports only.
+
+        Args:
+            name : Name of firewall.
+            ports : Open TCP ports.
+        Returns:
+            New firewall.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def update_firewall(
+        self, firewall: ResourceABC, ports: List[int]
+    ) -> ResourceABC:
+        """
+        Replaces the open TCP ports of a firewall.
+
+        Args:
+            firewall : Firewall.
+            ports : Open TCP ports.
+        Returns:
+            Updated firewall.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_firewall(self, name: str) -> Optional[ResourceABC]:
+        """
+        Looks up a firewall by name.
+
+        Args:
+            name : Name of firewall.
+        Returns:
+            Firewall if it exists.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_firewalls(self) -> List[ResourceABC]:
+        """
+        Lists all firewalls.
+
+        Returns:
+            Firewalls.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_firewall(self, firewall: ResourceABC):
+        """
+        Deletes a firewall.
+
+        Args:
+            firewall : Firewall.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def create_network(self, name: str, ip_range: str) -> NetworkABC:
+        """
+        Creates a private network.
+
+        Args:
+            name : Name of network.
+            ip_range : Address range of network.
+        Returns:
+            New network.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_network(self, name: str) -> Optional[NetworkABC]:
+        """
+        Looks up a private network by name.
+
+        Args:
+            name : Name of network.
+        Returns:
+            Network if it exists.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_networks(self) -> List[NetworkABC]:
+        """
+        Lists all private networks.
+
+        Returns:
+            Networks.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_network(self, network: NetworkABC):
+        """
+        Deletes a private network.
+
+        Args:
+            network : Network.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def create_server(
+        self,
+        name: str,
+        servertype: str,
+        image: str,
+        datacenter: str,
+        labels: Dict[str, str],
+        ssh_key: ResourceABC,
+        firewall: ResourceABC,
+    ):
+        """
+        Requests a new server. It may take a while until it is running, see :meth:`scherbelberg.Provider.wait_for_server`.
+
+        Args:
+            name : Full name of server.
+            servertype : Name of server type.
+            image : Name of operating system image.
+            datacenter : Name of data center.
+            labels : Labels of server.
+            ssh_key : ssh key granted root access.
+            firewall : Firewall applied to the server.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_server(self, name: str) -> Optional[InstanceABC]:
+        """
+        Looks up a server by name.
+
+        Args:
+            name : Full name of server.
+        Returns:
+            Server if it exists.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def get_servers(
+        self, labels: Optional[Dict[str, str]] = None
+    ) -> List[InstanceABC]:
+        """
+        Lists all servers, optionally only those carrying certain labels.
+
+        Args:
+            labels : Labels and their values which listed servers must carry, e.g. ``{"cluster": "cluster"}``. Defaults to all servers.
+        Returns:
+            Servers.
+        """
+
+        raise NotImplementedError()
+
+    async def wait_for_server(self, name: str, wait: float = WAIT) -> InstanceABC:
+        """
+        Keeps looking up a server until it is running in ``wait`` second intervals.
+
+        Args:
+            name : Full name of server.
+            wait : Interval in seconds between look-ups.
+        Returns:
+            Running server.
+        """
+
+        while True:
+            server = await self.get_server(name)
+            if server is not None and server.running:
+                return server
+            await sleep(wait)
+
+    @abstractmethod
+    async def attach_server(
+        self, server: InstanceABC, network: NetworkABC, ip: str
+    ) -> InstanceABC:
+        """
+        Attaches a server to a private network.
+
+        Args:
+            server : Server.
+            network : Network.
+            ip : Private IPv4 address of server within network.
+        Returns:
+            Updated server.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def set_labels(
+        self, server: InstanceABC, labels: Dict[str, str]
+    ) -> InstanceABC:
+        """
+        Replaces the labels of a server.
+
+        Args:
+            server : Server.
+            labels : New labels.
+        Returns:
+            Updated server.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def reboot_server(self, server: InstanceABC, wait: bool = False):
+        """
+        Triggers a reboot of a server.
+
+        Args:
+            server : Server.
+            wait : Returns only once the reboot is finished.
+        """
+
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete_server(self, server: InstanceABC, wait: bool = False):
+        """
+        Deletes a server.
+
+        Args:
+            server : Server.
+            wait : Returns only once the server is gone.
+        """
+
+        raise NotImplementedError()
+
+    async def get_catalog(self, ttl: float = CATALOG_TTL) -> Optional[CatalogABC]:
+        """
+        Provides data centers and server types offered by this provider, see :func:`scherbelberg.get_catalog`.
+
+        Args:
+            ttl : Maximum age of a cached catalog in seconds.
+        Returns:
+            Catalog or ``None`` if the provider does not distinguish server types and data centers.
+        """
+
+        return None
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/sshkey.py: Creating SSH keys
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import get_running_loop
+from functools import partial
+import os
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from .const import SSH_KEY_TYPE, SSH_KEY_TYPES
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+async def create_ssh_key(
+    fn_private: str,
+    fn_public: str,
+    comment: str,
+    key_type: str = SSH_KEY_TYPE,
+):
+    """
+    Creates an unencrypted SSH key pair in OpenSSH format without blocking the event loop, equivalent to ``ssh-keygen``.
+
+    Args:
+        fn_private : Path to private key file. Must not exist.
+        fn_public : Path to public key file. Must not exist.
+        comment : Comment appended to public key.
+        key_type : Type of key, either ``ed25519``, ``ecdsa`` (NIST P-256) or ``rsa`` (4096 bits).
+    """
+
+    await get_running_loop().run_in_executor(
+        None,
+        partial(
+            _create_ssh_key,
+            fn_private=fn_private,
+            fn_public=fn_public,
+            comment=comment,
+            key_type=key_type,
+        ),
+    )
+
+
+def _create_ssh_key(fn_private: str, fn_public: str, comment: str, key_type: str):
+
+    assert key_type in SSH_KEY_TYPES
+    assert len(comment) > 0
+
+    if key_type == "ed25519":
+        key = ed25519.Ed25519PrivateKey.generate()
+    elif key_type == "ecdsa":
+        key = ec.generate_private_key(ec.SECP256R1(), backend=default_backend())
+    else:
+        key = rsa.generate_private_key(
+            public_exponent=65537, key_size=4096, backend=default_backend()
+        )
+
+    private = key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.OpenSSH,
+        encryption_algorithm=serialization.NoEncryption(),  # no password
+    )
+    public = key.public_key().public_bytes(
+        encoding=serialization.Encoding.OpenSSH,
+        format=serialization.PublicFormat.OpenSSH,
+    )
+
+    fd = os.open(fn_private, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)  # ssh demands
+    with os.fdopen(fd, "wb") as f:
+        f.write(private)
+
+    with open(fn_public, "w", encoding="utf-8") as f:
+        f.write(f"{public.decode('utf-8'):s} {comment:s}\n")
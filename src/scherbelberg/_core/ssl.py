@@ -27,28 +27,160 @@ specific language governing rights and limitations under the License.
 # IMPORT
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
+from asyncio import get_running_loop
 from datetime import datetime, timedelta
-from typing import Tuple
+from functools import partial
+import os
+from typing import Tuple, Union
 
 from cryptography import x509
 from cryptography.x509.oid import NameOID
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
 
+from .const import TLS_KEY_TYPE, TLS_KEY_TYPES
 from .debug import typechecked
 
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+PrivateKey = Union[
+    ec.EllipticCurvePrivateKey,
+    ed25519.Ed25519PrivateKey,
+    rsa.RSAPrivateKey,
+]
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 # ROUTINES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+@typechecked
+def generate_key(key_type: str = TLS_KEY_TYPE) -> PrivateKey:
+    """
+    Generates a private key. Blocking, CPU-bound.
+
+    Args:
+        key_type : Type of key, either ``ecdsa`` (NIST P-256), ``ed25519`` or ``rsa`` (4096 bits).
+    Returns:
+        Private key.
+    """
+
+    assert key_type in TLS_KEY_TYPES
+
+    if key_type == "ecdsa":
+        return ec.generate_private_key(ec.SECP256R1(), backend=default_backend())
+    if key_type == "ed25519":
+        return ed25519.Ed25519PrivateKey.generate()
+
+    return rsa.generate_private_key(
+        public_exponent=65537, key_size=4096, backend=default_backend()
+    )
+
+
 @typechecked
 async def create_ca(
     prefix: str,
     valid_days: int = 365 * 2,
-) -> Tuple[rsa.RSAPrivateKey, x509.Certificate]:
+    key_type: str = TLS_KEY_TYPE,
+) -> Tuple[PrivateKey, x509.Certificate]:
+
+    return await get_running_loop().run_in_executor(
+        None,
+        partial(_create_ca, prefix=prefix, valid_days=valid_days, key_type=key_type),
+    )
+
+
+@typechecked
+async def create_signed_cert(
+    ca_key: PrivateKey,
+    ca_cert: x509.Certificate,
+    prefix: str,
+    valid_days: int = 365 * 2,
+    key_type: str = TLS_KEY_TYPE,
+) -> Tuple[PrivateKey, x509.Certificate]:
+
+    return await get_running_loop().run_in_executor(
+        None,
+        partial(
+            _create_signed_cert,
+            ca_key=ca_key,
+            ca_cert=ca_cert,
+            prefix=prefix,
+            valid_days=valid_days,
+            key_type=key_type,
+        ),
+    )
+
+
+@typechecked
+def key_type_of(key: PrivateKey) -> str:
+    """
+    Determines the type of a private key.
+
+    Args:
+        key : Private key.
+    Returns:
+        Type of key, either ``ecdsa``, ``ed25519`` or ``rsa``.
+    """
+
+    if isinstance(key, ec.EllipticCurvePrivateKey):
+        return "ecdsa"
+    if isinstance(key, ed25519.Ed25519PrivateKey):
+        return "ed25519"
+
+    return "rsa"
+
+
+@typechecked
+async def read_certs(name: str) -> Tuple[PrivateKey, x509.Certificate]:
+
+    assert len(name) > 0
+
+    with open(name, "rb") as f:
+        key = serialization.load_pem_private_key(f.read(), password=None)
+
+    with open(f"{name:s}.pub", "rb") as f:
+        cert = x509.load_pem_x509_certificate(f.read())
+
+    return key, cert
+
+
+@typechecked
+async def write_certs(key: PrivateKey, cert: x509.Certificate, name: str):
+
+    assert len(name) > 0
+
+    if os.path.exists(name):
+        os.unlink(name)
+
+    with os.fdopen(
+        os.open(name, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb"
+    ) as f:
+        f.write(
+            key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,  # supports all key types
+                encryption_algorithm=serialization.NoEncryption(),  # ?
+            )
+        )
+
+    with open(f"{name:s}.pub", "wb") as f:
+        f.write(
+            cert.public_bytes(
+                encoding=serialization.Encoding.PEM,
+            )
+        )
+
+
+def _create_ca(
+    prefix: str,
+    valid_days: int,
+    key_type: str,
+) -> Tuple[PrivateKey, x509.Certificate]:
 
     assert valid_days > 0
     assert len(prefix) > 0
@@ -64,9 +196,7 @@ async def create_ca(
     )
     issuer = subject  # identical
 
-    key = rsa.generate_private_key(
-        public_exponent=65537, key_size=4096, backend=default_backend()
-    )
+    key = generate_key(key_type)
 
     cert = (
         x509.CertificateBuilder()
@@ -80,19 +210,19 @@ async def create_ca(
             x509.BasicConstraints(ca=True, path_length=None),
             critical=True,  # ?
         )
-        .sign(key, hashes.SHA256(), default_backend())  # self sign
+        .sign(key, _hash_algorithm(key), default_backend())  # self sign
     )
 
     return key, cert
 
 
-@typechecked
-async def create_signed_cert(
-    ca_key: rsa.RSAPrivateKey,
+def _create_signed_cert(
+    ca_key: PrivateKey,
     ca_cert: x509.Certificate,
     prefix: str,
-    valid_days: int = 365 * 2,
-) -> Tuple[rsa.RSAPrivateKey, x509.Certificate]:
+    valid_days: int,
+    key_type: str,
+) -> Tuple[PrivateKey, x509.Certificate]:
 
     assert valid_days > 0
     assert len(prefix) > 0
@@ -106,9 +236,7 @@ async def create_signed_cert(
         ]
     )
 
-    key = rsa.generate_private_key(
-        public_exponent=65537, key_size=4096, backend=default_backend()
-    )
+    key = generate_key(key_type)
 
     cert = (
         x509.CertificateBuilder()
@@ -124,29 +252,15 @@ async def create_signed_cert(
             ),  # Dask does not check the domain
             critical=False,
         )
-        .sign(ca_key, hashes.SHA256(), default_backend())
+        .sign(ca_key, _hash_algorithm(ca_key), default_backend())
     )
 
     return key, cert
 
 
-@typechecked
-async def write_certs(key: rsa.RSAPrivateKey, cert: x509.Certificate, name: str):
+def _hash_algorithm(key: PrivateKey) -> Union[hashes.HashAlgorithm, None]:
 
-    assert len(name) > 0
+    if isinstance(key, ed25519.Ed25519PrivateKey):
+        return None  # Ed25519 signatures include their own hash
 
-    with open(name, "wb") as f:
-        f.write(
-            key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption(),  # ?
-            )
-        )
-
-    with open(f"{name:s}.pub", "wb") as f:
-        f.write(
-            cert.public_bytes(
-                encoding=serialization.Encoding.PEM,
-            )
-        )
+    return hashes.SHA256()
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/_core/timeline.py: Provisioning timeline
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from contextlib import contextmanager
+import json
+from math import ceil
+import os
+from string import ascii_letters
+from time import time
+from typing import Any, Dict, Generator, List, Optional
+
+from tabulate import tabulate
+
+from .abc import TimelineABC
+from .debug import typechecked
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CLASS
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@typechecked
+class Timeline(TimelineABC):
+    """
+    Structured record of provisioning phases, e.g. server creation, bootstrap scripts or SSH waits, per node.
+    Every completed phase becomes one event, a dictionary with the fields ``node``, ``phase``, ``start`` and ``stop`` (seconds since the epoch), ``duration`` (seconds) and ``ok``.
+    Events are optionally appended to a file in JSON lines format as they happen. Mutable.
+
+    Args:
+        fn : Location of JSON lines file. If ``None``, events are only kept in memory.
+        events : Previously recorded events.
+    """
+
+    def __init__(
+        self,
+        fn: Optional[str] = None,
+        events: Optional[List[Dict[str, Any]]] = None,
+    ):
+
+        self._fn = fn
+        self._events = [] if events is None else [dict(event) for event in events]
+
+    def __repr__(self) -> str:
+        """
+        Interactive string representation
+        """
+
+        return f"<Timeline events={len(self._events):d}>"
+
+    def __len__(self) -> int:
+        """
+        Number of events
+        """
+
+        return len(self._events)
+
+    def record(
+        self,
+        node: str,
+        phase: str,
+        start: float,
+        stop: float,
+        ok: bool = True,
+        **info: Any,
+    ):
+        """
+        Records one event.
+
+        Args:
+            node : Suffix of name of node, i.e. ``scheduler`` or ``worker0001``, or ``cluster`` for cluster-wide phases.
+            phase : Name of phase.
+            start : Start time in seconds since the epoch.
+            stop : Stop time in seconds since the epoch.
+            ok : Did the phase complete successfully?
+            info : Additional JSON-serializable information.
+        """
+
+        assert stop >= start
+
+        event = dict(
+            node=node,
+            phase=phase,
+            start=start,
+            stop=stop,
+            duration=stop - start,
+            ok=ok,
+            **info,
+        )
+        self._events.append(event)
+
+        if self._fn is None:
+            return
+
+        with open(self._fn, "a", encoding="utf-8") as f:
+            f.write(f"{json.dumps(event):s}\n")
+
+    @contextmanager
+    def span(self, node: str, phase: str, **info: Any) -> Generator[None, None, None]:
+        """
+        Context manager, timing one phase on one node.
+        The event is recorded once the phase completes, also if it fails.
+
+        Args:
+            node : Suffix of name of node, i.e. ``scheduler`` or ``worker0001``, or ``cluster`` for cluster-wide phases.
+            phase : Name of phase.
+            info : Additional JSON-serializable information.
+        """
+
+        start = time()
+        ok = False
+
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(node, phase, start, time(), ok=ok, **info)
+
+    def critical_path(self) -> List[Dict[str, Any]]:
+        """
+        Determines the critical path, i.e. the chain of phases which determined the total run time.
+        Starting from the phase which completed last, the preceding phase on the same node is followed backwards.
+        If the node was idle for more than one percent of the total run time, i.e. waiting for another node or a cluster-wide phase, the phase of any node which completed last before is followed instead.
+
+        Returns:
+            Events along the critical path in order of execution.
+        """
+
+        if len(self._events) == 0:
+            return []
+
+        origin = min(event["start"] for event in self._events)
+        path = [max(self._events, key=lambda event: event["stop"])]
+        tolerance = 0.01 * (path[0]["stop"] - origin)
+
+        while True:
+            before = [
+                event for event in self._events if event["stop"] <= path[-1]["start"]
+            ]
+            if len(before) == 0:
+                break
+            latest = max(before, key=lambda event: event["stop"])
+            same = [event for event in before if event["node"] == path[-1]["node"]]
+            if len(same) > 0:
+                previous = max(same, key=lambda event: event["stop"])
+                if latest["stop"] - previous["stop"] <= tolerance:
+                    latest = previous
+            path.append(latest)
+
+        return path[::-1]
+
+    def percentiles(
+        self, percentiles: Optional[List[float]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Statistics of durations per phase across nodes.
+
+        Args:
+            percentiles : Percentiles of interest. Defaults to 50, 90 and 99.
+        Returns:
+            Per phase, the number of events ``count``, ``p<percentile>`` durations, the ``max`` duration and the ``total`` duration.
+        """
+
+        if percentiles is None:
+            percentiles = [50.0, 90.0, 99.0]
+
+        assert all(0 < percentile <= 100 for percentile in percentiles)
+
+        durations = {}
+        for event in self._events:
+            durations.setdefault(event["phase"], []).append(event["duration"])
+
+        stats = {}
+        for phase, values in durations.items():
+            values = sorted(values)
+            stats[phase] = dict(count=float(len(values)))
+            for percentile in percentiles:  # nearest rank
+                stats[phase][f"p{percentile:g}"] = values[
+                    max(ceil(percentile / 100 * len(values)) - 1, 0)
+                ]
+            stats[phase]["max"] = values[-1]
+            stats[phase]["total"] = sum(values)
+
+        return stats
+
+    def gantt(self, width: int = 60) -> str:
+        """
+        Renders a Gantt chart of phases per node as text.
+        Every phase is represented by one letter, explained in a legend below the chart.
+
+        Args:
+            width : Number of characters representing the total run time.
+        Returns:
+            Gantt chart.
+        """
+
+        assert width > 0
+
+        if len(self._events) == 0:
+            return ""
+
+        origin = min(event["start"] for event in self._events)
+        total = max(event["stop"] for event in self._events) - origin
+        step = total / width if total > 0 else 1.0
+
+        symbols = {}
+        for event in self._events:
+            if event["phase"] not in symbols:
+                symbols[event["phase"]] = ascii_letters[
+                    len(symbols) % len(ascii_letters)
+                ]
+
+        rows = []
+        for node in self.nodes:
+            events = [event for event in self._events if event["node"] == node]
+            cells = []
+            for cell in range(width):
+                middle = origin + (cell + 0.5) * step
+                covering = [
+                    event
+                    for event in events
+                    if event["start"] <= middle < event["stop"]
+                ]
+                if len(covering) == 0:
+                    cells.append(" ")
+                else:
+                    symbol = symbols[covering[-1]["phase"]]
+                    cells.append(symbol if covering[-1]["ok"] else "!")
+            rows.append((node, "".join(cells)))
+
+        chart = tabulate(
+            rows,
+            headers=("node", f"0 ... {total:0.01f} [s]"),
+            tablefmt="github",
+            disable_numparse=True,
+        )
+        legend = ", ".join(f"{symbol:s}={phase:s}" for phase, symbol in symbols.items())
+
+        return f"{chart:s}\n\n{legend:s}, !=failed"
+
+    def report(self, width: int = 60) -> str:
+        """
+        Renders a full report, i.e. a Gantt chart, the critical path and percentiles of durations per phase.
+
+        Args:
+            width : Number of characters representing the total run time in the Gantt chart.
+        Returns:
+            Report.
+        """
+
+        if len(self._events) == 0:
+            return ""
+
+        origin = min(event["start"] for event in self._events)
+        path = self.critical_path()
+        total = path[-1]["stop"] - origin
+
+        critical = tabulate(
+            [
+                (
+                    event["phase"],
+                    event["node"],
+                    f"{event['start'] - origin:0.02f}",
+                    f"{event['duration']:0.02f}",
+                    f"{100 * event['duration'] / total:0.01f}" if total > 0 else "-",
+                )
+                for event in path
+            ],
+            headers=("critical path", "node", "start [s]", "duration [s]", "share [%]"),
+            tablefmt="github",
+            disable_numparse=True,
+        )
+
+        stats = self.percentiles()
+        columns = [key for key in next(iter(stats.values())).keys() if key != "count"]
+        percentiles = tabulate(
+            [
+                (
+                    phase,
+                    f"{values['count']:0.0f}",
+                    *(f"{values[column]:0.02f}" for column in columns),
+                )
+                for phase, values in stats.items()
+            ],
+            headers=("phase", "count", *(f"{column:s} [s]" for column in columns)),
+            tablefmt="github",
+            disable_numparse=True,
+        )
+
+        return "\n\n".join((self.gantt(width=width), critical, percentiles))
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """
+        Recorded events in order of completion
+        """
+
+        return [dict(event) for event in self._events]
+
+    @property
+    def fn(self) -> Optional[str]:
+        """
+        Location of JSON lines file
+        """
+
+        return self._fn
+
+    @property
+    def nodes(self) -> List[str]:
+        """
+        Nodes with recorded events, ``cluster`` first, followed by ``scheduler`` and workers in order of their names
+        """
+
+        nodes = {event["node"] for event in self._events}
+
+        return sorted(
+            nodes,
+            key=lambda node: (node != "cluster", node != "scheduler", node),
+        )
+
+    @classmethod
+    def from_file(cls, fn: str) -> TimelineABC:
+        """
+        Loads a timeline from a JSON lines file. New events are appended to the same file.
+
+        Args:
+            fn : Location of JSON lines file.
+        Returns:
+            New timeline object.
+        """
+
+        events = []
+        if os.path.exists(fn):
+            with open(fn, "r", encoding="utf-8") as f:
+                events = [json.loads(line) for line in f if len(line.strip()) > 0]
+
+        return cls(fn=fn, events=events)
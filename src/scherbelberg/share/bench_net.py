@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    src/scherbelberg/share/bench_net.py: Network benchmark between two nodes, run on nodes
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# Usage:
+#   python3 bench_net.py serve PORT TIMEOUT
+#   python3 bench_net.py measure HOST PORT SIZE PINGS TIMEOUT
+# The server answers exactly one client. The client prints one line of JSON.
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import json
+import os
+import socket
+import statistics
+import struct
+import sys
+import time
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+CHUNK = 2 ** 20
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def receive(conn, size):
+
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if len(chunk) == 0:
+            raise ConnectionError("connection closed")
+        data += chunk
+
+    return data
+
+
+def serve(port, timeout):
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(("0.0.0.0", port))
+        server.listen(1)
+        server.settimeout(timeout)
+
+        conn, _ = server.accept()
+
+    with conn:
+        conn.settimeout(timeout)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            head = conn.recv(1)
+            if head == b"p":  # ping
+                conn.sendall(b"p")
+            elif head == b"t":  # throughput
+                (size,) = struct.unpack("!Q", receive(conn, 8))
+                received = 0
+                while received < size:
+                    chunk = conn.recv(min(CHUNK, size - received))
+                    if len(chunk) == 0:
+                        raise ConnectionError("connection closed")
+                    received += len(chunk)
+                conn.sendall(struct.pack("!Q", received))
+            else:  # done
+                return
+
+
+def measure(host, port, size, pings, timeout):
+
+    deadline = time.monotonic() + timeout
+    while True:  # server may not be listening yet
+        try:
+            conn = socket.create_connection((host, port), timeout=5)
+            break
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+    with conn:
+        conn.settimeout(timeout)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        rtts = []
+        for _ in range(pings):
+            start = time.perf_counter()
+            conn.sendall(b"p")
+            receive(conn, 1)
+            rtts.append(time.perf_counter() - start)
+
+        payload = os.urandom(CHUNK)  # incompressible
+        start = time.perf_counter()
+        conn.sendall(b"t" + struct.pack("!Q", size))
+        sent = 0
+        while sent < size:
+            conn.sendall(payload[: min(CHUNK, size - sent)])
+            sent += min(CHUNK, size - sent)
+        (received,) = struct.unpack("!Q", receive(conn, 8))
+        duration = time.perf_counter() - start
+
+        conn.sendall(b"q")
+
+    assert received == size
+
+    print(
+        json.dumps(
+            {
+                "latency": statistics.median(rtts) if len(rtts) > 0 else None,
+                "jitter": statistics.pstdev(rtts) if len(rtts) > 1 else None,
+                "throughput": size / duration,
+            }
+        )
+    )
+
+
+def main(args):
+
+    if args[0] == "serve":
+        serve(port=int(args[1]), timeout=float(args[2]))
+    elif args[0] == "measure":
+        measure(
+            host=args[1],
+            port=int(args[2]),
+            size=int(args[3]),
+            pings=int(args[4]),
+            timeout=float(args[5]),
+        )
+    else:
+        raise ValueError("unknown mode")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -21,7 +21,16 @@
 
 # run as root
 
-# updates
+# Bootstrap profile, full, security or none
+PROFILE=${1:-full}
+
+# updates, package lists are always required by the second stage
 echo 'debconf debconf/frontend select Noninteractive' | debconf-set-selections
-apt --yes -q update > /dev/null
-apt --yes --force-yes -q upgrade > /dev/null
+apt --yes -q update
+if [ "$PROFILE" == "full" ]; then
+    apt --yes --force-yes -q upgrade
+elif [ "$PROFILE" == "security" ]; then
+    # default configuration only allows origins of security updates
+    apt --yes --force-yes -q install unattended-upgrades
+    unattended-upgrade
+fi
@@ -25,7 +25,7 @@ PREFIX=$1
 USERNAME=${PREFIX}user
 
 # install required software
-apt --yes --force-yes -q install screen glances build-essential python3-venv python3-dev > /dev/null
+apt --yes --force-yes -q install screen glances build-essential python3-venv python3-dev
 
 # create new user
 adduser --disabled-password --gecos "" -q $USERNAME
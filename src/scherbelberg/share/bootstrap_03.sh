@@ -30,18 +30,25 @@ ENVNAME=${PREFIX}env
 # Python version
 PYTHONVERSION=$(echo $2)
 
-# Python-Installer, alternative: Miniforge3-Linux-x86_64.sh
-INSTALLER=Mambaforge-Linux-x86_64.sh
-# Required packages
-PACKAGES=${HOME}/.${PREFIX}/requirements_conda.txt
+# Architecture, x86_64 or aarch64
+ARCH=$(uname -m)
+
+# Python-Installer per architecture, alternative: Miniforge3-Linux-${ARCH}.sh
+INSTALLER=Mambaforge-Linux-${ARCH}.sh
+# Required packages, lines ending with a selector like "# [aarch64]" apply to one architecture only
+REQUIREMENTS=${HOME}/.${PREFIX}/requirements_conda.txt
+PACKAGES=${HOME}/.${PREFIX}/requirements_conda_${ARCH}.txt
+
+# Select packages for architecture
+sed -e "/#[[:space:]]*\[${ARCH}\]/s/[[:space:]]*#.*$//" -e '/#[[:space:]]*\[/d' $REQUIREMENTS > $PACKAGES
 
 # Load Conda-Forge-installer
 wget -q https://github.com/conda-forge/miniforge/releases/latest/download/$INSTALLER
 chmod +x $INSTALLER
 
 # Install Conda-Forge, create and activate environment
-./$INSTALLER -b -p $FORGE < /dev/null > /dev/null 2> /dev/null
+./$INSTALLER -b -p $FORGE < /dev/null 2>&1
 rm $INSTALLER
 source $FORGE/bin/activate
-mamba create -q -y -n $ENVNAME --file=$PACKAGES python=$PYTHONVERSION < /dev/null > /dev/null 2> /dev/null
+mamba create -q -y -n $ENVNAME --file=$PACKAGES python=$PYTHONVERSION < /dev/null 2>&1
 echo "source $FORGE/bin/activate;conda activate $ENVNAME" >> .bashrc
@@ -24,10 +24,19 @@
 PORT=$1
 DASHPORT=$2
 PREFIX=$3
+PROTOCOL=${4:-tls}
+PRIVATEPORT=$5
 
 # Install location
 FORGE=$HOME/forge
 
+# Listeners: TLS for clients, optionally plain protocol for the private network
+if [ "$PROTOCOL" == "tls" ]; then
+    LISTEN="--protocol tls --port $PORT"
+else
+    LISTEN="--protocol tls,$PROTOCOL --port $PORT,$PRIVATEPORT"
+fi
+
 # Systemd service unit file
 SERVICE=$(cat <<-END
 [Unit]
@@ -41,10 +50,10 @@ User=${PREFIX}user
 Environment="PATH=${FORGE}/envs/${PREFIX}env/bin:${PATH}"
 ExecStart=${FORGE}/envs/${PREFIX}env/bin/python ${FORGE}/envs/${PREFIX}env/bin/dask-scheduler \
     --pid-file=$HOME/.${PREFIX}/scheduler.pid \
-    --protocol tls \
+    $LISTEN \
     --tls-ca-file $HOME/.${PREFIX}/ca.pub \
     --tls-cert $HOME/.${PREFIX}/cert.pub --tls-key $HOME/.${PREFIX}/cert \
-    --port $PORT --dashboard-address $DASHPORT
+    --dashboard-address $DASHPORT
 ExecStop=/bin/kill `/bin/cat $HOME/.${PREFIX}/scheduler.pid`
 
 [Install]
@@ -58,5 +67,5 @@ echo "$SERVICE" | sudo tee /etc/systemd/system/dask_scheduler.service > /dev/nul
 # Reload units, useful for debugging
 sudo systemctl daemon-reload
 
-# Start service
-sudo systemctl start dask_scheduler
+# (Re-)start service
+sudo systemctl restart dask_scheduler
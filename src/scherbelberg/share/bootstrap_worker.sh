@@ -26,10 +26,34 @@ PORT=$2
 DASHPORT=$3
 NANNY=$4
 PREFIX=$5
+PROTOCOL=${6:-tls}
+PRIVATEPORT=$7
+HOST=$8
+RESOURCES=$9
 
 # Install location
 FORGE=$HOME/forge
 
+# Either TLS everywhere or plain protocol bound to the private network
+if [ "$PROTOCOL" == "tls" ]; then
+    OPTIONS="--protocol tls"
+    CONNECT=tls://$SCHEDULER:$PORT
+else
+    OPTIONS="--protocol $PROTOCOL --host $HOST"
+    CONNECT=$PROTOCOL://$SCHEDULER:$PRIVATEPORT
+fi
+
+# Architecture as abstract resource, one unit per core, e.g. arm=4
+case $(uname -m) in
+    x86_64) ARCH=x86 ;;
+    aarch64) ARCH=arm ;;
+    *) ARCH=$(uname -m) ;;
+esac
+RESOURCES=${RESOURCES:+$RESOURCES,}$ARCH=$(nproc)
+
+# Abstract resources, e.g. MEM=1,CPU=1,x86=2
+OPTIONS="$OPTIONS --resources $RESOURCES"
+
 # Systemd service unit file
 SERVICE=$(cat <<-END
 [Unit]
@@ -43,12 +67,12 @@ User=${PREFIX}user
 Environment="PATH=${FORGE}/envs/${PREFIX}env/bin:${PATH}"
 ExecStart=${FORGE}/envs/${PREFIX}env/bin/python ${FORGE}/envs/${PREFIX}env/bin/dask-worker \
     --pid-file=$HOME/.${PREFIX}/worker.pid \
-    --protocol tls \
+    $OPTIONS \
     --tls-ca-file $HOME/.${PREFIX}/ca.pub \
     --tls-cert $HOME/.${PREFIX}/cert.pub --tls-key $HOME/.${PREFIX}/cert \
     --dashboard-address $DASHPORT --nanny-port $NANNY \
     --worker-port $PORT \
-    tls://$SCHEDULER:$PORT
+    $CONNECT
 ExecStop=/bin/kill `/bin/cat $HOME/.${PREFIX}/worker.pid`
 
 [Install]
@@ -62,5 +86,5 @@ echo "$SERVICE" | sudo tee /etc/systemd/system/dask_worker.service > /dev/null
 # Reload units, useful for debugging
 sudo systemctl daemon-reload
 
-# Start service
-sudo systemctl start dask_worker
+# (Re-)start service
+sudo systemctl restart dask_worker
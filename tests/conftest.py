@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/conftest.py: Fixtures for tests against offline stand-ins
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from scherbelberg import Cluster, FakeCloud, FakeSSH, HetznerProvider
+from scherbelberg._core.creator import Creator
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# CONST
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+PREFIX = "test"
+WAIT = 0.01
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# FIXTURES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+@pytest.fixture
+def cloud(tmp_path, monkeypatch):
+
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))  # catalog cache
+    monkeypatch.chdir(tmp_path)  # .<prefix> folder
+
+    cloud = FakeCloud(latency=0.0)
+
+    with FakeSSH(cloud=cloud):
+        yield cloud
+
+
+@pytest.fixture
+def provider(cloud):
+
+    return HetznerProvider(cloud.client(poll_interval=WAIT))
+
+
+@pytest.fixture
+def create(provider):
+
+    async def create(**kwargs) -> Creator:
+        creator = Creator(
+            provider=provider,
+            prefix=PREFIX,
+            fn_public=Cluster._fn_public(PREFIX),
+            fn_private=Cluster._fn_private(PREFIX),
+            wait=WAIT,
+        )
+        await creator.create(dask_protocol="tcp", **kwargs)
+        return creator
+
+    return create
+
+
+@pytest.fixture
+def attach(provider):
+
+    async def attach() -> Cluster:
+        return await Cluster.from_existing(prefix=PREFIX, wait=WAIT, provider=provider)
+
+    return attach
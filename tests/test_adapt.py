@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_adapt.py: Tests of adaptive scaling
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import create_task, run, sleep
+
+import pytest
+
+from scherbelberg import Adaptor, AdaptPolicy
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _metrics(workers: int, unrunnable: int = 0):
+
+    return {
+        "workers": workers,
+        "nthreads": workers,
+        "tasks": 0,
+        "unrunnable": unrunnable,
+        "occupancy": 0.0,
+        "memory": 0.0,
+    }
+
+
+def _adaptor(cluster, metrics, maximum: int = 4):
+
+    adaptor = Adaptor(
+        cluster=cluster,
+        minimum=1,
+        maximum=maximum,
+        policy=AdaptPolicy(
+            hysteresis_up=1,
+            hysteresis_down=1,
+            cooldown_up=0.0,
+            cooldown_down=0.0,
+            billing_margin=3600.0,  # every worker is at the end of its billing unit
+        ),
+    )
+
+    async def get_metrics():
+        return metrics
+
+    adaptor.get_metrics = get_metrics
+
+    return adaptor
+
+
+def test_target():
+
+    policy = AdaptPolicy(target_duration=10.0)
+
+    assert policy.target(_metrics(0), 1, 8) == 1
+    assert policy.target({**_metrics(2), "occupancy": 50.0}, 1, 8) == 5
+    assert policy.target(_metrics(2, unrunnable=1), 1, 8) == 3
+    assert policy.target(_metrics(8, unrunnable=1), 1, 8) == 8
+
+
+def test_step_up(cloud, create, attach, monkeypatch):
+
+    calls = []
+
+    async def main():
+        await create(workers=1)
+        cluster = await attach()
+
+        async def scale_up(workers, **kwargs):
+            calls.append(workers)
+
+        monkeypatch.setattr(cluster, "scale_up", scale_up)
+
+        adaptor = _adaptor(cluster, _metrics(1, unrunnable=1))
+        await adaptor.step()
+
+        pending = create_task(sleep(60))  # worker being provisioned
+        cluster._adopt([pending])
+        await adaptor.step()  # already requested
+        pending.cancel()
+
+    run(main())
+
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("pending", [0, 3])
+def test_step_down(cloud, create, attach, monkeypatch, pending):
+
+    calls = []
+
+    async def main():
+        await create(workers=2)
+        cluster = await attach()
+
+        async def remove_workers(nodes, **kwargs):
+            calls.append(len(nodes))
+
+        monkeypatch.setattr(cluster, "remove_workers", remove_workers)
+
+        tasks = [create_task(sleep(60)) for _ in range(pending)]
+        cluster._adopt(tasks)  # workers being provisioned
+        await _adaptor(cluster, _metrics(2)).step()  # target is one worker
+        for task in tasks:
+            task.cancel()
+
+    run(main())
+
+    assert calls == [1]  # at least one worker keeps running
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_cluster.py: Tests of scaling and destroying clusters
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import CancelledError, run, sleep
+import json
+import os
+
+import pytest
+
+from scherbelberg import Cluster, ClusterRetirementFailed
+from scherbelberg._core.creator import Creator
+from scherbelberg._core.node import Node
+
+from conftest import PREFIX, WAIT
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _register(monkeypatch, exception: Exception = None):
+
+    async def register(self, nodes, timeout=None):
+        if exception is not None:
+            raise exception
+
+    monkeypatch.setattr(Cluster, "_wait_for_registration", register)  # requires Dask
+
+
+def _retire(monkeypatch, succeeded: bool):
+
+    async def retire(self, nodes, timeout):
+        return {"keys": 0, "bytes": 0, "seconds": 0.0, "succeeded": succeeded}
+
+    monkeypatch.setattr(Cluster, "_retire_workers", retire)  # requires Dask
+
+
+def test_from_new_failure(cloud, provider, monkeypatch):
+
+    _register(monkeypatch, exception=TimeoutError())
+
+    bootstrap = Node.bootstrap
+    cancelled = []
+
+    async def patched(self, *args, **kwargs):
+        if self.suffix in ("worker0001", "worker0002"):
+            try:
+                await sleep(60)  # still being provisioned
+            except CancelledError:
+                cancelled.append(self.suffix)
+                raise
+        return await bootstrap(self, *args, **kwargs)
+
+    monkeypatch.setattr(Node, "bootstrap", patched)
+
+    async def main():
+        with pytest.raises(TimeoutError):
+            await Cluster.from_new(
+                prefix=PREFIX,
+                wait=WAIT,
+                workers=3,
+                min_workers=1,
+                provider=provider,
+            )
+        return sorted(cancelled)  # before the event loop shuts down
+
+    assert run(main()) == ["worker0001", "worker0002"]
+
+
+def test_from_new_resume(cloud, provider, create, monkeypatch):
+
+    _register(monkeypatch)
+
+    async def start_workers(self, *args, **kwargs):
+        raise RuntimeError("starting workers failed")
+
+    async def main():
+        with monkeypatch.context() as patch:
+            patch.setattr(Creator, "_start_workers", start_workers)
+            with pytest.raises(RuntimeError):
+                await create(workers=2, dask_ipc=9000, ip_range="10.8.0.0/16")
+        return await Cluster.from_new(  # defaults differ from recorded parameters
+            prefix=PREFIX,
+            wait=WAIT,
+            resume=True,
+            provider=provider,
+        )
+
+    cluster = run(main())
+
+    assert cloud.servers == 3
+    assert cluster.dask_protocol == "tcp"
+    assert cluster.dask_ipc == 9000
+    assert cluster.ip_range == "10.8.0.0/16"
+    assert cluster.scheduler.labels["dask_ipc"] == "9000"
+    with open(os.path.join(f".{PREFIX:s}", "cluster.json"), "r") as f:
+        cache = json.load(f)["cluster"]
+    assert (cache["dask_protocol"], cache["dask_ipc"]) == ("tcp", 9000)
+
+
+def test_scale_up(cloud, create, attach):
+
+    async def main():
+        await create(workers=1)
+        cluster = await attach()
+        new = await cluster.scale_up(2, pool="extra", worker="cx21")
+        return cluster, new, await attach()
+
+    cluster, new, attached = run(main())
+
+    assert cloud.servers == 4
+    assert [node.suffix for node in new] == ["worker0001", "worker0002"]
+    assert len(cluster.workers) == 3
+    assert len({node.private_ip4 for node in cluster.workers}) == 3
+    assert {pool.name: pool.workers for pool in attached.pools} == {
+        "default": 1,
+        "extra": 2,
+    }
+    assert {node.servertype for node in attached.workers if node.pool == "extra"} == {
+        "cx21"
+    }
+
+
+def test_scale_up_unlabeled(cloud, provider, create, attach):
+
+    async def main():
+        await create(workers=1)
+        for server in await provider.get_servers():  # created by older versions
+            labels = server.labels.copy()
+            labels.pop("cluster")
+            labels.pop("role")
+            await provider.set_labels(server, labels)
+        cluster = await attach()
+        await cluster.scale_up(1)
+        return await attach()
+
+    attached = run(main())
+
+    assert attached.scheduler.name == f"{PREFIX:s}-node-scheduler"
+    assert [node.suffix for node in attached.workers] == ["worker0000", "worker0001"]
+
+
+def test_scale_up_failure(cloud, create, attach, monkeypatch):
+
+    bootstrap_node = Creator._bootstrap_node
+
+    async def patched(self, node):
+        if node.suffix == "worker0002":
+            raise RuntimeError("bootstrapping failed")
+        return await bootstrap_node(self, node)
+
+    async def main():
+        await create(workers=1)
+        cluster = await attach()
+        monkeypatch.setattr(Creator, "_bootstrap_node", patched)
+        with pytest.raises(RuntimeError):
+            await cluster.scale_up(3)
+        return cluster
+
+    cluster = run(main())
+
+    assert cloud.servers == 2  # no leaked servers
+    assert len(cluster.workers) == 1
+
+
+def test_scale_down(cloud, create, attach, monkeypatch):
+
+    _retire(monkeypatch, succeeded=True)
+
+    async def main():
+        await create(workers=3)
+        cluster = await attach()
+        await cluster.scale(1)
+        return cluster, await attach()
+
+    cluster, attached = run(main())
+
+    assert cloud.servers == 2
+    assert [node.suffix for node in cluster.workers] == ["worker0000"]
+    assert [node.suffix for node in attached.workers] == ["worker0000"]
+
+
+def test_scale_down_failure(cloud, create, attach, monkeypatch):
+
+    _retire(monkeypatch, succeeded=False)
+
+    async def main():
+        await create(workers=2)
+        cluster = await attach()
+        with pytest.raises(ClusterRetirementFailed):
+            await cluster.scale_down(1)
+        assert cloud.servers == 3
+        await cluster.scale_down(1, force=True)
+        return cluster
+
+    cluster = run(main())
+
+    assert cloud.servers == 2
+    assert len(cluster.workers) == 1
+
+
+def test_destroy(cloud, create, attach):
+
+    async def main():
+        await create(workers=2)
+        cluster = await attach()
+        await cluster.destroy()
+        return cluster
+
+    cluster = run(main())
+
+    assert not cluster.alive
+    assert cloud.servers == 0
+    assert not os.path.exists(f".{PREFIX:s}")
+
+
+def test_destroy_network_report(cloud, create, attach):
+
+    async def main():
+        await create(workers=1)
+        cluster = await attach()
+        with open(os.path.join(f".{PREFIX:s}", "network.json"), "w") as f:
+            f.write("{}")  # default location, see Cluster.benchmark_network
+        await cluster.destroy()
+
+    run(main())
+
+    assert cloud.servers == 0
+    assert not os.path.exists(f".{PREFIX:s}")
+
+
+def test_nuke(cloud, provider, create, monkeypatch):
+
+    async def start_workers(self, *args, **kwargs):
+        raise RuntimeError("starting workers failed")
+
+    monkeypatch.setattr(Creator, "_start_workers", start_workers)
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await create(workers=2)
+        await Cluster.nuke(prefix=PREFIX, provider=provider)
+        return await provider.get_networks()
+
+    networks = run(main())
+
+    assert cloud.servers == 0
+    assert networks == []
+    assert not os.path.exists(f".{PREFIX:s}")
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_creator.py: Tests of cluster creation and resuming
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import run, sleep
+import json
+import os
+
+import pytest
+
+from scherbelberg._core.creator import Creator
+
+from conftest import PREFIX
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def _fail_once(monkeypatch, suffix: str, others: int = 0):
+
+    bootstrap_node = Creator._bootstrap_node
+    failed = []
+    done = []
+
+    async def patched(self, node):
+        if node.suffix == suffix and len(failed) == 0:
+            failed.append(node.suffix)
+            while len(done) < others:  # other nodes are recorded as bootstrapped first
+                await sleep(0.01)
+            raise RuntimeError(f"bootstrapping {suffix:s} failed")
+        node = await bootstrap_node(self, node)
+        done.append(node.suffix)
+        return node
+
+    monkeypatch.setattr(Creator, "_bootstrap_node", patched)
+
+
+def test_create(cloud, create, attach):
+
+    async def main():
+        creator = await create(workers=3)
+        cluster = await attach()
+        return creator, cluster
+
+    creator, cluster = run(main())
+
+    assert cloud.servers == 4
+    assert [node.suffix for node in creator.workers] == [
+        "worker0000",
+        "worker0001",
+        "worker0002",
+    ]
+    assert creator.pending == []
+    assert len(cluster.workers) == 3
+    assert all(node.stage == "started" for node in cluster.workers)
+    assert len({node.private_ip4 for node in cluster.workers}) == 3
+
+    with open(os.path.join(f".{PREFIX:s}", "progress.json"), "r") as f:
+        progress = json.load(f)
+    assert set(progress["nodes"].values()) == {"started"}
+
+
+def test_create_resume(cloud, provider, create, attach, monkeypatch):
+
+    _fail_once(monkeypatch, "worker0001", others=2)
+
+    async def first():
+        with pytest.raises(RuntimeError):
+            await create(workers=2)
+        servers = await provider.get_servers()
+        return {server.name: server.public_ip4 for server in servers}
+
+    before = run(first())
+
+    with open(os.path.join(f".{PREFIX:s}", "progress.json"), "r") as f:
+        progress = json.load(f)
+    assert progress["parameters"]["dask_protocol"] == "tcp"
+    assert progress["nodes"]["worker0001"] != "started"
+
+    async def second():
+        await create(workers=5, resume=True)  # recorded parameters take precedence
+        return await attach()
+
+    cluster = run(second())
+
+    assert cloud.servers == 3
+    assert len(cluster.workers) == 2
+    assert cluster.scheduler.public_ip4 == before[f"{PREFIX:s}-node-scheduler"]
+    assert cluster.workers[0].public_ip4 == before[f"{PREFIX:s}-node-worker0000"]
+    assert cluster.workers[1].public_ip4 != before[f"{PREFIX:s}-node-worker0001"]
+
+
+def test_create_min_workers(cloud, create, monkeypatch):
+
+    _fail_once(monkeypatch, "worker0001")
+
+    creator = run(create(workers=3, min_workers=2))
+
+    assert [node.suffix for node in creator.workers] == ["worker0000", "worker0002"]
+    assert creator.pending == []
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_dag.py: Tests of dependency graphs of steps
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+from asyncio import run, sleep
+
+import pytest
+
+from scherbelberg import Graph
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_graph():
+
+    order = []
+
+    def step(name, seconds, value):
+        async def func():
+            await sleep(seconds)
+            order.append(name)
+            return value
+
+        return func
+
+    async def main():
+        graph = Graph()
+        graph.add("a", step("a", 0.02, 1))
+        graph.add("b", step("b", 0.0, 2))
+        graph.add(
+            "c",
+            lambda: step("c", 0.0, graph.result("a") + graph.result("b"))(),
+            requires=["a", "b"],
+        )
+        await graph.join()
+        return graph
+
+    graph = run(main())
+
+    assert order == ["b", "a", "c"]  # independent steps run concurrently
+    assert graph.result("c") == 3
+    assert [step.name for step in graph.critical_path()] == ["a", "c"]
+    assert "critical path" in graph.report()
+
+
+def test_graph_failure():
+
+    async def fail():
+        raise RuntimeError("failed")
+
+    async def never():
+        raise AssertionError("must not run")
+
+    async def main():
+        graph = Graph()
+        graph.add("a", fail)
+        task = graph.add("b", never, requires=["a"])
+        await graph.join()
+        return task
+
+    task = run(main())
+
+    with pytest.raises(RuntimeError):
+        task.result()
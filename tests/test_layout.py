@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_layout.py: Tests of private network layouts
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from scherbelberg import Layout
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_allocate():
+
+    layout = Layout(ip_range="10.0.0.0/16", prefix=24, servers=2)
+
+    assert layout.allocate() == (0, "10.0.0.2")  # gateway is reserved
+    assert layout.allocate() == (0, "10.0.0.3")
+    assert layout.allocate() == (1, "10.0.1.2")  # network is full
+    assert layout.networks == 2
+    assert layout.network_range(1) == "10.0.1.0/24"
+
+    with pytest.raises(ValueError):
+        layout.allocate(network=0)
+
+
+def test_rediscover():
+
+    layout = Layout(
+        ip_range="10.0.0.0/16",
+        prefix=24,
+        servers=3,
+        networks=["10.0.0.0/24", "10.0.1.0/24"],
+        used=["10.0.0.2", "10.0.0.3", "10.0.0.4", "10.0.1.2"],
+    )
+
+    assert layout.allocate() == (1, "10.0.1.3")
+
+    with pytest.raises(ValueError):
+        layout.reserve("10.0.2.2")
+
+
+def test_exhausted():
+
+    layout = Layout(ip_range="10.0.0.0/23", prefix=24, servers=1)
+
+    layout.allocate()
+    layout.allocate()
+
+    with pytest.raises(ValueError):
+        layout.allocate()
+
+
+def test_network_name():
+
+    assert Layout.network_name("cluster", 0) == "cluster-network"
+    assert Layout.network_name("cluster", 12) == "cluster-network012"
+    assert Layout.network_index("cluster", "cluster-network") == 0
+    assert Layout.network_index("cluster", "cluster-network012") == 12
+    assert Layout.network_index("cluster", "other-network") is None
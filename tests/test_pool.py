@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_pool.py: Tests of pools of workers
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from scherbelberg import Pool
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_from_str():
+
+    pool = Pool.from_str("mem:ccx52:4::MEM=1,CPU=0.5", datacenter="nbg1-dc3")
+
+    assert pool.name == "mem"
+    assert pool.servertype == "ccx52"
+    assert pool.workers == 4
+    assert pool.datacenter == "nbg1-dc3"
+    assert pool.resources == {"MEM": 1.0, "CPU": 0.5}
+    assert pool.resources_str == "CPU=0.5,MEM=1"
+
+
+def test_roundtrip():
+
+    pool = Pool(name="gpu", servertype="cx21", workers=2, resources={"GPU": 1})
+
+    assert str(Pool.from_str(str(pool))) == str(pool)
+    assert Pool.resources_from_labels(pool.labels) == pool.resources
+
+
+@pytest.mark.parametrize("spec", ["mem:ccx52", "a:b:1:c:d:e"])
+def test_from_str_invalid(spec):
+
+    with pytest.raises(ValueError):
+        Pool.from_str(spec)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+
+SCHERBELBERG
+HPC cluster deployment and management for the Hetzner Cloud
+
+https://github.com/pleiszenburg/scherbelberg
+
+    tests/test_timeline.py: Tests of provisioning timelines
+
+    Copyright (C) 2021-2022 Sebastian M. Ernst <ernst@pleiszenburg.de>
+
+<LICENSE_BLOCK>
+The contents of this file are subject to the BSD 3-Clause License
+("License"). You may not use this file except in
+compliance with the License. You may obtain a copy of the License at
+https://github.com/pleiszenburg/scherbelberg/blob/master/LICENSE
+Software distributed under the License is distributed on an "AS IS" basis,
+WITHOUT WARRANTY OF ANY KIND, either express or implied. See the License for the
+specific language governing rights and limitations under the License.
+</LICENSE_BLOCK>
+
+"""
+
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# IMPORT
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+import pytest
+
+from scherbelberg import Timeline
+
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# ROUTINES
+# +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+
+
+def test_timeline(tmp_path):
+
+    fn = str(tmp_path / "timeline.jsonl")
+    timeline = Timeline(fn=fn)
+
+    timeline.record("scheduler", "api_create", 0.0, 1.0)
+    timeline.record("worker0000", "api_create", 0.0, 2.0)
+    with pytest.raises(RuntimeError):
+        with timeline.span("worker0000", "bootstrap"):
+            raise RuntimeError("failed")
+
+    loaded = Timeline.from_file(fn)
+
+    assert loaded.events == timeline.events
+    assert loaded.nodes == ["scheduler", "worker0000"]
+    assert [event["ok"] for event in loaded.events] == [True, True, False]
+    assert len(loaded.report()) > 0